@@ -10,6 +10,9 @@ from .tyc  import TYC, TYC2
 from .kic  import KIC
 from .epic import EPIC
 
+from .match import crossmatch
+from .parallel import parallel_apply
+
 from . import kepler
 
 from . import utils
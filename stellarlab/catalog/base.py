@@ -1,3 +1,8 @@
+import numpy as np
+from ..utils.fitsio import get_bintable_info, memmap_bintable
+from .cache import load_cache, save_cache
+from .zones import build_zone_index, query_zone_index
+from .epoch import propagate_epoch, _change_epoch, _get_epoch_name
 
 def _str_to_float(string, exception=None):
     """Convert string to float. Return `exception_value` if failed.
@@ -28,3 +33,658 @@ def _str_to_int(string, exception=None):
         return int(string)
     except:
         return exception
+
+def _take_records(data, index, columns=None):
+    """Gather the given rows from a memory-mapped FITS table.
+
+    Args:
+        data (:class:`numpy.memmap`): Memory-mapped FITS table.
+        index (:class:`numpy.ndarray`): Indices of rows to be gathered.
+        columns (list): Names of columns to be gathered. All columns are
+            gathered if *None*.
+    Returns:
+        dict: A dict containing native-endian column arrays.
+    """
+    if columns is None:
+        columns = data.dtype.names
+    return {key: np.array(data[key][index],
+                          dtype=data.dtype[key].newbyteorder('='))
+            for key in columns}
+
+def _pack_records(columns, mask, output='ndarray'):
+    """Pack gathered column arrays into the output of batch queries.
+
+    Args:
+        columns (dict): A dict containing column arrays.
+        mask (:class:`numpy.ndarray`): Boolean array which is *True* for
+            missing entries.
+        output (str): Type of output results. Either *"ndarray"* (a structured
+            :class:`numpy.ma.MaskedArray`) or *"dict"* (a dict of
+            :class:`numpy.ma.MaskedArray`).
+    Returns:
+        :class:`numpy.ma.MaskedArray` or dict: Records in catalogue.
+    """
+    if output == 'dict':
+        return {key: np.ma.MaskedArray(array, mask=mask)
+                for key, array in columns.items()}
+    elif output == 'ndarray':
+        dtype = np.dtype([(key, array.dtype) for key, array in columns.items()])
+        records = np.empty(mask.size, dtype=dtype)
+        for key, array in columns.items():
+            records[key] = array
+        return np.ma.MaskedArray(records, mask=mask)
+    else:
+        return None
+
+class _BlockColumns(object):
+    """Columns of a block of rows in catalogue, decoded into native-endian
+    arrays the first time they are accessed.
+
+    Args:
+        catalog (:class:`_FITSCatalog`): Catalogue object.
+        i1 (int): Index of the first row in block.
+        i2 (int): Index after the last row in block.
+    """
+
+    def __init__(self, catalog, i1, i2):
+        self._catalog = catalog
+        self._slice = slice(i1, i2)
+        self._columns = {}
+
+    def __getitem__(self, key):
+        if key not in self._columns:
+            self._columns.update(
+                    self._catalog._read_columns(self._slice, [key]))
+        return self._columns[key]
+
+def _eval_where(where, block, nrow):
+    """Evaluate the predicates of a scan on a block of rows.
+
+    Args:
+        where (dict or callable): Either a dict mapping column names to
+            (`min`, `max`) tuples, where both bounds are inclusive and can be
+            *None*, or a function taking the block columns and returning a
+            boolean array.
+        block (:class:`_BlockColumns`): Columns of the block.
+        nrow (int): Number of rows in block.
+    Returns:
+        :class:`numpy.ndarray`: Boolean array which is *True* for the matching
+            rows.
+    """
+    if where is None:
+        return np.ones(nrow, dtype=np.bool_)
+    elif callable(where):
+        return np.asarray(where(block), dtype=np.bool_)
+
+    m = np.ones(nrow, dtype=np.bool_)
+    for key, (vmin, vmax) in where.items():
+        if vmin is not None:
+            m &= block[key] >= vmin
+        if vmax is not None:
+            m &= block[key] <= vmax
+    return m
+
+def _build_zonemap(catalog, blocksize, chunk=256):
+    """Compute the minimum and maximum values of numeric columns in each
+    block of rows of a FITS table.
+
+    NaN values are ignored. Blocks with only NaN values are given NaN
+    statistics, which never match any range.
+
+    Args:
+        catalog (:class:`_FITSCatalog`): Catalogue object.
+        blocksize (int): Number of rows in each block.
+        chunk (int): Number of blocks read at a time.
+    Returns:
+        dict: A dict containing arrays `min.<column>` and `max.<column>` for
+            every numeric column, and `blocksize`.
+    """
+    data = catalog._get_data()
+    columns = [key for key in data.dtype.names
+               if data.dtype[key].kind in 'iuf' and data.dtype[key].shape == ()]
+    nblock = (data.size + blocksize - 1)//blocksize
+    zonemap = {}
+    for key in columns:
+        dtype = data.dtype[key].newbyteorder('=')
+        zonemap['min.'+key] = np.zeros(nblock, dtype=dtype)
+        zonemap['max.'+key] = np.zeros(nblock, dtype=dtype)
+
+    for b1 in range(0, nblock, chunk):
+        b2 = min(b1 + chunk, nblock)
+        i1, i2 = b1*blocksize, min(b2*blocksize, data.size)
+        starts = np.arange(b2 - b1)*blocksize
+        arrays = catalog._read_columns(slice(i1, i2), columns)
+        for key, array in arrays.items():
+            zonemap['min.'+key][b1:b2] = np.fmin.reduceat(array, starts)
+            zonemap['max.'+key][b1:b2] = np.fmax.reduceat(array, starts)
+
+    zonemap['blocksize'] = np.array([blocksize])
+    return zonemap
+
+def _get_zonemap_ranges(zonemap, where, nrow, blocksize):
+    """Get the ranges of rows which may match the predicates of a scan
+    according to a zone map.
+
+    Args:
+        zonemap (dict): Zone map returned by :func:`_build_zonemap`.
+        where (dict): A dict mapping column names to (`min`, `max`) tuples.
+        nrow (int): Number of rows in table.
+        blocksize (int): Maximum number of rows in each range.
+    Returns:
+        list: A list of (`i1`, `i2`) tuples of row ranges.
+    """
+    zmsize = int(zonemap['blocksize'][0])
+    nblock = (nrow + zmsize - 1)//zmsize
+    m = np.ones(nblock, dtype=np.bool_)
+    for key, (vmin, vmax) in where.items():
+        if 'min.'+key not in zonemap:
+            # no statistics for this column
+            continue
+        if vmin is not None:
+            m &= zonemap['max.'+key] >= vmin
+        if vmax is not None:
+            m &= zonemap['min.'+key] <= vmax
+
+    # merge consecutive candidate blocks into ranges
+    d = np.diff(np.concatenate(([0], m.astype(np.int8), [0])))
+    ranges = []
+    for b1, b2 in zip(np.nonzero(d == 1)[0], np.nonzero(d == -1)[0]):
+        i1, i2 = int(b1)*zmsize, min(int(b2)*zmsize, nrow)
+        for j1 in range(i1, i2, blocksize):
+            ranges.append((j1, min(j1 + blocksize, i2)))
+    return ranges
+
+def _get_zone_cache_name(epoch=None):
+    """Get the name of the zone index cache for a given epoch.
+
+    Args:
+        epoch (float): Epoch of positions, or *None* for the positions in
+            catalogue.
+    Returns:
+        str: Name of cache.
+    """
+    if epoch is None:
+        return 'zones'
+    else:
+        return 'zones_%s'%_get_epoch_name(epoch)
+
+class _FITSCatalog(object):
+    """Base class for catalogues stored as FITS binary tables.
+
+    The data area of the table is mapped into memory with
+    :func:`stella.utils.fitsio.memmap_bintable` the first time it is needed.
+    Records are then read by indexing the mapping instead of opening,
+    seeking and reading the file for every lookup.
+
+    Cone searches are backed by a declination-zone index (see
+    :mod:`stella.catalog.zones`), which is built from the position columns
+    the first time it is needed and saved under `$STELLA_DATA/cache/catalog`.
+    Later sessions memory-map the saved index instead of rebuilding it.
+    Positions propagated to other epochs, and zone indices built from them,
+    are cached in the same way.
+
+    Wide catalogues can optionally be converted into a columnar cache with
+    :meth:`build_columns`, which saves every column as a native-endian
+    `.npy` file. Queries then memory-map only the columns they need.
+
+    Args:
+        catfile (str): Name of the catalogue file.
+    """
+
+    # columns of RA and Dec used by cone searches
+    _position_columns = ('RAdeg', 'DEdeg')
+
+    # height of declination zones in degree
+    _zone_height = 0.2
+
+    # epoch of positions in catalogue. None if there are no proper motions
+    _epoch0 = None
+
+    # number of rows in each block of zone maps
+    _zonemap_blocksize = 4096
+
+    def __init__(self, catfile):
+        self.catfile = catfile
+        self._data_info = None
+        self._data = None
+        self._positions = {}
+        self._zone_index = {}
+        self._zonemap = None
+        self._columns = None
+
+    def __getstate__(self):
+        """Drop the memory mappings and caches when pickled, so that a
+        catalogue sent to another process opens its own mappings.
+        """
+        state = self.__dict__.copy()
+        state['_data_info'] = None
+        state['_data'] = None
+        state['_positions'] = {}
+        state['_zone_index'] = {}
+        state['_zonemap'] = None
+        state['_columns'] = None
+        if '_keys' in state:
+            state['_keys'] = None
+        return state
+
+    def _get_data_info(self):
+        """Get information of FITS table."""
+        nbyte, nrow, ncol, pos, dtype, fmtfunc = get_bintable_info(self.catfile)
+        self._data_info = {
+                'nbyte'  : nbyte,
+                'nrow'   : nrow,
+                'ncol'   : ncol,
+                'pos'    : pos,
+                'dtype'  : dtype,
+                'fmtfunc': fmtfunc,
+                }
+
+    def _get_data(self):
+        """Get the memory-mapped FITS table.
+
+        Returns:
+            :class:`numpy.memmap`: Structured array of all rows in catalogue.
+        """
+        if self._data is None:
+            if self._data_info is None:
+                self._get_data_info()
+            self._data = memmap_bintable(self.catfile)
+        return self._data
+
+    def _get_item(self, index):
+        """Get a record in catalogue as a native-endian 0-d structured array.
+
+        Args:
+            index (int): Index of the row in FITS table.
+        Returns:
+            :class:`numpy.ndarray`: Record in catalogue.
+        """
+        data = self._get_data()
+        return np.array(data[index], dtype=self._data_info['dtype'])
+
+    def _get_index(self, numbers, key):
+        """Get row indices of records in catalogues sorted by consecutive
+        numbers starting from 1.
+
+        Args:
+            numbers (:class:`numpy.ndarray`): Integer numbers of stars.
+            key (str): Name of the column containing star numbers.
+        Returns:
+            tuple: A tuple containing:
+
+                * **index** (:class:`numpy.ndarray`): Row indices.
+                * **mask** (:class:`numpy.ndarray`): Boolean array which is
+                  *True* for stars not in catalogue.
+        """
+        data = self._get_data()
+        index = numbers - 1
+        mask = (index < 0) | (index >= data.size)
+        index[mask] = 0
+        mask |= self._read_columns(index, [key])[key] != numbers
+        return index, mask
+
+    def build_columns(self, columns=None):
+        """Convert the catalogue into a columnar cache.
+
+        Every column is saved as a native-endian `.npy` file under
+        `$STELLA_DATA/cache/catalog/<catalogue>/columns`, together with the
+        size and modification time of the catalogue file. Later queries
+        memory-map only the columns they need from this cache, and fall back
+        to the FITS table if the catalogue file has changed. This is a
+        one-time conversion and only has to be run again if the catalogue
+        file is updated.
+
+        Args:
+            columns (list): Names of columns to be converted. All columns are
+                converted if *None*.
+        Examples:
+
+            .. code-block:: python
+
+                >>> from stella.catalog import KIC
+                >>> KIC.build_columns(['KIC', 'RAdeg', 'DEdeg', 'kepmag', 'Teff'])
+
+        """
+        data = self._get_data()
+        if columns is None:
+            columns = data.dtype.names
+        # convert one column at a time to limit the memory
+        for key in columns:
+            save_cache(self.catfile, 'columns',
+                       _take_records(data, slice(None), [key]), clear=False)
+        self._columns = None
+
+    def _get_columns(self):
+        """Get the columnar cache of catalogue.
+
+        Returns:
+            dict: A dict containing memory-mapped column arrays. Empty if the
+                cache does not exist or is out of date.
+        """
+        if self._columns is None:
+            columns = load_cache(self.catfile, 'columns')
+            self._columns = {} if columns is None else columns
+        return self._columns
+
+    def _read_columns(self, index, columns):
+        """Read columns of given rows, from the columnar cache if available,
+        or from the FITS table otherwise.
+
+        Args:
+            index (:class:`numpy.ndarray` or slice): Row indices.
+            columns (list): Names of columns to be read.
+        Returns:
+            dict: A dict containing native-endian column arrays.
+        """
+        cache = self._get_columns()
+        result = {key: np.array(cache[key][index])
+                  for key in columns if key in cache}
+        missing = [key for key in columns if key not in cache]
+        if len(missing) > 0:
+            result.update(_take_records(self._get_data(), index, missing))
+        return {key: result[key] for key in columns}
+
+    def _take_columns(self, index, columns=None, epoch=None):
+        """Gather columns of given rows from catalogue.
+
+        Args:
+            index (:class:`numpy.ndarray`): Row indices.
+            columns (list): Names of output columns. All columns are returned
+                if *None*.
+            epoch (float): Epoch of output astrometric parameters. Positions
+                are not changed if *None*.
+        Returns:
+            dict: A dict containing native-endian column arrays.
+        """
+        data = self._get_data()
+        if columns is None:
+            columns = list(data.dtype.names)
+        else:
+            columns = list(columns)
+
+        astrometry = ['RAdeg', 'DEdeg', 'pmRA', 'pmDE']
+        move = epoch is not None and epoch != self._epoch0 and \
+               ('RAdeg' in columns or 'DEdeg' in columns)
+        if move:
+            keys = columns + [key for key in astrometry if key not in columns]
+        else:
+            keys = columns
+
+        result = self._read_columns(index, keys)
+        if move:
+            _change_epoch(result, self._epoch0, epoch)
+        return {key: result[key] for key in columns}
+
+    def _take(self, index, mask, columns=None, output='ndarray', epoch=None):
+        """Gather rows from catalogue and pack them as the output of batch
+        queries.
+
+        Args:
+            index (:class:`numpy.ndarray`): Row indices.
+            mask (:class:`numpy.ndarray`): Boolean array which is *True* for
+                missing entries.
+            columns (list): Names of output columns. All columns are returned
+                if *None*.
+            output (str): Either *"ndarray"* or *"dict"*.
+            epoch (float): Epoch of output astrometric parameters.
+        Returns:
+            :class:`numpy.ma.MaskedArray` or dict: Records in catalogue.
+        """
+        result = self._take_columns(index, columns, epoch)
+        return _pack_records(result, mask, output)
+
+    def _check_epoch(self, epoch):
+        """Check whether positions in catalogue can be moved to an epoch.
+
+        Args:
+            epoch (float): Target epoch, or *None*.
+        Returns:
+            float: The target epoch, or *None* if the positions in catalogue
+                are used as they are.
+        """
+        if epoch is None or epoch == self._epoch0:
+            return None
+        if self._epoch0 is None:
+            print('Error: No proper motions in %s'%self.catfile)
+            raise ValueError
+        return epoch
+
+    def get_positions(self, epoch=None, cache=True):
+        """Get the positions of all stars in catalogue at a given epoch.
+
+        Positions are propagated with
+        :func:`stella.catalog.epoch.propagate_epoch` in one pass over the
+        whole catalogue. Stars without valid proper motions keep their
+        positions in catalogue. If `cache` is *True*, the propagated
+        positions are saved under `$STELLA_DATA/cache/catalog` and
+        memory-mapped in later calls.
+
+        Args:
+            epoch (float): Epoch of output positions in Julian year. Positions
+                in catalogue are returned if *None*.
+            cache (bool): Whether to use the cache of propagated positions.
+        Returns:
+            tuple: A tuple of arrays (RA, Dec) in degree.
+        Examples:
+
+            .. code-block:: python
+
+                >>> from stella.catalog import TYC2
+                >>> ra, dec = TYC2.get_positions(epoch=2016.0)
+
+        """
+        epoch = self._check_epoch(epoch)
+        data = self._get_data()
+        if epoch is None:
+            racol, decol = self._position_columns
+            return data[racol], data[decol]
+
+        name = 'positions_%s'%_get_epoch_name(epoch)
+        if name in self._positions:
+            return self._positions[name]
+
+        positions = None
+        if cache:
+            positions = load_cache(self.catfile, name)
+        if positions is None:
+            columns = self._read_columns(slice(None),
+                                    ['RAdeg', 'DEdeg', 'pmRA', 'pmDE'])
+            pmra, pmde = columns['pmRA'], columns['pmDE']
+            m = ~(np.isfinite(pmra) & np.isfinite(pmde))
+            pmra[m] = 0.0
+            pmde[m] = 0.0
+            ra, dec = propagate_epoch(columns['RAdeg'], columns['DEdeg'],
+                                      pmra, pmde, self._epoch0, epoch)
+            positions = {'ra': ra, 'dec': dec}
+            if cache:
+                save_cache(self.catfile, name, positions)
+                positions = load_cache(self.catfile, name)
+
+        result = (positions['ra'], positions['dec'])
+        if cache:
+            self._positions[name] = result
+        return result
+
+    def _get_positions(self, epoch=None):
+        """Get the positions of all stars used to build the zone index.
+
+        Args:
+            epoch (float): Epoch of positions.
+        Returns:
+            tuple: A tuple of native-endian arrays (RA, Dec) in degree. Rows
+                which should not be indexed are given NaN.
+        """
+        ra, dec = self.get_positions(epoch)
+        return (np.array(ra, dtype=np.float64),
+                np.array(dec, dtype=np.float64))
+
+    def _get_zone_index(self, epoch=None):
+        """Get the declination-zone index of catalogue.
+
+        Args:
+            epoch (float): Epoch of positions in the index. The positions in
+                catalogue are used if *None*.
+        Returns:
+            dict: Memory-mapped zone index.
+        """
+        name = _get_zone_cache_name(self._check_epoch(epoch))
+        if name not in self._zone_index:
+            index = load_cache(self.catfile, name)
+            if index is None:
+                ra, dec = self._get_positions(epoch)
+                save_cache(self.catfile, name,
+                           build_zone_index(ra, dec, self._zone_height))
+                index = load_cache(self.catfile, name)
+            self._zone_index[name] = index
+        return self._zone_index[name]
+
+    def cone_search(self, ra, dec, radius, epoch=None, columns=None,
+            output='ndarray'):
+        """Find all stars within a given radius of a position.
+
+        Args:
+            ra (float): Right ascension in degree.
+            dec (float): Declination in degree.
+            radius (float): Search radius in arcsec.
+            epoch (float): Epoch of the positions of stars. Positions in
+                catalogue are used if *None*.
+            columns (list): Names of output columns. All columns are returned
+                if *None*.
+            output (str): Either *"ndarray"* or *"dict"*.
+        Returns:
+            :class:`numpy.ma.MaskedArray` or dict: Records of stars sorted by
+                angular distances, with an extra column `_r` giving the
+                distances in arcsec.
+        See also:
+            :meth:`cone_search_many`
+        """
+        result = self.cone_search_many(ra, dec, radius, epoch=epoch,
+                                       columns=columns, output='dict')
+        result.pop('_q')
+        mask = np.zeros(result['_r'].size, dtype=np.bool_)
+        return _pack_records({key: array.data for key, array in result.items()},
+                             mask, output)
+
+    def cone_search_many(self, ra, dec, radius, epoch=None, columns=None,
+            output='ndarray'):
+        """Find all stars within given radii of a list of positions.
+
+        Args:
+            ra (float or :class:`numpy.ndarray`): Right ascensions in degree.
+            dec (float or :class:`numpy.ndarray`): Declinations in degree.
+            radius (float or :class:`numpy.ndarray`): Search radii in arcsec.
+            epoch (float): Epoch of the positions of stars. The zone index
+                and output positions are moved to this epoch. Positions in
+                catalogue are used if *None*.
+            columns (list): Names of output columns. All columns are returned
+                if *None*.
+            output (str): Either *"ndarray"* or *"dict"*.
+        Returns:
+            :class:`numpy.ma.MaskedArray` or dict: Records of matched stars,
+                with two extra columns `_q` giving the indices of input
+                positions, and `_r` giving the angular distances in arcsec.
+                Records are sorted by `_q`, and by `_r` for each position.
+        Examples:
+
+            .. code-block:: python
+
+                >>> from stella.catalog import HIP
+                >>> res = HIP.cone_search_many([101.287, 95.988], [-16.716, -52.696],
+                ...                            60., columns=['HIP', 'Vmag'])
+                >>> res['_q'], res['HIP']
+                (masked_array(data=[0, 1], ...), masked_array(data=[32349, 30438], ...))
+        """
+        index = self._get_zone_index(epoch)
+        qid, rowid, sep = query_zone_index(index, ra, dec,
+                                           np.asarray(radius)/3600.)
+        result = self._take_columns(rowid, columns, self._check_epoch(epoch))
+        result['_q'] = qid
+        result['_r'] = sep*3600.
+        mask = np.zeros(qid.size, dtype=np.bool_)
+        return _pack_records(result, mask, output)
+
+    def _get_zonemap(self):
+        """Get the per-block minimum and maximum values of numeric columns
+        in catalogue.
+
+        The zone map is computed in one pass over the table the first time
+        it is needed, and saved under `$STELLA_DATA/cache/catalog`.
+
+        Returns:
+            dict: Memory-mapped zone map.
+        """
+        if self._zonemap is None:
+            zonemap = load_cache(self.catfile, 'zonemap')
+            if zonemap is None:
+                save_cache(self.catfile, 'zonemap',
+                    _build_zonemap(self, self._zonemap_blocksize))
+                zonemap = load_cache(self.catfile, 'zonemap')
+            self._zonemap = zonemap
+        return self._zonemap
+
+    def scan(self, columns=None, where=None, blocksize=65536,
+            output='ndarray', zonemap=True):
+        """Scan the whole catalogue block by block and yield the matching
+        rows.
+
+        Rows are read from the memory-mapped table in blocks of `blocksize`.
+        Only the requested columns and the columns used in `where` are
+        decoded, so the peak memory is bounded by the block size instead of
+        the size of catalogue. If `where` is a dict of ranges, blocks which
+        cannot match are skipped without being read by using the per-block
+        minimum and maximum values of columns (zone map).
+
+        Args:
+            columns (list): Names of output columns. All columns are returned
+                if *None*.
+            where (dict or callable): Selection of rows. Either a dict mapping
+                column names to (`min`, `max`) tuples, where both bounds are
+                inclusive and can be *None*, or a function taking the columns
+                of a block (accessed as `block['Teff']`) and returning a
+                boolean array.
+            blocksize (int): Number of rows in each block.
+            output (str): Either *"ndarray"* or *"dict"*.
+            zonemap (bool): Whether to skip blocks using the zone map. Only
+                used if `where` is a dict.
+        Returns:
+            generator: Yields the matching rows of each non-empty block, in
+                the same format as :meth:`find_objects`.
+        Examples:
+            Select KIC stars with 5000 < *T*\ :sub:`eff` < 6000 K and *Kp* < 13
+
+            .. code-block:: python
+
+                >>> from stella.catalog import KIC
+                >>> for rec in KIC.scan(columns=['KIC', 'Teff', 'kepmag'],
+                ...         where=lambda b: (b['Teff'] > 5000) & (b['Teff'] < 6000)
+                ...                         & (b['kepmag'] < 13)):
+                ...     print(rec.size)
+
+            The same selection with inclusive ranges:
+
+            .. code-block:: python
+
+                >>> for rec in KIC.scan(columns=['KIC', 'Teff', 'kepmag'],
+                ...         where={'Teff': (5000, 6000), 'kepmag': (None, 13)}):
+                ...     print(rec.size)
+
+        """
+        data = self._get_data()
+        if columns is None:
+            columns = list(data.dtype.names)
+
+        if zonemap and isinstance(where, dict):
+            ranges = _get_zonemap_ranges(self._get_zonemap(), where,
+                                         data.size, blocksize)
+        else:
+            ranges = [(i1, min(i1 + blocksize, data.size))
+                      for i1 in range(0, data.size, blocksize)]
+
+        for i1, i2 in ranges:
+            block = _BlockColumns(self, i1, i2)
+            m = _eval_where(where, block, i2 - i1)
+            if not m.any():
+                continue
+            result = {key: block[key][m] for key in columns}
+            mask = np.zeros(m.sum(), dtype=np.bool_)
+            yield _pack_records(result, mask, output)
@@ -1,11 +1,11 @@
 import os
 import numpy as np
 import astropy.io.fits as fits
-from ..utils.fitsio import get_bintable_info
 from ..utils.asciitable import structitem_to_dict
-from .name import _get_HR_number
+from .base import _FITSCatalog
+from .name import _get_HR_number, _get_star_numbers
 
-class _BSC(object):
+class _BSC(_FITSCatalog):
     """Class for *Bright Star Catalogue* 5th Edition (`V/50
     <http://vizier.u-strasbg.fr/viz-bin/VizieR-3?-source=V/50>`_, Hoffleit+
     1991).
@@ -45,20 +45,8 @@ class _BSC(object):
     """
 
     def __init__(self):
-        self.catfile = os.path.join(os.getenv('STELLA_DATA'), 'catalog/BSC.fits')
-        self._data_info = None
-
-    def _get_data_info(self):
-        """Get information of FITS table."""
-        nbyte, nrow, ncol, pos, dtype, fmtfunc = get_bintable_info(self.catfile)
-        self._data_info = {
-                'nbyte'  : nbyte,
-                'nrow'   : nrow,
-                'ncol'   : ncol,
-                'pos'    : pos,
-                'dtype'  : dtype,
-                'fmtfunc': fmtfunc,
-                }
+        catfile = os.path.join(os.getenv('STELLA_DATA'), 'catalog/BSC.fits')
+        super(_BSC, self).__init__(catfile)
 
     def find_object(self, name, output='dict'):
         """Find record for an object in *Bright Star Catalogue*, 5th Edition.
@@ -75,23 +63,13 @@ class _BSC(object):
 
         hr = _get_HR_number(name)
 
-        if self._data_info is None:
-            self._get_data_info()
+        data = self._get_data()
+        nrow = data.size
 
-        nrow    = self._data_info['nrow']
-        nbyte   = self._data_info['nbyte']
-        pos     = self._data_info['pos']
-        fmtfunc = self._data_info['fmtfunc']
-
-        infile = open(self.catfile, 'rb')
-
-        if sao > 0 and hr <= nrow:
-            infile.seek(pos+(hr-1)*nbyte,0)
-            item = fmtfunc(infile.read(nbyte))
+        if hr is not None and 0 < hr <= nrow:
+            item = self._get_item(hr-1)
         else:
-            pass
-
-        infile.close()
+            return None
 
         if output == 'ndarray':
             return item
@@ -100,4 +78,31 @@ class _BSC(object):
         else:
             return None
 
+    def find_objects(self, names, columns=None, output='ndarray'):
+        """Find records for a list of objects in *Bright Star Catalogue*.
+
+        Args:
+            names (list or :class:`numpy.ndarray`): Names or numbers of stars.
+            columns (list): Names of output columns. All columns are returned
+                if *None*.
+            output (str): Type of output results. Either *"ndarray"* or
+                *"dict"*.
+        Returns:
+            :class:`numpy.ma.MaskedArray` or dict: Records in catalogue, in the
+                same order as the input names. Stars not in catalogue are
+                masked.
+        Examples:
+
+            .. code-block:: python
+
+                >>> from stella.catalog import BSC
+                >>> res = BSC.find_objects(['HR 509', 1],
+                ...                        columns=['HR', 'Vmag', 'SpType'])
+
+        """
+
+        hr = _get_star_numbers(names, 'HR', comp=True)
+        index, mask = self._get_index(hr, 'HR')
+        return self._take(index, mask, columns, output)
+
 BSC = _BSC()
@@ -0,0 +1,44 @@
+from ..utils import npycache
+
+def get_cache_path(catfile, name):
+    """Get the directory of a cache built from a catalogue file.
+
+    Caches are stored in `$STELLA_DATA/cache/catalog/<catalogue>/<name>`.
+
+    Args:
+        catfile (str): Name of the catalogue file.
+        name (str): Name of the cache (e.g. *"zones"*).
+    Returns:
+        str: Path to the cache directory.
+    """
+    return npycache.get_cache_path('catalog', catfile, name)
+
+def load_cache(catfile, name, keys=None, mmap_mode='r'):
+    """Load arrays in a cache if it is up to date with the catalogue file.
+    See :func:`stella.utils.npycache.load_cache`.
+
+    Args:
+        catfile (str): Name of the catalogue file.
+        name (str): Name of the cache.
+        keys (list): Names of arrays to be loaded. All arrays are loaded if
+            *None*.
+        mmap_mode (str): Memory-map mode passed to :func:`numpy.load`.
+    Returns:
+        dict: A dict containing the (memory-mapped) arrays, or *None* if the
+            cache does not exist, is out of date, or misses any of `keys`.
+    """
+    return npycache.load_cache('catalog', catfile, name, keys=keys,
+                               mmap_mode=mmap_mode)
+
+def save_cache(catfile, name, arrays, clear=True):
+    """Save arrays into the cache of a catalogue file.
+    See :func:`stella.utils.npycache.save_cache`.
+
+    Args:
+        catfile (str): Name of the catalogue file.
+        name (str): Name of the cache.
+        arrays (dict): A dict containing arrays to be saved.
+        clear (bool): Remove arrays already in the cache if *True*. Otherwise
+            the new arrays are added to the existing ones.
+    """
+    npycache.save_cache('catalog', catfile, name, arrays, clear=clear)
@@ -1,10 +1,17 @@
 import os
-import struct
 import numpy as np
 import astropy.io.fits as fits
-from ..utils.fitsio import get_bintable_info
 from ..utils.asciitable import structitem_to_dict
-from .name import _get_EPIC_number
+from .base import _FITSCatalog, _pack_records
+from .name import _get_EPIC_number, _get_star_numbers
+
+class _EPICTable(_FITSCatalog):
+    """Class for one of the FITS tables of *K2 Ecliptic Plane Input
+    Catalog*.
+    """
+
+    # epoch of positions in catalogue
+    _epoch0 = 2000.0
 
 class _EPIC(object):
     """Class for *K2 Ecliptic Plane Input Catalog* (EPIC, `Huber+ 2016
@@ -99,27 +106,24 @@ class _EPIC(object):
                 5: (240000001, 250000000),
                 6: (250000001, 251809654),
                 }
-        self._data_info = {}
-        
-    def _get_data_info(self, dataset):
-        """Get information of FITS table.
-        
+        self._tables = {dataset: _EPICTable(catfile)
+                        for dataset, catfile in self.catfile.items()
+                        }
+
+    def _get_dataset(self, epic):
+        """Get the number of EPIC table containing the given EPIC number.
+
         Args:
-            dataset (int): Number of EPIC table (1~6).
+            epic (int): EPIC number.
         Returns:
-            No returns
+            int: Number of EPIC table (1~6), or *None* if out of range.
 
         """
-        nbyte, nrow, ncol, pos, dtype, fmtfunc = get_bintable_info(self.catfile[dataset])
-        self._data_info[dataset] = {
-                'nbyte'  : nbyte,
-                'nrow'   : nrow,
-                'ncol'   : ncol,
-                'pos'    : pos,
-                'dtype'  : dtype,
-                'fmtfunc': fmtfunc
-                }
-        
+        for dataset, (epic1, epic2) in sorted(self._epic_ranges.items()):
+            if epic1 <= epic <= epic2:
+                return dataset
+        return None
+
     def find_object(self, name, output='dict'):
         """Find records in *K2 Ecliptic Plane Input Catalog*.
 
@@ -144,22 +148,15 @@ class _EPIC(object):
         """
         
         epic = _get_EPIC_number(name)
-        for dataset, (epic1, epic2) in sorted(self._epic_ranges.items()):
-            if epic1 <= epic <= epic2:
-                break
-
-        if dataset not in self._data_info:
-            self._get_data_info(dataset)
-
-        pos     = self._data_info[dataset]['pos']
-        nrow    = self._data_info[dataset]['nrow']
-        nbyte   = self._data_info[dataset]['nbyte']
-        fmtfunc = self._data_info[dataset]['fmtfunc']
+        dataset = self._get_dataset(epic)
+        if dataset is None:
+            return None
 
-        infile = open(self.catfile[dataset], 'rb')
-        infile.seek(pos + (epic-epic1)*nbyte, 0)
-        item = fmtfunc(infile.read(nbyte))
-        infile.close()
+        table = self._tables[dataset]
+        index = epic - self._epic_ranges[dataset][0]
+        if index >= table._get_data().size:
+            return None
+        item = table._get_item(index)
 
         if item['EPIC'] != epic:
             return None
@@ -171,4 +168,95 @@ class _EPIC(object):
         else:
             return None
 
+    def find_objects(self, names, epoch=None, columns=None, output='ndarray'):
+        """Find records for a list of objects in *K2 Ecliptic Plane Input
+        Catalog*.
+
+        Args:
+            names (list or :class:`numpy.ndarray`): Names or numbers of stars.
+            epoch (float): Epoch of output astrometric parameters. Positions
+                at J2000 in catalogue are returned if *None*.
+            columns (list): Names of output columns. All columns are returned
+                if *None*.
+            output (str): Type of output results. Either *"ndarray"* or
+                *"dict"*.
+        Returns:
+            :class:`numpy.ma.MaskedArray` or dict: Records in catalogue, in the
+                same order as the input names. Stars not in catalogue are
+                masked.
+        Examples:
+
+            .. code-block:: python
+
+                >>> from stella.catalog import EPIC
+                >>> res = EPIC.find_objects([201121245, 'EPIC 210000001'],
+                ...                         columns=['EPIC', 'kepmag', 'Teff'])
+
+        """
+
+        epic = _get_star_numbers(names, 'EPIC')
+        mask = np.ones(epic.size, dtype=bool)
+
+        result = None
+        for dataset, (epic1, epic2) in sorted(self._epic_ranges.items()):
+            m = (epic >= epic1) & (epic <= epic2)
+            if m.sum() == 0:
+                continue
+            table = self._tables[dataset]
+            data = table._get_data()
+            index = epic[m] - epic1
+            found = index < data.size
+            index[~found] = 0
+            found &= table._read_columns(index, ['EPIC'])['EPIC'] == epic[m]
+            columns_data = table._take_columns(index, columns, epoch)
+
+            if result is None:
+                result = {key: np.zeros(epic.size, dtype=array.dtype)
+                          for key, array in columns_data.items()}
+            for key, array in columns_data.items():
+                result[key][m] = array
+            mask[m] = ~found
+
+        if result is None:
+            # none of the input names is in EPIC. use the first table to get
+            # the columns
+            result = self._tables[1]._take_columns(
+                        np.zeros(epic.size, dtype=np.int64), columns)
+
+        return _pack_records(result, mask, output)
+
+    def build_columns(self, columns=None):
+        """Convert all the tables of *K2 Ecliptic Plane Input Catalog* into
+        columnar caches.
+
+        Args:
+            columns (list): Names of columns to be converted. All columns are
+                converted if *None*.
+        See also:
+            :meth:`stella.catalog.base._FITSCatalog.build_columns`
+        """
+        for dataset in sorted(self._tables):
+            self._tables[dataset].build_columns(columns)
+
+    def scan(self, columns=None, where=None, blocksize=65536,
+            output='ndarray', zonemap=True):
+        """Scan all the tables of *K2 Ecliptic Plane Input Catalog* block by
+        block and yield the matching rows.
+
+        Args:
+            columns (list): Names of output columns. All columns are returned
+                if *None*.
+            where (dict or callable): Selection of rows. See
+                :meth:`stella.catalog.base._FITSCatalog.scan`.
+            blocksize (int): Number of rows in each block.
+            output (str): Either *"ndarray"* or *"dict"*.
+            zonemap (bool): Whether to skip blocks using the zone maps.
+        Returns:
+            generator: Yields the matching rows of each non-empty block.
+        """
+        for dataset in sorted(self._tables):
+            for result in self._tables[dataset].scan(columns, where,
+                                            blocksize, output, zonemap):
+                yield result
+
 EPIC = _EPIC()
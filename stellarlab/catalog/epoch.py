@@ -0,0 +1,62 @@
+import numpy as np
+
+def propagate_epoch(ra, dec, pmra, pmdec, epoch0, epoch):
+    """Propagate positions from one epoch to another using proper motions.
+
+    The positions are moved linearly on the sphere, which is adequate for the
+    proper motions and time spans of HIP, TYC, KIC and EPIC. All arguments
+    can be scalars or arrays of the same shape.
+
+    Args:
+        ra (float or :class:`numpy.ndarray`): Right ascensions in degree.
+        dec (float or :class:`numpy.ndarray`): Declinations in degree.
+        pmra (float or :class:`numpy.ndarray`): Proper motions in RA with
+            cos(*δ*) factor in mas/yr.
+        pmdec (float or :class:`numpy.ndarray`): Proper motions in Dec in
+            mas/yr.
+        epoch0 (float): Epoch of the input positions in Julian year.
+        epoch (float): Epoch of the output positions in Julian year.
+    Returns:
+        tuple: A tuple of (RA, Dec) in degree at `epoch`.
+    Examples:
+
+        .. code-block:: python
+
+            >>> from stella.catalog import HIP
+            >>> from stella.catalog.epoch import propagate_epoch
+            >>> rec = HIP.find_objects([8102, 32349], epoch=1991.25, output='dict')
+            >>> ra, dec = propagate_epoch(rec['RAdeg'], rec['DEdeg'],
+            ...                           rec['pmRA'], rec['pmDE'], 1991.25, 2016.0)
+
+    """
+    dt = epoch - epoch0
+    pm_ra = np.asarray(pmra, dtype=np.float64)*1e-3/3600. # mas/yr -> deg/yr
+    pm_de = np.asarray(pmdec, dtype=np.float64)*1e-3/3600. # mas/yr -> deg/yr
+    ra  = ra + dt*pm_ra/np.cos(np.deg2rad(dec))
+    dec = dec + dt*pm_de
+    return ra, dec
+
+def _change_epoch(columns, epoch0, epoch):
+    """Change the epoch of astrometric columns using proper motions.
+
+    Args:
+        columns (dict or :class:`numpy.ndarray`): A dict or structured array
+            containing `RAdeg`, `DEdeg`, `pmRA` and `pmDE`. `RAdeg` and
+            `DEdeg` are changed in place.
+        epoch0 (float): Epoch of the input positions.
+        epoch (float): Epoch of the output positions.
+    """
+    ra, dec = propagate_epoch(columns['RAdeg'], columns['DEdeg'],
+                              columns['pmRA'], columns['pmDE'], epoch0, epoch)
+    columns['RAdeg'][...] = ra
+    columns['DEdeg'][...] = dec
+
+def _get_epoch_name(epoch):
+    """Get the name of caches built for a given epoch.
+
+    Args:
+        epoch (float): Epoch in Julian year.
+    Returns:
+        str: Name such as *"J2000"* or *"J2015.5"*.
+    """
+    return 'J%g'%epoch
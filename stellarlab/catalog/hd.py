@@ -1,11 +1,11 @@
 import os
 import numpy as np
 import astropy.io.fits as fits
-from ..utils.fitsio import get_bintable_info
 from ..utils.asciitable import structitem_to_dict
-from .name import _get_HD_number
+from .base import _FITSCatalog
+from .name import _get_HD_number, _get_star_numbers
 
-class _HD(object):
+class _HD(_FITSCatalog):
     """Class for *Hennry Draper Catalogue* (`III/135A
     <http://vizier.u-strasbg.fr/viz-bin/VizieR-3?-source=III/135A>`_, Cannon &
     Pickering 1918-1924).
@@ -28,20 +28,8 @@ class _HD(object):
     """
 
     def __init__(self):
-        self.catfile = os.path.join(os.getenv('STELLA_DATA'), 'catalog/HD.fits')
-        self._data_info = None
-
-    def _get_data_info(self):
-        """Get information of FITS table."""
-        nbyte, nrow, ncol, pos, dtype, fmtfunc = get_bintable_info(self.catfile)
-        self._data_info = {
-                'nbyte'  : nbyte,
-                'nrow'   : nrow,
-                'ncol'   : ncol,
-                'pos'    : pos,
-                'dtype'  : dtype,
-                'fmtfunc': fmtfunc,
-                }
+        catfile = os.path.join(os.getenv('STELLA_DATA'), 'catalog/HD.fits')
+        super(_HD, self).__init__(catfile)
 
     def find_object(self, name, output='dict'):
         """Find record for an object in *Henry Draper Catalogue*.
@@ -66,23 +54,13 @@ class _HD(object):
 
         hd = _get_HD_number(name)
 
-        if self._data_info is None:
-            self._get_data_info()
+        data = self._get_data()
+        nrow = data.size
 
-        nrow    = self._data_info['nrow']
-        nbyte   = self._data_info['nbyte']
-        pos     = self._data_info['pos']
-        fmtfunc = self._data_info['fmtfunc']
-
-        infile = open(self.catfile, 'rb')
-
-        if hd > 0 and hd <= nrow:
-            infile.seek(pos+(hd-1)*nbyte,0)
-            item = fmtfunc(infile.read(nbyte))
+        if hd is not None and 0 < hd <= nrow:
+            item = self._get_item(hd-1)
         else:
-            pass
-
-        infile.close()
+            return None
 
         if output == 'ndarray':
             return item
@@ -91,4 +69,31 @@ class _HD(object):
         else:
             return None
 
+    def find_objects(self, names, columns=None, output='ndarray'):
+        """Find records for a list of objects in *Henry Draper Catalogue*.
+
+        Args:
+            names (list or :class:`numpy.ndarray`): Names or numbers of stars.
+            columns (list): Names of output columns. All columns are returned
+                if *None*.
+            output (str): Type of output results. Either *"ndarray"* or
+                *"dict"*.
+        Returns:
+            :class:`numpy.ma.MaskedArray` or dict: Records in catalogue, in the
+                same order as the input names. Stars not in catalogue are
+                masked.
+        Examples:
+
+            .. code-block:: python
+
+                >>> from stella.catalog import HD
+                >>> res = HD.find_objects(['HD 10700', 'HD 1'],
+                ...                       columns=['HD', 'Ptm', 'SpT'])
+
+        """
+
+        hd = _get_star_numbers(names, 'HD', comp=True)
+        index, mask = self._get_index(hd, 'HD')
+        return self._take(index, mask, columns, output)
+
 HD = _HD()
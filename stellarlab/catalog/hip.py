@@ -2,11 +2,12 @@ import os
 import math
 import numpy as np
 import astropy.io.fits as fits
-from ..utils.fitsio import get_bintable_info
 from ..utils.asciitable import structitem_to_dict
-from .name import _get_HIP_number
+from .base import _FITSCatalog
+from .epoch import _change_epoch
+from .name import _get_HIP_number, _get_star_numbers
 
-def _find_HIP_object(name, catfile, data_info, epoch=2000.0, output='dict'):
+def _find_HIP_object(name, catalog, epoch=2000.0, output='dict'):
     """Find record for an object in either HIP catalogue (`I/239
     <http://vizier.u-strasbg.fr/viz-bin/VizieR-3?-source=I/239>`_, Perryman+
     1997) or HIP New Reduction (`I/311
@@ -15,8 +16,7 @@ def _find_HIP_object(name, catfile, data_info, epoch=2000.0, output='dict'):
 
     Args:
         name (string or integer): Name or number of star.
-        catfile (string): Name of the catalogue file.
-        data_info (dict): Information of the FITS catalogue file.
+        catalog (:class:`_FITSCatalog`): Instance of the HIP catalogue.
         epoch (float): Epoch of the output astrometric parameters.
         output (string): Type of output results. Either *"dict"* or *"dtype"*
             (:class:`numpy.dtype`).
@@ -24,30 +24,15 @@ def _find_HIP_object(name, catfile, data_info, epoch=2000.0, output='dict'):
         dict or :class:`numpy.dtype`: Record in catalogue.
     """
 
-    def change_epoch(item, epoch):
-        pm_ra = item['pmRA']*1e-3/3600. # convert pm_RA from mas/yr to deg/yr
-        pm_de = item['pmDE']*1e-3/3600. # convert pm_DE from mas/yr to deg/yr
-        item['RAdeg'] += (epoch-1991.25)*pm_ra/math.cos(item['DEdeg']/180.*math.pi)
-        item['DEdeg'] += (epoch-1991.25)*pm_de
-
     hip = _get_HIP_number(name)
 
-    pos     = data_info['pos']
-    nbyte   = data_info['nbyte']
-    fmtfunc = data_info['fmtfunc']
-
-    infile = open(catfile,'rb')
-
     if hip is None:
         # return a null result
         # hip = 672 is the common null record in both HIP and HIP New
-        infile.seek(pos+(672-1)*nbyte, 0)
-        item = fmtfunc(infile.read(nbyte))
+        item = catalog._get_item(672-1)
     else:
-        infile.seek(pos+(hip-1)*nbyte, 0)
-        item = fmtfunc(infile.read(nbyte))
-        change_epoch(item, epoch)
-    infile.close()
+        item = catalog._get_item(hip-1)
+        _change_epoch(item, catalog._epoch0, epoch)
 
     if output == 'dtype':
         return item
@@ -57,7 +42,29 @@ def _find_HIP_object(name, catfile, data_info, epoch=2000.0, output='dict'):
         return None
 
 
-class _HIP(object):
+def _find_HIP_objects(names, catalog, epoch=2000.0, columns=None,
+        output='ndarray'):
+    """Find records for a list of objects in either HIP catalogue or HIP New
+    Reduction.
+
+    Args:
+        names (list or :class:`numpy.ndarray`): Names or numbers of stars.
+        catalog (:class:`_FITSCatalog`): Instance of the HIP catalogue.
+        epoch (float): Epoch of the output astrometric parameters.
+        columns (list): Names of output columns. All columns are returned if
+            *None*.
+        output (string): Type of output results. Either *"ndarray"* or
+            *"dict"*.
+    Returns:
+        :class:`numpy.ma.MaskedArray` or dict: Records in catalogue. Stars not
+            in catalogue are masked.
+    """
+    hip = _get_star_numbers(names, 'HIP')
+    index, mask = catalog._get_index(hip, 'HIP')
+    return catalog._take(index, mask, columns, output, epoch)
+
+
+class _HIP(_FITSCatalog):
     """Class for *Hipparcos Catalogue* (`I/239
     <http://vizier.u-strasbg.fr/viz-bin/VizieR-3?-source=I/239>`_, Perryman+
     1997).
@@ -98,21 +105,12 @@ class _HIP(object):
         r_SpType, character, ,       Source of Spectral type
     """
 
+    # epoch of positions in catalogue
+    _epoch0 = 1991.25
+
     def __init__(self):
-        self.catfile = os.path.join(os.getenv('STELLA_DATA'), 'catalog/HIP.fits')
-        self._data_info = None
-
-    def _get_data_info(self):
-        """Get information of FITS table."""
-        nbyte, nrow, ncol, pos, dtype, fmtfunc = get_bintable_info(self.catfile)
-        self._data_info = {
-                'nbyte'  : nbyte,
-                'nrow'   : nrow,
-                'ncol'   : ncol,
-                'pos'    : pos,
-                'dtype'  : dtype,
-                'fmtfunc': fmtfunc
-                }
+        catfile = os.path.join(os.getenv('STELLA_DATA'), 'catalog/HIP.fits')
+        super(_HIP, self).__init__(catfile)
 
     def find_object(self, name, epoch=2000.0, output='dict'):
         """Find record for an object in *Hipparcos Catalogue*.
@@ -138,13 +136,35 @@ class _HIP(object):
     
         """
 
-        if self._data_info is None:
-            self._get_data_info()
+        return _find_HIP_object(name, self, epoch, output)
+
+    def find_objects(self, names, epoch=2000.0, columns=None,
+            output='ndarray'):
+        """Find records for a list of objects in *Hipparcos Catalogue*.
+
+        Args:
+            names (list or :class:`numpy.ndarray`): Names or numbers of stars.
+            epoch (float): Epoch of output astrometric parameters.
+            columns (list): Names of output columns. All columns are returned
+                if *None*.
+            output (str): Type of output results. Either *"ndarray"* or
+                *"dict"*.
+        Returns:
+            :class:`numpy.ma.MaskedArray` or dict: Records in catalogue, in the
+                same order as the input names. Stars not in catalogue are
+                masked.
+        Examples:
+
+            .. code-block:: python
 
-        return _find_HIP_object(name, self.catfile, self._data_info, epoch, output)
+                >>> from stella.catalog import HIP
+                >>> res = HIP.find_objects([8102, 'HIP 1'], columns=['HIP', 'Plx'])
+
+        """
+        return _find_HIP_objects(names, self, epoch, columns, output)
 
 
-class _HIP2(object):
+class _HIP2(_FITSCatalog):
     """Class for *Hipparcos Catalogue New Reduction* (`I/311
     <http://vizier.u-strasbg.fr/viz-bin/VizieR-3?-source=I/311>`_, van Leeuwen
     2007).
@@ -175,21 +195,12 @@ class _HIP2(object):
     
     """
 
+    # epoch of positions in catalogue
+    _epoch0 = 1991.25
+
     def __init__(self):
-        self.catfile = os.path.join(os.getenv('STELLA_DATA'), 'catalog/HIP2.fits')
-        self._data_info = None
-
-    def _get_data_info(self):
-        """Get information of FITS table."""
-        nbyte, nrow, ncol, pos, dtype, fmtfunc = get_bintable_info(self.catfile)
-        self._data_info = {
-                'nbyte'  : nbyte,
-                'nrow'   : nrow,
-                'ncol'   : ncol,
-                'pos'    : pos,
-                'dtype'  : dtype,
-                'fmtfunc': fmtfunc
-                }
+        catfile = os.path.join(os.getenv('STELLA_DATA'), 'catalog/HIP2.fits')
+        super(_HIP2, self).__init__(catfile)
 
     def find_object(self, name, epoch=2000.0, output='dict'):
         """Find record for an object in *Hipparcos Catalogue New Reduction*.
@@ -218,10 +229,33 @@ class _HIP2(object):
 
         """
 
-        if self._data_info is None:
-            self._get_data_info()
+        return _find_HIP_object(name, self, epoch, output)
+
+    def find_objects(self, names, epoch=2000.0, columns=None,
+            output='ndarray'):
+        """Find records for a list of objects in *Hipparcos Catalogue New
+        Reduction*.
 
-        return _find_HIP_object(name, self.catfile, self._data_info, epoch, output)
+        Args:
+            names (list or :class:`numpy.ndarray`): Names or numbers of stars.
+            epoch (float): Epoch of output astrometric parameters.
+            columns (list): Names of output columns. All columns are returned
+                if *None*.
+            output (str): Type of output results. Either *"ndarray"* or
+                *"dict"*.
+        Returns:
+            :class:`numpy.ma.MaskedArray` or dict: Records in catalogue, in the
+                same order as the input names. Stars not in catalogue are
+                masked.
+        Examples:
+
+            .. code-block:: python
+
+                >>> from stella.catalog import HIP2
+                >>> res = HIP2.find_objects([8102, 'HIP 1'], columns=['HIP', 'Plx'])
+
+        """
+        return _find_HIP_objects(names, self, epoch, columns, output)
 
 HIP = _HIP()
 HIP2 = _HIP2()
@@ -1,5 +1,7 @@
 import os
+import numpy as np
 from .base import _str_to_float, _str_to_int
+from .cache import load_cache, save_cache
 
 planet_files = {
         1: 'ApJ.728.117.tablea1.dat', # Borucki et al. 2011a
@@ -7,25 +9,227 @@ planet_files = {
         }
 
 
+# columns of planet tables in each release
+_release_columns = {
+        1: [('koi', np.int32), ('planet_id', np.float64), ('r', np.float64),
+            ('P', np.float64), ('rR', np.float64)],
+        2: [('koi', np.int32), ('planet_id', np.float64),
+            ('Tdur', np.float64), ('depth', np.float64),
+            ('P', np.float64), ('e_P', np.float64),
+            ('r/R*', np.float64), ('e_r/R*', np.float64),
+            ('a/R*', np.float64), ('e_a/R*', np.float64),
+            ('b', np.float64), ('e_b', np.float64),
+            ('r', np.float64), ('a', np.float64), ('Teq', np.int32)],
+        }
+
+# columns with constant values in each release
+_release_constants = {
+        1: {},
+        2: {'status': 'candidate', 'ref': 'Borucki et al. 2011b'},
+        }
+
+class _KeplerRelease(object):
+    """Planet table of a data release, loaded into a structured array.
+
+    The array is sorted by KOI number and saved in the cache of the table
+    file, so that the fixed-width table is only parsed once. Missing values
+    are stored as NaN for float columns and −1 for integer columns.
+
+    Args:
+        release (int): Data release.
+    """
+
+    def __init__(self, release):
+        if release not in planet_files:
+            print('Error: Unknown data release %s'%str(release))
+            raise ValueError
+        self.release  = release
+        self.filename = os.path.join(os.getenv('STELLA_DATA'),
+                            'catalog/Kepler/%s'%planet_files[release])
+        self._records = None
+
+    def _parse(self):
+        """Parse the table file into a structured array."""
+        parse = {1: _parse_planet_record_r1,
+                 2: _parse_planet_record_r2}[self.release]
+        columns = _release_columns[self.release]
+        rows = []
+        infile = open(self.filename)
+        for row in infile:
+            if len(row.strip())==0:
+                continue
+            record = parse(row)
+            rows.append(tuple([(-1 if dtype == np.int32 else np.nan)
+                               if record[key] is None else record[key]
+                               for key, dtype in columns]))
+        infile.close()
+        records = np.array(rows, dtype=columns)
+        order = np.argsort(records['koi'], kind='stable')
+        return records[order]
+
+    def _load(self):
+        """Load the records and build the KOI and planet indices."""
+        if self._records is not None:
+            return
+        cache = load_cache(self.filename, 'kepler')
+        if cache is None:
+            save_cache(self.filename, 'kepler', {'records': self._parse()})
+            cache = load_cache(self.filename, 'kepler')
+        records = cache['records']
+
+        # KOI -> range of rows
+        koi, first, count = np.unique(records['koi'], return_index=True,
+                                      return_counts=True)
+        self._koi_index = {int(k): (int(i1), int(i1+n))
+                           for k, i1, n in zip(koi, first, count)}
+        # planet_id -> row. planet IDs are sorted as integers NNNNN, and the
+        # first row is kept for duplicated IDs
+        keys, first = np.unique(_get_planet_keys(records['planet_id']),
+                                return_index=True)
+        self._planet_keys = keys
+        self._planet_rows = first
+        self._records = records
+
+    def get_records(self):
+        """Get the structured array of all planets."""
+        self._load()
+        return self._records
+
+    def get_record(self, i):
+        """Get the record of a planet as a dict, in the same form as the
+        parsers of table rows.
+
+        Args:
+            i (int): Index of row.
+        Returns:
+            dict: Parameters of the planet.
+        """
+        self._load()
+        row = self._records[i]
+        record = {}
+        for key, dtype in _release_columns[self.release]:
+            value = row[key].item()
+            if dtype == np.int32:
+                record[key] = None if value == -1 and key != 'koi' else value
+            else:
+                record[key] = None if np.isnan(value) else value
+        record.update(_release_constants[self.release])
+        return record
+
+    def find_rows(self, koi):
+        """Find the rows of a planetary system.
+
+        Args:
+            koi (int): KOI number of the system.
+        Returns:
+            range: Indices of rows.
+        """
+        self._load()
+        i1, i2 = self._koi_index.get(int(koi), (0, 0))
+        return range(i1, i2)
+
+    def find_planet_row(self, planet_id):
+        """Find the row of a planet.
+
+        Args:
+            planet_id (float): KOI number `NNN.NN` of the planet.
+        Returns:
+            int: Index of row, or *None* if not found.
+        """
+        rows = self.find_planet_rows([planet_id])[1]
+        return int(rows[0]) if rows.size > 0 else None
+
+    def find_many_rows(self, kois):
+        """Find the rows of a list of planetary systems.
+
+        Args:
+            kois (list or :class:`numpy.ndarray`): KOI numbers of the systems.
+        Returns:
+            tuple: A tuple of (`qid`, `rows`), where `qid` are the indices of
+                input KOIs, and `rows` the indices of the matched rows, sorted
+                by `qid`.
+        """
+        self._load()
+        kois = np.atleast_1d(np.asarray(kois)).astype(np.int64)
+        keys = self._records['koi']
+        i1 = np.searchsorted(keys, kois, side='left')
+        i2 = np.searchsorted(keys, kois, side='right')
+        count = i2 - i1
+        qid = np.repeat(np.arange(kois.size), count)
+        # offsets of each row within its system
+        offset = np.arange(qid.size) - np.repeat(np.cumsum(count)-count, count)
+        return qid, np.repeat(i1, count) + offset
+
+    def find_planet_rows(self, planet_ids):
+        """Find the rows of a list of planets.
+
+        Args:
+            planet_ids (list or :class:`numpy.ndarray`): KOI numbers `NNN.NN`
+                of the planets.
+        Returns:
+            tuple: A tuple of (`qid`, `rows`), where `qid` are the indices of
+                the input planets found in the table, and `rows` the indices
+                of their rows.
+        """
+        self._load()
+        targets = _get_planet_keys(planet_ids)
+        if self._planet_keys.size == 0:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+        i = np.searchsorted(self._planet_keys, targets)
+        i = np.minimum(i, self._planet_keys.size-1)
+        found = self._planet_keys[i] == targets
+        return np.nonzero(found)[0], self._planet_rows[i[found]]
+
+def _get_planet_keys(planet_ids):
+    """Convert planet IDs `NNN.NN` to integers `NNNNN` for exact matching."""
+    planet_ids = np.atleast_1d(np.asarray(planet_ids, dtype=np.float64))
+    return np.round(planet_ids*100).astype(np.int64)
+
+# planet tables loaded in this process, keyed by data release
+_releases = {}
+
+def _get_release(release):
+    """Get the planet table of a data release."""
+    if release not in _releases:
+        _releases[release] = _KeplerRelease(release)
+    return _releases[release]
+
 def load_systems(release):
     """Return a planetary system list in the given data releases.
 
     Args:
-        release:
+        release (int): Data release.
+    Returns:
+        :class:`numpy.ndarray`: A structured array with columns `koi` and
+            `nplanet` (number of planet candidates), sorted by KOI number.
     """
-    pass
+    records = _get_release(release).get_records()
+    koi, count = np.unique(records['koi'], return_counts=True)
+    systems = np.empty(koi.size, dtype=[('koi', np.int32),
+                                        ('nplanet', np.int32)])
+    systems['koi']     = koi
+    systems['nplanet'] = count
+    return systems
 
 def load_planets(release):
     """Return a planet list in the given data releases.
 
     Args:
-        release:
+        release (int): Data release.
+    Returns:
+        :class:`numpy.ndarray`: A structured array of planet parameters sorted
+            by KOI number. Missing values are NaN for float columns and −1 for
+            integer columns.
     """
-    pass
+    return _get_release(release).get_records()
 
 def find_system(koi, release):
     """Find parameters of a planetary system in the given data releases.
 
+    Both releases are supported. The records of release 1 contain the columns
+    of Borucki et al. 2011a, and those of release 2 the columns of Borucki et
+    al. 2011b.
+
     Args:
         koi (int): KOI number of a planetary system.
         release (int): List of data releases.
@@ -34,22 +238,32 @@ def find_system(koi, release):
     """
     result = {}
     for dataset in release:
-        if dataset == 1:
-            pass
-        elif dataset == 2:
-            planet_file = planet_files[dataset]
-            filename = os.path.join(os.getenv('STELLA_DATA'),
-                        'catalog/Kepler/%s'%planet_file)
-            infile = open(filename)
-            for row in infile:
-                record = _parse_planet_record_r2(row)
-                if record['koi'] == koi:
-                    if record['planet_id'] not in result:
-                        result[record['planet_id']] = []
-                    result[record['planet_id']].append(record)
-                elif record['koi'] > koi:
-                    break
-            infile.close()
+        table = _get_release(dataset)
+        for i in table.find_rows(koi):
+            record = table.get_record(i)
+            if record['planet_id'] not in result:
+                result[record['planet_id']] = []
+            result[record['planet_id']].append(record)
+    return result
+
+def find_systems(kois, release):
+    """Find parameters of a list of planetary systems.
+
+    Args:
+        kois (list or :class:`numpy.ndarray`): KOI numbers of planetary
+            systems.
+        release (int): List of data releases.
+    Return:
+        dict: A dict keyed by data release. Each value is a tuple of (`qid`,
+            `planets`), where `qid` are the indices of input KOIs, and
+            `planets` a structured array of the matched planets as in
+            :func:`load_planets`, sorted by `qid`.
+    """
+    result = {}
+    for dataset in release:
+        table = _get_release(dataset)
+        qid, rows = table.find_many_rows(kois)
+        result[dataset] = (qid, table.get_records()[rows])
     return result
 
 def find_planet(planet_id, release):
@@ -63,17 +277,30 @@ def find_planet(planet_id, release):
     """
     result = []
     for dataset in release:
-        if dataset == 2:
-            planet_file = planet_files[dataset]
-            filename = os.path.join(os.getenv('STELLA_DATA'),
-                        'catalog/Kepler/%s'%planet_file)
-            infile = open(filename)
-            for row in infile:
-                record = _parse_planet_record_r2(row)
-                if record['planet_id'] == planet_id:
-                    result.append(record)
-                    break
-            infile.close()
+        table = _get_release(dataset)
+        i = table.find_planet_row(planet_id)
+        if i is not None:
+            result.append(table.get_record(i))
+    return result
+
+def find_planets(planet_ids, release):
+    """Find parameters of a list of planets.
+
+    Args:
+        planet_ids (list or :class:`numpy.ndarray`): KOI numbers `NNN.NN` of
+            planet candidates.
+        release (int): List of data releases.
+    Return:
+        dict: A dict keyed by data release. Each value is a tuple of (`qid`,
+            `planets`), where `qid` are the indices of input planets found in
+            the release, and `planets` a structured array of their parameters
+            as in :func:`load_planets`.
+    """
+    result = {}
+    for dataset in release:
+        table = _get_release(dataset)
+        qid, rows = table.find_planet_rows(planet_ids)
+        result[dataset] = (qid, table.get_records()[rows])
     return result
 
 def _parse_planet_record_r1(row):
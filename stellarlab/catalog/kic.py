@@ -1,11 +1,11 @@
 import os
 import numpy as np
 import astropy.io.fits as fits
-from ..utils.fitsio import get_bintable_info
 from ..utils.asciitable import structitem_to_dict
-from .name import _get_KIC_number
+from .base import _FITSCatalog
+from .name import _get_KIC_number, _get_star_numbers
 
-class _KIC(object):
+class _KIC(_FITSCatalog):
     """Class for *Kepler Input Catalog* (`V/133
     <http://vizier.u-strasbg.fr/viz-bin/VizieR-3?-source=V/133>`_, Kepler
     Mission Team, 2009).
@@ -49,21 +49,12 @@ class _KIC(object):
 
 
     """
+    # epoch of positions in catalogue
+    _epoch0 = 2000.0
+
     def __init__(self):
-        self.catfile = os.path.join(os.getenv('STELLA_DATA'), 'catalog/KIC.fits')
-        self._data_info = None
-
-    def _get_data_info(self):
-        """Get information of FITS table."""
-        nbyte, nrow, ncol, pos, dtype, fmtfunc = get_bintable_info(self.catfile)
-        self._data_info = {
-                'nbyte'  : nbyte,
-                'nrow'   : nrow,
-                'ncol'   : ncol,
-                'pos'    : pos,
-                'dtype'  : dtype,
-                'fmtfunc': fmtfunc
-                }
+        catfile = os.path.join(os.getenv('STELLA_DATA'), 'catalog/KIC.fits')
+        super(_KIC, self).__init__(catfile)
         
     def find_object(self, name, output='dict'):
         """Find records in *Kepler Input Catalog*.
@@ -90,23 +81,13 @@ class _KIC(object):
 
         kic = _get_KIC_number(name)
 
-        if self._data_info is None:
-            self._get_data_info()
-
-        nrow    = self._data_info['nrow']
-        nbyte   = self._data_info['nbyte']
-        pos     = self._data_info['pos']
-        fmtfunc = self._data_info['fmtfunc']
-
-        infile = open(self.catfile, 'rb')
+        data = self._get_data()
+        nrow = data.size
 
-        if kic > 0 and kic <= nrow:
-            infile.seek(pos+(kic-1)*nbyte,0)
-            item = fmtfunc(infile.read(nbyte))
+        if kic is not None and 0 < kic <= nrow:
+            item = self._get_item(kic-1)
         else:
-            pass
-
-        infile.close()
+            return None
 
         if output == 'ndarray':
             return item
@@ -115,4 +96,31 @@ class _KIC(object):
         else:
             return None
 
+    def find_objects(self, names, columns=None, output='ndarray'):
+        """Find records for a list of objects in *Kepler Input Catalog*.
+
+        Args:
+            names (list or :class:`numpy.ndarray`): Names or numbers of stars.
+            columns (list): Names of output columns. All columns are returned
+                if *None*.
+            output (str): Type of output results. Either *"ndarray"* or
+                *"dict"*.
+        Returns:
+            :class:`numpy.ma.MaskedArray` or dict: Records in catalogue, in the
+                same order as the input names. Stars not in catalogue are
+                masked.
+        Examples:
+
+            .. code-block:: python
+
+                >>> from stella.catalog import KIC
+                >>> res = KIC.find_objects(['KIC 9941662', 10000000],
+                ...                        columns=['KIC', 'kepmag', 'Teff'])
+
+        """
+
+        kic = _get_star_numbers(names, 'KIC')
+        index, mask = self._get_index(kic, 'KIC')
+        return self._take(index, mask, columns, output)
+
 KIC = _KIC()
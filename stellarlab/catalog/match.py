@@ -0,0 +1,149 @@
+import multiprocessing
+import numpy as np
+from .cache import load_cache
+from .zones import _get_zone, _query_zone_index
+from .base import _get_zone_cache_name
+
+# zone indices opened in worker processes, keyed by catalogue file and cache
+# name
+_worker_index = {}
+
+def _get_catalog(catalog):
+    """Get the catalogue object from its name.
+
+    Args:
+        catalog (str or object): Name of catalogue (e.g. *"TYC2"*) or the
+            catalogue object itself.
+    Returns:
+        object: The catalogue object.
+    """
+    if not isinstance(catalog, str):
+        return catalog
+
+    from . import HD, BSC, SAO, HIP, HIP2, TYC, TYC2, KIC
+    catalogs = {'HD': HD, 'BSC': BSC, 'SAO': SAO, 'HIP': HIP, 'HIP2': HIP2,
+                'TYC': TYC, 'TYC2': TYC2, 'KIC': KIC}
+    if catalog.upper() not in catalogs:
+        print('Error: Unknown catalogue "%s"'%catalog)
+        raise ValueError
+    return catalogs[catalog.upper()]
+
+def _crossmatch_worker(args):
+    """Query the zone index of a catalogue in a worker process.
+
+    Args:
+        args (tuple): A tuple of (`catfile`, `name`, `ra`, `dec`, `radius`),
+            where `name` is the name of the zone index cache, and `radius` is
+            in degree.
+    Returns:
+        tuple: (`qid`, `rowid`, `sep`) as returned by
+            :func:`stella.catalog.zones.query_zone_index`.
+    """
+    catfile, name, ra, dec, radius = args
+    if (catfile, name) not in _worker_index:
+        _worker_index[(catfile, name)] = load_cache(catfile, name)
+    return _query_zone_index(_worker_index[(catfile, name)], ra, dec, radius)
+
+def crossmatch(ra, dec, catalog, radius, k=1, epoch=None, chunk=65536,
+        processes=1):
+    """Cross-match a list of positions with a catalogue.
+
+    Input positions are sorted into the same declination zones as the zone
+    index of catalogue (see :mod:`stella.catalog.zones`), and processed in
+    chunks of neighbouring zones, so that each chunk only touches a narrow
+    band of the index. Chunks can be spread over a pool of processes.
+
+    Args:
+        ra (:class:`numpy.ndarray`): Right ascensions of positions in degree.
+        dec (:class:`numpy.ndarray`): Declinations of positions in degree.
+        catalog (str or object): Name of catalogue (e.g. *"TYC2"*, *"KIC"*)
+            or a catalogue object such as :data:`stella.catalog.TYC2`.
+        radius (float or :class:`numpy.ndarray`): Matching radius in arcsec.
+        k (int): Number of nearest matches returned for each position.
+        epoch (float): Epoch of input positions. Stars in catalogue are moved
+            to this epoch before matching. Positions in catalogue are used if
+            *None*.
+        chunk (int): Number of positions processed at a time.
+        processes (int): Number of worker processes. Chunks are processed in
+            the current process if `processes` is 1.
+    Returns:
+        tuple: A tuple containing:
+
+            * **index** (:class:`numpy.ndarray`): Row indices of the nearest
+              matches in catalogue, with shape (*N*,) if `k` is 1, or
+              (*N*, `k`) otherwise. Missing matches are given −1.
+            * **sep** (:class:`numpy.ndarray`): Angular separations in arcsec
+              with the same shape as `index`. Missing matches are given NaN.
+            * **nmatch** (:class:`numpy.ndarray`): Numbers of stars in
+              catalogue within `radius` of each position.
+    Examples:
+
+        .. code-block:: python
+
+            >>> from stella.catalog import crossmatch
+            >>> index, sep, nmatch = crossmatch([101.287, 95.988],
+            ...                                 [-16.716, -52.696], 'HIP', 60.)
+            >>> nmatch
+            array([1, 1])
+
+    """
+    catalog = _get_catalog(catalog)
+    zone_index = catalog._get_zone_index(epoch)
+    name = _get_zone_cache_name(catalog._check_epoch(epoch))
+    height = float(zone_index['height'][0])
+
+    ra, dec, radius = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(ra, dtype=np.float64)),
+            np.atleast_1d(np.asarray(dec, dtype=np.float64)),
+            np.atleast_1d(np.asarray(radius, dtype=np.float64))/3600.)
+    n = ra.size
+
+    # sort input positions by zone and RA
+    order = np.lexsort((np.mod(ra, 360.), _get_zone(dec, height)))
+    tasks = [(catalog.catfile, name, ra[order[i0:i0+chunk]],
+              dec[order[i0:i0+chunk]], radius[order[i0:i0+chunk]])
+             for i0 in range(0, n, chunk)]
+
+    if processes > 1 and len(tasks) > 1:
+        pool = multiprocessing.Pool(processes)
+        try:
+            results = pool.map(_crossmatch_worker, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_query_zone_index(zone_index, _ra, _dec, _radius)
+                   for _, _, _ra, _dec, _radius in tasks]
+
+    # map the indices of chunks back to the input order
+    qid, rowid, sep = [], [], []
+    for i, (_qid, _rowid, _sep) in enumerate(results):
+        qid.append(order[_qid + i*chunk])
+        rowid.append(_rowid)
+        sep.append(_sep)
+    if n > 0:
+        qid   = np.concatenate(qid)
+        rowid = np.concatenate(rowid)
+        sep   = np.concatenate(sep)*3600.
+    else:
+        qid   = np.zeros(0, dtype=np.int64)
+        rowid = np.zeros(0, dtype=np.int64)
+        sep   = np.zeros(0)
+
+    nmatch = np.bincount(qid, minlength=n)
+
+    # rank of matches for each position, nearest first
+    o = np.lexsort((sep, qid))
+    qid, rowid, sep = qid[o], rowid[o], sep[o]
+    rank = np.arange(qid.size) - np.searchsorted(qid, qid, side='left')
+    m = rank < k
+
+    index_out = np.full((n, k), -1, dtype=np.int64)
+    sep_out   = np.full((n, k), np.nan)
+    index_out[qid[m], rank[m]] = rowid[m]
+    sep_out[qid[m], rank[m]]   = sep[m]
+
+    if k == 1:
+        index_out = index_out[:, 0]
+        sep_out   = sep_out[:, 0]
+    return index_out, sep_out, nmatch
@@ -146,6 +146,36 @@ def _get_star_number1(name, key):
     else:
         return None
 
+def _get_star_numbers(names, key, comp=False):
+    """Convert a list of star names with the form of `SSS NNNN` to an array of
+    integer numbers `NNNN`.
+
+    Args:
+        names (list or :class:`numpy.ndarray`): Names or numbers of stars.
+        key (str): Prefix of the star names.
+        comp (bool): Remove the trailing companion code (e.g. `"HD 1234A"`) if
+            *True*.
+    Returns:
+        :class:`numpy.ndarray`: Integer numbers of the stars. Names that can
+            not be recognized are converted to 0.
+
+    """
+    names = np.atleast_1d(names)
+    if names.dtype.kind in 'iu':
+        return names.astype(np.int64)
+
+    names = np.char.strip(names.astype(str))
+    names = np.where(np.char.startswith(names, key),
+                     np.char.replace(names, key, '', 1), names)
+    if comp:
+        names = np.char.rstrip(names, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+    names = np.char.strip(names)
+
+    numbers = np.zeros(names.size, dtype=np.int64)
+    m = np.char.isdigit(names)
+    numbers[m] = names[m].astype(np.int64)
+    return numbers
+
 def _get_HIP_number(name):
     """Convert star name in *Hipparcos Catalogue* to an integer HIP number.
 
@@ -245,67 +275,181 @@ def _get_TYC_number(name):
     else:
         return None
 
-def get_catalog(name):
-    """Return the name of the star catalog from the name of star.
-    
+def _get_TYC_numbers(names):
+    """Convert a list of star names in *Tycho-2 Catalogue* to arrays of TYC
+    numbers (TYC1, TYC2, TYC3).
+
+    Args:
+        names (list or :class:`numpy.ndarray`): Names of stars, or an integer
+            array with shape (*N*, 3).
+    Returns:
+        tuple: A tuple of integer arrays (TYC1, TYC2, TYC3). Names that can not
+            be recognized are converted to (0, 0, 0).
+
+    """
+    names = np.atleast_1d(names)
+    if names.dtype.kind in 'iu' and names.ndim == 2:
+        names = names.astype(np.int64)
+        return names[:,0], names[:,1], names[:,2]
+
+    names = np.char.strip(names.astype(str))
+    names = np.where(np.char.startswith(names, 'TYC'),
+                     np.char.replace(names, 'TYC', '', 1), names)
+    part1 = np.char.partition(names, '-')
+    part2 = np.char.partition(part1[:,2], '-')
+    g = [np.char.strip(part1[:,0]),
+         np.char.strip(part2[:,0]),
+         np.char.strip(part2[:,2])]
+
+    m = np.char.isdigit(g[0]) & np.char.isdigit(g[1]) & np.char.isdigit(g[2])
+    result = []
+    for v in g:
+        numbers = np.zeros(names.size, dtype=np.int64)
+        numbers[m] = v[m].astype(np.int64)
+        result.append(numbers)
+    return tuple(result)
+
+# patterns of star names in the order they are tried. The group `<cat>_n`
+# gives the number of the star, if the catalogue has simple numbers.
+_starcat_patterns = [
+        ('HD',   r'HD\s*(?P<HD_n>\d+)\s*[ABC]?'),
+        ('HIP',  r'HIP\s*(?P<HIP_n>\d+)\s*[ABC]?'),
+        ('HR',   r'HR\s*(?P<HR_n>\d+)'),
+        ('BD',   r'BD\s*[\+\-]\d+\s*\d+[a-zA-Z]?'),
+        ('CD',   r'CD\s*\-\d+\s*\d+[a-zA-Z]?'),
+        ('EPIC', r'EPIC\s*(?P<EPIC_n>\d+)'),
+        ('FK5',  r'FK5\s*(?P<FK5_n>\d+)'),
+        ('GC',   r'GC\s*(?P<GC_n>\d+)'),
+        ('GCRV', r'GCRV\s*(?P<GCRV_n>\d+)'),
+        ('G',    r'G[\-\d\s]+'),
+        ('KIC',  r'KIC\s*(?P<KIC_n>\d+)'),
+        ('LHS',  r'LHS[\d\s]+[ABC]?'),
+        ('LSPM', r'LSPM[\d\s]+[NSEW]?'),
+        ('NLTT', r'NLTT[\d\s]+'),
+        ('SAO',  r'SAO\s*(?P<SAO_n>\d+)'),
+        ('TYC',  r'TYC\s*\d+\-\d+\-\d?'),
+        ]
+
+# one alternation of all patterns, with the catalogue as the group name
+_starcat_re = re.compile('|'.join(['(?P<%s>%s)'%(cat, pattern)
+                                   for cat, pattern in _starcat_patterns]))
+_comp_re       = re.compile('^\s[ABC]?$')
+_bayer_re      = re.compile('^[a-zA-Q]\d*$')
+_var_re        = re.compile('^[R-Z]\d*$')
+_var_double_re = re.compile('^[A-Z][A-Z]\d*$')
+_var_V_re      = re.compile('^V\d+$')
+
+def parse_name(name):
+    """Get the catalogue and the number of a star from its name with one
+    match of a precompiled regular expression.
+
     Args:
         name (str): Name of star.
     Returns:
-        catalog (str): Name of catalog.
+        tuple: A tuple of (`catalog`, `number`). `catalog` is the name of
+            catalogue as returned by :func:`get_catalog`. `number` is the
+            integer number of star for catalogues with simple numbers (HD,
+            HIP, HR, EPIC, FK5, GC, GCRV, KIC and SAO), or *None* otherwise.
+    Examples:
+
+        .. code-block:: python
+
+            >>> from stella.catalog.name import parse_name
+            >>> parse_name('HIP 8102')
+            ('HIP', 8102)
+            >>> parse_name('BD+05 1668')
+            ('BD', None)
 
     """
     name = ' '.join(name.split())
 
-    starcat_re = {
-        '^HD\s*\d+\s*[ABC]?$'               : 'HD',
-        '^HIP\s*\d+\s*[ABC]?$'              : 'HIP',
-        '^HR\s*\d+$'                        : 'HR',
-        '^BD\s*[\+\-]\d+\s*\d+[a-zA-Z]?$'   : 'BD',
-        '^CD\s*\-\d+\s*\d+[a-zA-Z]?$'       : 'CD',
-        '^EPIC\s*\d+$'                      : 'EPIC',
-        '^FK5\s*\d+$'                       : 'FK5',
-        '^GC\s*\d+$'                        : 'GC',
-        '^GCRV\s*\d+$'                      : 'GCRV',
-        '^G[\-\d\s]+$'                      : 'G',
-        '^KIC\s*\d+$'                       : 'KIC',
-        '^LHS[\d\s]+[ABC]?$'                : 'LHS',
-        '^LSPM[\d\s]+[NSEW]?$'              : 'LSPM',
-        '^NLTT[\d\s]+$'                     : 'NLTT',
-        '^SAO\s*\d+$'                       : 'SAO',
-        '^TYC\s*\d+\-\d+\-\d?$'             : 'TYC',
-    }
-    for exp in starcat_re:
-        if re.match(exp, name) is not None:
-            return starcat_re[exp]
-
-    if re.match('^\s[ABC]?$', name[-2:]) is not None:
+    mobj = _starcat_re.fullmatch(name)
+    if mobj is not None:
+        cat = mobj.lastgroup
+        if cat+'_n' in _starcat_re.groupindex:
+            return cat, int(mobj.group(cat+'_n'))
+        else:
+            return cat, None
+
+    if _comp_re.match(name[-2:]) is not None:
         comp = name[-1]
         name = name[0:-1].strip()
     else:
         comp = ''
 
     g = name.split()
-    if g[-1] in constellations:
+    if len(g) > 0 and g[-1] in constellations:
         # name is Bayer, Flamsteed, or Variable
         if g[0].isdigit():
-            return 'Flamsteed'
-        elif re.match('^[a-zA-Q]\d*$', g[0]):
+            return 'Flamsteed', None
+        elif _bayer_re.match(g[0]):
             # Bayer designations are in the range of a~z and A~Q
-            return 'Bayer'
-        elif re.match('^[R-Z]\d*$', g[0]):
+            return 'Bayer', None
+        elif _var_re.match(g[0]):
             # Variable names go from Q to Z
-            return 'Var'
-        elif re.match('^[A-Z][A-Z]\d*$', g[0]):
+            return 'Var', None
+        elif _var_double_re.match(g[0]):
             # Variable names with double uppercase letters
-            return 'Var'
+            return 'Var', None
         elif len(g[0])>=3 and g[0][0:3] in greek_letters:
             # Bayer designations with greek letters
-            return 'Bayer'
-        elif re.match('^V\d+$', g[0]) != None:
+            return 'Bayer', None
+        elif _var_V_re.match(g[0]) != None:
             # Variable names V???
-            return 'Var'
+            return 'Var', None
 
-    return None
+    return None, None
+
+def parse_names(names):
+    """Get the catalogues and numbers of a list of stars.
+
+    Each distinct name is parsed only once by :func:`parse_name`.
+
+    Args:
+        names (list or :class:`numpy.ndarray`): Names of stars.
+    Returns:
+        tuple: A tuple containing:
+
+            * **catalogs** (:class:`numpy.ndarray`): Object array of the
+              names of catalogues, or *None* for unknown names.
+            * **numbers** (:class:`numpy.ndarray`): 64-bit integer numbers of
+              stars, which can be passed to the batch lookup functions (e.g.
+              :meth:`stella.catalog.HIP.find_objects`). Names in catalogues
+              without simple numbers are given 0.
+    Examples:
+
+        .. code-block:: python
+
+            >>> from stella.catalog.name import parse_names
+            >>> catalogs, numbers = parse_names(['HIP 8102', 'HD10700', 'xx'])
+            >>> catalogs
+            array(['HIP', 'HD', None], dtype=object)
+            >>> numbers
+            array([ 8102, 10700,     0])
+
+    """
+    names = np.atleast_1d(np.asarray(names, dtype=str))
+    unique, inverse = np.unique(names, return_inverse=True)
+    catalogs = np.empty(unique.size, dtype=object)
+    numbers  = np.zeros(unique.size, dtype=np.int64)
+    for i, name in enumerate(unique):
+        cat, number = parse_name(name)
+        catalogs[i] = cat
+        if number is not None:
+            numbers[i] = number
+    inverse = inverse.reshape(-1)
+    return catalogs[inverse], numbers[inverse]
+
+def get_catalog(name):
+    """Return the name of the star catalog from the name of star.
+    
+    Args:
+        name (str): Name of star.
+    Returns:
+        catalog (str): Name of catalog.
+
+    """
+    return parse_name(name)[0]
 
 def get_regular_name(starname):
     """Get regular name of a star
@@ -0,0 +1,122 @@
+import sys
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+def _apply_shard(args):
+    """Apply a function to a shard of rows in a worker process, and write the
+    results into the shared output array.
+
+    Args:
+        args (tuple): A tuple of (`catalog`, `func`, `columns`, `i1`, `i2`,
+            `shm_name`, `shape`, `dtype`).
+    Returns:
+        tuple: The row range (`i1`, `i2`) of the shard.
+    """
+    catalog, func, columns, i1, i2, shm_name, shape, dtype = args
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        out[i1:i2] = func(catalog._read_columns(slice(i1, i2), columns))
+        del out
+    finally:
+        shm.close()
+    return i1, i2
+
+def _show_progress(name, ndone, ntotal, t0):
+    """Display the progress of a parallel scan in the terminal.
+
+    Args:
+        name (str): Name of the catalogue.
+        ndone (int): Number of finished shards.
+        ntotal (int): Total number of shards.
+        t0 (float): Start time of the scan.
+    """
+    ratio = ndone/ntotal
+    n = 40
+    progressbar = ('>'*int(ratio*n)).ljust(n, '-')
+    msg = '\r Scanning {} |{}| {:6.2f}% ({}/{} shards, {:.1f}s)'.format(
+            name, progressbar, ratio*100., ndone, ntotal, time.time()-t0)
+    sys.stdout.write(msg)
+    sys.stdout.flush()
+
+def parallel_apply(catalog, func, columns, dtype=np.float64, shape=(),
+        shardsize=1048576, processes=None, show_progress=False):
+    """Apply a vectorized function to all rows in a catalogue with a pool of
+    processes.
+
+    The rows are split into shards of `shardsize`. Each shard is processed
+    in a :class:`concurrent.futures.ProcessPoolExecutor`, where the worker
+    opens its own memory mapping of catalogue, reads the requested columns
+    and calls `func`. Results are written into a preallocated output array
+    in shared memory at the positions of rows, so the output is in the same
+    order as the catalogue regardless of the order in which shards finish.
+
+    Args:
+        catalog (:class:`stella.catalog.base._FITSCatalog`): Catalogue object
+            such as :data:`stella.catalog.KIC`.
+        func (callable): A picklable (module-level) function taking a dict of
+            column arrays and returning an array with one element (of
+            `shape`) per row.
+        columns (list): Names of columns passed to `func`.
+        dtype (:class:`numpy.dtype`): Data type of output.
+        shape (tuple): Shape of output for each row.
+        shardsize (int): Number of rows in each shard.
+        processes (int): Number of worker processes. Defaults to the number
+            of CPUs. Shards are processed in the current process if
+            `processes` is 1.
+        show_progress (bool): Display a progress bar in the terminal if
+            *True*.
+    Returns:
+        :class:`numpy.ndarray`: Array with shape (*N*,) + `shape`, where *N*
+            is the number of rows in catalogue.
+    Examples:
+
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> from stella.catalog import KIC, parallel_apply
+            >>> def get_lum(columns):
+            ...     return 4*np.log10(columns['Teff']/5772.) + 2*columns['logR']
+            >>> logL = parallel_apply(KIC, get_lum, ['Teff', 'logR'],
+            ...                       processes=8, show_progress=True)
+
+    """
+    nrow = catalog._get_data().size
+    dtype = np.dtype(dtype)
+    outshape = (nrow,) + tuple(shape)
+    shards = [(i1, min(i1 + shardsize, nrow))
+              for i1 in range(0, nrow, shardsize)]
+    name = catalog.__class__.__name__.lstrip('_')
+    t0 = time.time()
+
+    if processes == 1:
+        out = np.empty(outshape, dtype=dtype)
+        for ishard, (i1, i2) in enumerate(shards):
+            out[i1:i2] = func(catalog._read_columns(slice(i1, i2), columns))
+            if show_progress:
+                _show_progress(name, ishard+1, len(shards), t0)
+        if show_progress:
+            print('\033[92m Completed\033[0m')
+        return out
+
+    nbyte = max(int(np.prod(outshape))*dtype.itemsize, 1)
+    shm = shared_memory.SharedMemory(create=True, size=nbyte)
+    try:
+        tasks = [(catalog, func, columns, i1, i2, shm.name, outshape, dtype)
+                 for i1, i2 in shards]
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [executor.submit(_apply_shard, task) for task in tasks]
+            for ndone, future in enumerate(as_completed(futures)):
+                # raise the exceptions in workers
+                future.result()
+                if show_progress:
+                    _show_progress(name, ndone+1, len(shards), t0)
+        if show_progress:
+            print('\033[92m Completed\033[0m')
+        out = np.array(np.ndarray(outshape, dtype=dtype, buffer=shm.buf))
+    finally:
+        shm.close()
+        shm.unlink()
+    return out
@@ -1,11 +1,11 @@
 import os
 import numpy as np
 import astropy.io.fits as fits
-from ..utils.fitsio import get_bintable_info
 from ..utils.asciitable import structitem_to_dict
-from .name import _get_SAO_number
+from .base import _FITSCatalog
+from .name import _get_SAO_number, _get_star_numbers
 
-class _SAO(object):
+class _SAO(_FITSCatalog):
     """Class for *Smithsonian Astrophysical Observatory Star Catalog* (`I/131A
     <http://vizier.u-strasbg.fr/viz-bin/VizieR-3?-source=I/131A>`_, SAO Staff
     1966).
@@ -35,21 +35,12 @@ class _SAO(object):
 
     """
 
+    # cone searches use the J2000 positions
+    _position_columns = ('RAdeg2000', 'DEdeg2000')
+
     def __init__(self):
-        self.catfile = os.path.join(os.getenv('STELLA_DATA'), 'catalog/SAO.fits')
-        self._data_info = None
-
-    def _get_data_info(self):
-        """Get information of FITS table."""
-        nbyte, nrow, ncol, pos, dtype, fmtfunc = get_bintable_info(self.catfile)
-        self._data_info = {
-                'nbyte'  : nbyte,
-                'nrow'   : nrow,
-                'ncol'   : ncol,
-                'pos'    : pos,
-                'dtype'  : dtype,
-                'fmtfunc': fmtfunc,
-                }
+        catfile = os.path.join(os.getenv('STELLA_DATA'), 'catalog/SAO.fits')
+        super(_SAO, self).__init__(catfile)
 
     def find_object(self, name, output='dict'):
         """Find record for an object in *Smithsonian Astrophysical Observatory
@@ -75,23 +66,13 @@ class _SAO(object):
 
         sao = _get_SAO_number(name)
 
-        if self._data_info is None:
-            self._get_data_info()
-
-        nrow    = self._data_info['nrow']
-        nbyte   = self._data_info['nbyte']
-        pos     = self._data_info['pos']
-        fmtfunc = self._data_info['fmtfunc']
-
-        infile = open(self.catfile, 'rb')
+        data = self._get_data()
+        nrow = data.size
 
-        if sao > 0 and sao <= nrow:
-            infile.seek(pos+(sao-1)*nbyte,0)
-            item = fmtfunc(infile.read(nbyte))
+        if sao is not None and 0 < sao <= nrow:
+            item = self._get_item(sao-1)
         else:
-            pass
-
-        infile.close()
+            return None
 
         if output == 'ndarray':
             return item
@@ -100,4 +81,32 @@ class _SAO(object):
         else:
             return None
 
+    def find_objects(self, names, columns=None, output='ndarray'):
+        """Find records for a list of objects in *Smithsonian Astrophysical
+        Observatory Star Catalog*.
+
+        Args:
+            names (list or :class:`numpy.ndarray`): Names or numbers of stars.
+            columns (list): Names of output columns. All columns are returned
+                if *None*.
+            output (str): Type of output results. Either *"ndarray"* or
+                *"dict"*.
+        Returns:
+            :class:`numpy.ma.MaskedArray` or dict: Records in catalogue, in the
+                same order as the input names. Stars not in catalogue are
+                masked.
+        Examples:
+
+            .. code-block:: python
+
+                >>> from stella.catalog import SAO
+                >>> res = SAO.find_objects(['SAO 147986', 1],
+                ...                        columns=['SAO', 'RAdeg2000', 'DEdeg2000'])
+
+        """
+
+        sao = _get_star_numbers(names, 'SAO', comp=True)
+        index, mask = self._get_index(sao, 'SAO')
+        return self._take(index, mask, columns, output)
+
 SAO = _SAO()
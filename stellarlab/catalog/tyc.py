@@ -1,12 +1,163 @@
 import os
 import math
-import struct
 import numpy as np
-from ..utils.fitsio import get_bintable_info
 from ..utils.asciitable import structitem_to_dict
-from .name import _get_TYC_number
+from .base import _FITSCatalog
+from .cache import load_cache, save_cache
+from .epoch import _change_epoch
+from .name import _get_TYC_number, _get_TYC_numbers
 
-class _TYC(object):
+def _pack_TYC_key(tyc1, tyc2, tyc3):
+    """Pack TYC numbers into the sorting key used in the Tycho catalogue files.
+
+    Args:
+        tyc1 (int or :class:`numpy.ndarray`): TYC1 numbers.
+        tyc2 (int or :class:`numpy.ndarray`): TYC2 numbers.
+        tyc3 (int or :class:`numpy.ndarray`): TYC3 numbers.
+    Returns:
+        tuple: A tuple containing:
+
+            * **key** (:class:`numpy.ndarray`): 64-bit keys `(TYC1<<18) +
+              (TYC2<<4) + (TYC3<<1)`, which are the unsigned values of the
+              32-bit keys stored in the catalogue files.
+            * **valid** (:class:`numpy.ndarray`): *False* for TYC numbers out
+              of the ranges that fit in the key (1 ≤ TYC1, TYC2 < 16384, and
+              1 ≤ TYC3 < 8). Their keys are set to 0.
+    """
+    tyc1 = np.asarray(tyc1, dtype=np.int64)
+    tyc2 = np.asarray(tyc2, dtype=np.int64)
+    tyc3 = np.asarray(tyc3, dtype=np.int64)
+    valid = (tyc1 > 0) & (tyc1 < 1<<14) & (tyc2 > 0) & (tyc2 < 1<<14) & \
+            (tyc3 > 0) & (tyc3 < 1<<3)
+    key = np.where(valid, (tyc1<<18) + (tyc2<<4) + (tyc3<<1), 0)
+    return key, valid
+
+def _unpack_TYC_key(key):
+    """Unpack sorting keys in the Tycho catalogue files into TYC numbers.
+
+    Args:
+        key (int or :class:`numpy.ndarray`): Keys of Tycho catalogue, either
+            as stored in the files or as returned by :func:`_pack_TYC_key`.
+    Returns:
+        tuple: A tuple of TYC numbers (TYC1, TYC2, TYC3).
+    """
+    key = np.asarray(key).astype(np.int64) & 0xffffffff
+    return key>>18, (key>>4) & 0b11111111111111, (key>>1) & 0b111
+
+class _TychoCatalog(_FITSCatalog):
+    """Base class for *Tycho Catalogue* and *Tycho-2 Catalogue*.
+
+    Records in both catalogues are sorted by the packed TYC key. The keys are
+    sorted as unsigned integers together with their row indices, and saved in
+    the cache of the catalogue file the first time they are needed. Lookups
+    are then resolved with :func:`numpy.searchsorted` on the memory-mapped
+    keys.
+
+    Args:
+        catfile (str): Name of the catalogue file.
+    """
+
+    def __init__(self, catfile):
+        super(_TychoCatalog, self).__init__(catfile)
+        self._keys = None
+
+    def _get_keys(self):
+        """Get the sorted keys of the catalogue.
+
+        Returns:
+            dict: A dict containing the memory-mapped arrays `key`, the
+                sorted unsigned TYC keys as 64-bit integers, and `row`, their
+                row indices. The empty item in the first row is excluded.
+        """
+        if self._keys is None:
+            keys = load_cache(self.catfile, 'tyckeys', mmap_mode='r')
+            if keys is None:
+                key = np.array(self._read_columns(slice(None), ['TYC'])['TYC'])
+                key = key.astype(np.int64)[1:] & 0xffffffff
+                row = np.argsort(key, kind='stable')
+                save_cache(self.catfile, 'tyckeys',
+                           {'key': key[row], 'row': row + 1})
+                keys = load_cache(self.catfile, 'tyckeys', mmap_mode='r')
+            self._keys = keys
+        return self._keys
+
+    def _search_keys(self, tyc1, tyc2, tyc3):
+        """Search TYC numbers in the sorted keys.
+
+        Args:
+            tyc1 (int or :class:`numpy.ndarray`): TYC1 numbers.
+            tyc2 (int or :class:`numpy.ndarray`): TYC2 numbers.
+            tyc3 (int or :class:`numpy.ndarray`): TYC3 numbers.
+        Returns:
+            tuple: A tuple of (`i`, `found`), where `i` are the positions in
+                the sorted keys.
+        """
+        target, valid = _pack_TYC_key(tyc1, tyc2, tyc3)
+        keys = self._get_keys()['key']
+        if keys.size == 0:
+            return np.zeros(target.shape, dtype=np.int64), \
+                   np.zeros(target.shape, dtype=bool)
+        i = np.minimum(np.searchsorted(keys, target), keys.size-1)
+        found = valid & (keys[i] == target)
+        return i, found
+
+    def _get_positions(self, epoch=None):
+        """Get the positions of all stars used to build the zone index. The
+        empty item in the first row is excluded.
+
+        Args:
+            epoch (float): Epoch of positions.
+        Returns:
+            tuple: A tuple of native-endian arrays (RA, Dec) in degree.
+        """
+        ra, dec = super(_TychoCatalog, self)._get_positions(epoch)
+        ra[0] = dec[0] = np.nan
+        return ra, dec
+
+    def find_indices(self, tyc1, tyc2, tyc3):
+        """Find row indices of stars with given TYC numbers.
+
+        Args:
+            tyc1 (int or :class:`numpy.ndarray`): TYC1 numbers.
+            tyc2 (int or :class:`numpy.ndarray`): TYC2 numbers.
+            tyc3 (int or :class:`numpy.ndarray`): TYC3 numbers.
+        Returns:
+            tuple: A tuple containing:
+
+                * **index** (:class:`numpy.ndarray`): Row indices. Stars not
+                  in catalogue are given the index of the empty item (0).
+                * **mask** (:class:`numpy.ndarray`): Boolean array which is
+                  *True* for stars not in catalogue.
+        Examples:
+
+            .. code-block:: python
+
+                >>> from stella.catalog import TYC2
+                >>> index, mask = TYC2.find_indices([425, 1423], [2502, 174], [1, 1])
+
+        """
+        i, found = self._search_keys(tyc1, tyc2, tyc3)
+        rows = self._get_keys()['row']
+        index = np.where(found, rows[i] if rows.size > 0 else 0, 0)
+        return index, ~found
+
+    def _find_objects(self, names, epoch, columns, output):
+        """Find records for a list of objects.
+
+        Args:
+            names (list or :class:`numpy.ndarray`): Names of stars, or an
+                integer array of TYC numbers with shape (*N*, 3).
+            epoch (float): Epoch of output astrometric parameters.
+            columns (list): Names of output columns.
+            output (str): Either *"ndarray"* or *"dict"*.
+        Returns:
+            :class:`numpy.ma.MaskedArray` or dict: Records in catalogue.
+        """
+        tyc1, tyc2, tyc3 = _get_TYC_numbers(names)
+        index, mask = self.find_indices(tyc1, tyc2, tyc3)
+        return self._take(index, mask, columns, output, epoch)
+
+class _TYC(_TychoCatalog):
     """Class for *Tycho Catalogue* (`I/239/tyc_main
     <http://vizier.u-strasbg.fr/viz-bin/VizieR-3?-source=I/239/tyc_main>`_, ESA
     1997).
@@ -47,21 +198,12 @@ class _TYC(object):
         
     """
 
+    # epoch of positions in catalogue
+    _epoch0 = 1991.25
+
     def __init__(self):
-        self.catfile = os.path.join(os.getenv('STELLA_DATA'), 'catalog/TYC.fits')
-        self._data_info = None
-
-    def _get_data_info(self):
-        """Get information of FITS table."""
-        nbyte, nrow, ncol, pos, dtype, fmtfunc = get_bintable_info(self.catfile)
-        self._data_info = {
-                'nbyte'  : nbyte,
-                'nrow'   : nrow,
-                'ncol'   : ncol,
-                'pos'    : pos,
-                'dtype'  : dtype,
-                'fmtfunc': fmtfunc
-                }
+        catfile = os.path.join(os.getenv('STELLA_DATA'), 'catalog/TYC.fits')
+        super(_TYC, self).__init__(catfile)
 
     def find_object(self, name, epoch=2000.0, output='dict'):
         """Find record for an object in *Tycho Catalogue*.
@@ -89,45 +231,12 @@ class _TYC(object):
 
         tyc1, tyc2, tyc3 = _get_TYC_number(name)
     
-        target = np.int32((tyc1<<18) + (tyc2<<4) + (tyc3<<1))
-
-        if self._data_info is None:
-            self._get_data_info()
-
-        pos     = self._data_info['pos']
-        nbyte   = self._data_info['nbyte']
-        nrow    = self._data_info['nrow']
-        fmtfunc = self._data_info['fmtfunc']
-    
-        infile = open(self.catfile, 'rb')
-        i1, i2 = 1, nrow-2
-        find = False
-        while(i2-i1 > 1):
-            i3 = (i1+i2)//2
-            infile.seek(pos + i3*nbyte, 0)
-            key = struct.unpack('>i',infile.read(4))[0]
-            if target < key:
-                i2 = i3
-            elif target > key:
-                i1 = i3
-            else:
-                find = True
-                break
-
-        if find:
-            infile.seek(-4,1)
-        else:
-            # the first element is an empty item
-            infile.seek(pos, 0)
-        item = fmtfunc(infile.read(nbyte))
-
-        infile.close()
+        index, mask = self.find_indices(tyc1, tyc2, tyc3)
+        # the first element is an empty item
+        item = self._get_item(int(index))
 
         # change epoch
-        pm_ra = item['pmRA']*1e-3/3600. # convert pm_RA from mas/yr to deg/yr
-        pm_de = item['pmDE']*1e-3/3600. # convert pm_DE from mas/yr to deg/yr
-        item['RAdeg'] += (epoch-1991.25)*pm_ra/math.cos(item['DEdeg']/180.*math.pi)
-        item['DEdeg'] += (epoch-1991.25)*pm_de
+        _change_epoch(item, self._epoch0, epoch)
     
         if output == 'ndarray':
             return item
@@ -136,7 +245,35 @@ class _TYC(object):
         else:
             return None
 
-class _TYC2(object):
+    def find_objects(self, names, epoch=2000.0, columns=None,
+            output='ndarray'):
+        """Find records for a list of objects in *Tycho Catalogue*.
+
+        Args:
+            names (list or :class:`numpy.ndarray`): Names of stars, or an
+                integer array of TYC numbers with shape (*N*, 3).
+            epoch (float): Epoch of output astrometric parameters.
+            columns (list): Names of output columns. All columns are returned
+                if *None*.
+            output (str): Type of output results. Either *"ndarray"* or
+                *"dict"*.
+        Returns:
+            :class:`numpy.ma.MaskedArray` or dict: Records in catalogue, in the
+                same order as the input names. Stars not in catalogue are
+                masked.
+        Examples:
+
+            .. code-block:: python
+
+                >>> from stella.catalog import TYC
+                >>> res = TYC.find_objects(['TYC 1423-174-1', 'TYC 9999-1-1'],
+                ...     columns=['TYC', 'pmRA', 'pmDE'])
+
+        """
+
+        return self._find_objects(names, epoch, columns, output)
+
+class _TYC2(_TychoCatalog):
     """Class for *Tycho-2 Catalogue* (`I/259
     <http://vizier.u-strasbg.fr/viz-bin/VizieR-3?-source=I/259>`_, Høg+ 2000).
 
@@ -172,21 +309,12 @@ class _TYC2(object):
 
     """
 
+    # epoch of positions in catalogue
+    _epoch0 = 2000.0
+
     def __init__(self):
-        self.catfile = os.path.join(os.getenv('STELLA_DATA'), 'catalog/TYC2.fits')
-        self._data_info = None
-
-    def _get_data_info(self):
-        """Get information of FITS table."""
-        nbyte, nrow, ncol, pos, dtype, fmtfunc = get_bintable_info(self.catfile)
-        self._data_info = {
-                'nbyte'  : nbyte,
-                'nrow'   : nrow,
-                'ncol'   : ncol,
-                'pos'    : pos,
-                'dtype'  : dtype,
-                'fmtfunc': fmtfunc
-                }
+        catfile = os.path.join(os.getenv('STELLA_DATA'), 'catalog/TYC2.fits')
+        super(_TYC2, self).__init__(catfile)
 
     def find_object(self, name, epoch=2000.0, output='dict'):
         """Find record for an object in *Tycho-2 Catalogue*.
@@ -214,58 +342,25 @@ class _TYC2(object):
 
         tyc1, tyc2, tyc3 = _get_TYC_number(name)
     
-        target = np.int32((tyc1<<18) + (tyc2<<4) + (tyc3<<1))
-
-        if self._data_info is None:
-            self._get_data_info()
-
-        pos     = self._data_info['pos']
-        nbyte   = self._data_info['nbyte']
-        nrow    = self._data_info['nrow']
-        fmtfunc = self._data_info['fmtfunc']
-    
-        infile = open(self.catfile, 'rb')
-        i1, i2 = 1, nrow-2
-        find = False
-        while(i2-i1 > 1):
-            i3 = (i1+i2)//2
-            infile.seek(pos + i3*nbyte, 0)
-            key = struct.unpack('>i',infile.read(4))[0]
-            if target < key:
-                i2 = i3
-            elif target > key:
-                i1 = i3
-            else:
-                find = True
-                break
-
-        if find:
-            infile.seek(-4,1)
-        else:
-            # the first element is an empty item
-            infile.seek(pos, 0)
-        item = fmtfunc(infile.read(nbyte))
+        index, mask = self.find_indices(tyc1, tyc2, tyc3)
+        # the first element is an empty item
+        item = self._get_item(int(index))
         
         # change epoch
-        pm_ra = item['pmRA']*1e-3/3600. # convert pm_RA from mas/yr to deg/yr
-        pm_de = item['pmDE']*1e-3/3600. # convert pm_DE from mas/yr to deg/yr
-        item['RAdeg'] += (epoch-2000.0)*pm_ra/math.cos(item['DEdeg']/180.*math.pi)
-        item['DEdeg'] += (epoch-2000.0)*pm_de
+        _change_epoch(item, self._epoch0, epoch)
 
         # looking for possible companion
-        if i3 != nrow - 1:
-            key2 = struct.unpack('>i',infile.read(4))[0]
-            if key2 == key + 1:
-                infile.seek(-4,1)
-                item2 = fmtfunc(infile.read(nbyte))
+        i, found = self._search_keys(tyc1, tyc2, tyc3)
+        keys = self._get_keys()
+        i = int(i)
+        if found and i != keys['key'].size - 1:
+            key2 = keys['key'][i+1]
+            if key2 == keys['key'][i] + 1:
+                item2 = self._get_item(int(keys['row'][i+1]))
                 print('Warning: There are more than 1 star matched')
-                t1 = (key2 & 0b11111111111111000000000000000000)/2**18
-                t2 = (key2 & 0b00000000000000111111111111110000)/2**4
-                t3 = (key2 & 0b00000000000000000000000000001110)/2
+                t1, t2, t3 = _unpack_TYC_key(key2)
                 print(t1, t2, t3, item2)
     
-        infile.close()
-    
         if output == 'ndarray':
             return item
         elif output == 'dict':
@@ -273,5 +368,33 @@ class _TYC2(object):
         else:
             return None
 
+    def find_objects(self, names, epoch=2000.0, columns=None,
+            output='ndarray'):
+        """Find records for a list of objects in *Tycho-2 Catalogue*.
+
+        Args:
+            names (list or :class:`numpy.ndarray`): Names of stars, or an
+                integer array of TYC numbers with shape (*N*, 3).
+            epoch (float): Epoch of output astrometric parameters.
+            columns (list): Names of output columns. All columns are returned
+                if *None*.
+            output (str): Type of output results. Either *"ndarray"* or
+                *"dict"*.
+        Returns:
+            :class:`numpy.ma.MaskedArray` or dict: Records in catalogue, in the
+                same order as the input names. Stars not in catalogue are
+                masked.
+        Examples:
+
+            .. code-block:: python
+
+                >>> from stella.catalog import TYC2
+                >>> res = TYC2.find_objects(['TYC 425-2502-1', 'TYC 1-1-1'],
+                ...     columns=['TYC', 'pmRA', 'pmDE'])
+
+        """
+
+        return self._find_objects(names, epoch, columns, output)
+
 TYC2 = _TYC2()
 TYC  = _TYC()
@@ -2,11 +2,178 @@ import os
 import numpy as np
 import astropy.io.fits as fits
 
-from .name import get_regular_name, _get_HIP_number, _get_KIC_number
-from ..utils.asciifile import find_sortedfile, quickfind_sortedfile
+from .name import get_catalog, get_regular_name, _get_HIP_number, _get_KIC_number
+from .name import _get_regular_HIP_name, _get_regular_HD_name
+from .name import _get_regular_BD_name, _get_regular_CD_name
+from .name import _get_regular_G_name, _get_regular_TYC_name
+from .name import _get_TYC_number, _get_star_numbers, _get_TYC_numbers
+from .base import _take_records
+from .xstore import xindex_find, xindex_find_many
+from ..utils.fitsio import memmap_bintable
 
 xindex_path = os.path.join(os.getenv('STELLA_DATA'), 'catalog/xindex')
 
+def _pack_xindex_key(columns):
+    """Pack the key columns of a cross-identification table into integers.
+
+    Args:
+        columns (list): A list of integer arrays. A single column (e.g. HIP)
+            is used as it is, and three columns are packed as TYC numbers
+            (TYC1, TYC2, TYC3).
+    Returns:
+        :class:`numpy.ndarray`: 64-bit integer keys.
+    """
+    columns = [np.asarray(col, dtype=np.int64) for col in columns]
+    if len(columns) == 1:
+        return columns[0]
+    elif len(columns) == 3:
+        tyc1, tyc2, tyc3 = columns
+        return (tyc1<<18) + (tyc2<<4) + (tyc3<<1)
+    else:
+        raise ValueError
+
+class _XIndexTable(object):
+    """Index of a cross-identification table stored as FITS binary table.
+
+    The table is mapped into memory and its key columns are packed and sorted
+    the first time it is queried. A lookup is then a
+    :func:`numpy.searchsorted` on the sorted keys, which gives the offsets of
+    the matched rows in table.
+
+    Args:
+        filename (str): Name of the FITS file in the xindex directory.
+        keycols (tuple): Names of the key columns.
+    """
+
+    def __init__(self, filename, keycols):
+        self.filename = os.path.join(xindex_path, filename)
+        self.keycols = keycols
+        self._data = None
+        self._keys = None
+        self._order = None
+
+    def _load(self):
+        """Map the table into memory and sort its keys."""
+        if self._keys is None:
+            self._data = memmap_bintable(self.filename)
+            keys = _pack_xindex_key(
+                    [self._data[key] for key in self.keycols])
+            self._order = np.argsort(keys, kind='stable')
+            self._keys = keys[self._order]
+
+    def find(self, *key):
+        """Find the rows with a given key.
+
+        Args:
+            key (int): Values of the key columns (e.g. `hip`, or `tyc1`,
+                `tyc2`, `tyc3`).
+        Returns:
+            :class:`numpy.ndarray`: Row indices in table, in their original
+                order.
+        """
+        self._load()
+        k = _pack_xindex_key([[v] for v in key])[0]
+        i1 = np.searchsorted(self._keys, k, side='left')
+        i2 = np.searchsorted(self._keys, k, side='right')
+        return self._order[i1:i2]
+
+    def find_many(self, *keys):
+        """Find the rows with a list of keys.
+
+        Args:
+            keys (:class:`numpy.ndarray`): Arrays of the key columns.
+        Returns:
+            tuple: A tuple containing:
+
+                * **qid** (:class:`numpy.ndarray`): Indices of input keys.
+                * **rows** (:class:`numpy.ndarray`): Row indices in table.
+
+                The results are sorted by `qid`.
+        """
+        self._load()
+        k = _pack_xindex_key([np.atleast_1d(v) for v in keys])
+        i1 = np.searchsorted(self._keys, k, side='left')
+        i2 = np.searchsorted(self._keys, k, side='right')
+        count = i2 - i1
+        cum = np.cumsum(count)
+        ntotal = cum[-1] if cum.size > 0 else 0
+        pos = np.arange(ntotal) - np.repeat(cum - count, count) \
+              + np.repeat(i1, count)
+        qid = np.repeat(np.arange(k.size), count)
+        return qid, self._order[pos]
+
+    def take(self, rows, columns):
+        """Read columns of given rows.
+
+        Args:
+            rows (:class:`numpy.ndarray`): Row indices in table.
+            columns (list): Names of columns.
+        Returns:
+            dict: A dict containing native-endian column arrays.
+        """
+        self._load()
+        return _take_records(self._data, rows, columns)
+
+# process-wide indices of cross-identification tables, keyed by file name
+_xindex_tables = {}
+
+def _get_xindex_table(filename, keycols):
+    """Get the process-wide index of a cross-identification table.
+
+    Args:
+        filename (str): Name of the FITS file in the xindex directory.
+        keycols (tuple): Names of the key columns.
+    Returns:
+        :class:`_XIndexTable`: Index of table.
+    """
+    if filename not in _xindex_tables:
+        _xindex_tables[filename] = _XIndexTable(filename, keycols)
+    return _xindex_tables[filename]
+
+def _group_results(n, qid, values):
+    """Group the matched values of batch queries by input.
+
+    Args:
+        n (int): Number of inputs.
+        qid (:class:`numpy.ndarray`): Indices of inputs, sorted.
+        values (list): Matched values.
+    Returns:
+        list: A list of *n* elements, each of which is a list of the values
+            matched with the input, or *None* if nothing is matched.
+    """
+    result = [None]*n
+    for i, value in zip(qid, values):
+        if result[i] is None:
+            result[i] = [value]
+        else:
+            result[i].append(value)
+    return result
+
+def _format_TYC_names(columns):
+    """Format TYC names from columns of TYC numbers."""
+    return ['TYC %d-%d-%d'%(tyc1, tyc2, tyc3) for tyc1, tyc2, tyc3 in
+            zip(columns['TYC1'], columns['TYC2'], columns['TYC3'])]
+
+def _format_2MASS_names(columns, full):
+    """Format 2MASS names, and optionally the JHK photometry, from
+    columns.
+    """
+    names = ['2MASS J%s'%_decode(name) for name in columns['2MASS']]
+    if not full:
+        return names
+    return [row for row in zip(names,
+                columns['Jmag'], columns['Hmag'], columns['Kmag'],
+                columns['e_Jmag'], columns['e_Hmag'], columns['e_Kmag'])]
+
+# columns read from the 2MASS cross-identification tables
+_2MASS_columns = ['2MASS', 'Jmag', 'Hmag', 'Kmag', 'e_Jmag', 'e_Hmag', 'e_Kmag']
+
+def _decode(value):
+    """Decode a byte string read from a FITS table."""
+    if isinstance(value, bytes):
+        return value.decode().strip()
+    return value
+
 def cross_starnames(starname):
     name_lst = {}
     cat = get_catalog(starname)
@@ -23,7 +190,7 @@ def cross_starnames(starname):
         # fix two TYC for one HIP
         if name_lst['TYC']!=None and len(name_lst['TYC'])>1 and name_lst['HD']!=None:
             tmp = HD_to_TYC(name_lst['HD'][0])
-            if len(tmp)==1 and tmp[0] in name_lst['TYC']:
+            if tmp!=None and len(tmp)==1 and tmp[0] in name_lst['TYC']:
                 name_lst['TYC'] = tmp
 
         # if HIP->TYC failed, find TYC by HD
@@ -48,7 +215,7 @@ def cross_starnames(starname):
             # fix two TYC for one HIP
             if name_lst['TYC']!=None and len(name_lst['TYC'])>1 and name_lst['HD']!=None:
                 tmp = HD_to_TYC(name_lst['HD'][0])
-                if len(tmp)==1 and tmp[0] in name_lst['TYC']:
+                if tmp!=None and len(tmp)==1 and tmp[0] in name_lst['TYC']:
                     name_lst['TYC'] = tmp
 
             # if HIP->TYC failed, find TYC by HD
@@ -68,7 +235,7 @@ def cross_starnames(starname):
             # fix two TYC for one HIP
             if name_lst['TYC']!=None and len(name_lst['TYC'])>1 and name_lst['HD']!=None:
                 tmp = HD_to_TYC(name_lst['HD'][0])
-                if len(tmp)==1 and tmp[0] in name_lst['TYC']:
+                if tmp!=None and len(tmp)==1 and tmp[0] in name_lst['TYC']:
                     name_lst['TYC'] = tmp
 
             name_lst['2MASS'] = HIP_to_2MASS(name_lst['HIP'][0])
@@ -83,7 +250,7 @@ def cross_starnames(starname):
             # fix two TYC for one HIP
             if name_lst['TYC']!=None and len(name_lst['TYC'])>1 and name_lst['HD']!=None:
                 tmp = HD_to_TYC(name_lst['HD'][0])
-                if len(tmp)==1 and tmp[0] in name_lst['TYC']:
+                if tmp!=None and len(tmp)==1 and tmp[0] in name_lst['TYC']:
                     name_lst['TYC'] = tmp
 
             name_lst['2MASS'] = HIP_to_2MASS(name_lst['HIP'][0])
@@ -111,6 +278,147 @@ def cross_starnames(starname):
             res_lst[cat] = name
     return res_lst
 
+def _xindex_names_many(src, dst, keys, fmt):
+    """Convert a list of identifiers with a compiled cross-identification
+    table, keeping the first match as the scalar conversion functions do.
+
+    Args:
+        src (str): Name of the source catalogue.
+        dst (str): Name of the destination catalogue.
+        keys (list): Identifiers in the source catalogue without prefix.
+        fmt (str): Format of output names (e.g. *"HD %s"*).
+    Returns:
+        list: A list of the same length as `keys`. Each element is a list of
+            one name, or *None*.
+    """
+    result = [None]*len(keys)
+    if len(keys) == 0:
+        return result
+    qid, values = xindex_find_many(src, dst, np.array(keys))
+    for i, value in zip(qid, values):
+        if result[i] is None:
+            result[i] = [fmt%_decode(value)]
+    return result
+
+def _join_many(table, rows, src, dst, func):
+    """Resolve one hop of cross identification for rows of a columnar table
+    of names, using the first name in the source column.
+
+    Args:
+        table (dict): Columnar table of names.
+        rows (list): Indices of rows to be resolved. Rows without a name in
+            the source column are skipped.
+        src (str): Source column.
+        dst (str): Destination column.
+        func (callable): Batch conversion function which takes a list of
+            names and returns a list of results.
+    """
+    rows = [i for i in rows if table[src][i] is not None]
+    if len(rows) == 0:
+        return
+    for i, value in zip(rows, func([table[src][i][0] for i in rows])):
+        table[dst][i] = value
+
+def cross_starnames_many(names):
+    """Find the names of a list of stars in other catalogues.
+
+    The names are grouped by catalogue with
+    :func:`stella.catalog.name.get_catalog`, and each hop of cross
+    identification (e.g. HIP → HD, HIP → TYC, HD → TYC, TYC → 2MASS) is
+    resolved for all stars of the groups at once. The rules are the same as
+    :func:`cross_starnames`, including the choice between two TYC names of
+    one HIP star.
+
+    Args:
+        names (list): Names of stars.
+    Returns:
+        dict: A columnar table with columns `name`, `catalog`, `HIP`, `HD`,
+            `BD`, `CD`, `G`, `TYC` and `2MASS`. Each column is an object
+            array with the same length as `names`. The elements of name
+            columns are lists of names as returned by :func:`cross_starnames`,
+            or *None*.
+    Examples:
+
+        .. code-block:: python
+
+            >>> from stella.catalog.xindex import cross_starnames_many
+            >>> table = cross_starnames_many(['HIP 8102', 'HD 10700'])
+            >>> table['HD']
+            array([list(['HD 10700']), list(['HD 10700'])], dtype=object)
+
+    """
+    n = len(names)
+    columns = ['HIP', 'HD', 'BD', 'CD', 'G', 'TYC', '2MASS']
+    table = {cat: [None]*n for cat in columns}
+    catalogs = [get_catalog(name) for name in names]
+
+    regular_funcs = {
+            'HIP': _get_regular_HIP_name,
+            'HD':  _get_regular_HD_name,
+            'BD':  _get_regular_BD_name,
+            'CD':  _get_regular_CD_name,
+            'G':   _get_regular_G_name,
+            'TYC': _get_regular_TYC_name,
+            }
+    groups = {cat: [] for cat in regular_funcs}
+    for i, (name, cat) in enumerate(zip(names, catalogs)):
+        if cat in regular_funcs:
+            groups[cat].append(i)
+            table[cat][i] = [regular_funcs[cat](name)]
+
+    def rows_of(*cats):
+        return sorted(sum([groups[cat] for cat in cats], []))
+
+    def from_prefixed(src, dst, fmt):
+        return lambda names: _xindex_names_many(src, dst,
+                                [name[2:].strip() for name in names], fmt)
+
+    def from_HIP(dst):
+        return lambda names: _xindex_names_many('HIP', dst,
+                                list(_get_star_numbers(names, 'HIP')),
+                                dst+' %s')
+
+    # HIP names, and TYC names of G stars
+    _join_many(table, groups['HD'], 'HD', 'HIP', from_prefixed('HD', 'HIP', 'HIP %s'))
+    _join_many(table, groups['BD'], 'BD', 'HIP', from_prefixed('BD', 'HIP', 'HIP %s'))
+    _join_many(table, groups['CD'], 'CD', 'HIP', from_prefixed('CD', 'HIP', 'HIP %s'))
+    _join_many(table, groups['G'],  'G',  'TYC', from_prefixed('G',  'TYC', 'TYC %s'))
+    _join_many(table, rows_of('G', 'TYC'), 'TYC', 'HIP', TYC_to_HIP_many)
+
+    # names found from HIP
+    _join_many(table, rows_of('HIP', 'BD', 'CD', 'G'), 'HIP', 'HD', from_HIP('HD'))
+    _join_many(table, rows_of('HIP', 'HD', 'CD', 'G'), 'HIP', 'BD', from_HIP('BD'))
+    _join_many(table, rows_of('HIP', 'HD', 'BD', 'G'), 'HIP', 'CD', from_HIP('CD'))
+    _join_many(table, rows_of('HIP', 'HD', 'BD', 'CD'), 'HIP', 'TYC', HIP_to_TYC_many)
+
+    # fix two TYC for one HIP
+    rows = [i for i in rows_of('HIP', 'HD', 'BD', 'CD')
+            if table['TYC'][i] is not None and len(table['TYC'][i]) > 1]
+    hd_tyc = {'HD': table['HD'], 'TYC': [None]*n}
+    _join_many(hd_tyc, rows, 'HD', 'TYC', from_prefixed('HD', 'TYC', 'TYC %s'))
+    for i in rows:
+        tmp = hd_tyc['TYC'][i]
+        if tmp is not None and len(tmp) == 1 and tmp[0] in table['TYC'][i]:
+            table['TYC'][i] = tmp
+
+    # if HIP->TYC failed, find TYC by HD
+    rows = [i for i in rows_of('HIP', 'HD') if table['TYC'][i] is None]
+    _join_many(table, rows, 'HD', 'TYC', from_prefixed('HD', 'TYC', 'TYC %s'))
+
+    # 2MASS names by HIP, or by TYC for stars without HIP names
+    has_HIP = [i for i in groups['HD'] if table['HIP'][i] is not None]
+    no_HIP  = [i for i in groups['HD'] if table['HIP'][i] is None]
+    _join_many(table, sorted(rows_of('HIP', 'BD', 'CD') + has_HIP),
+               'HIP', '2MASS', HIP_to_2MASS_many)
+    _join_many(table, sorted(rows_of('G', 'TYC') + no_HIP),
+               'TYC', '2MASS', TYC_to_2MASS_many)
+
+    result = {'name': np.array(names, dtype=object),
+              'catalog': np.array(catalogs, dtype=object)}
+    for cat in columns:
+        result[cat] = np.empty(n, dtype=object)
+        result[cat][:] = table[cat]
+    return result
 
 def HIP_to_HD(name):
     """Convert an HIP name in *Hipparcos Catalogue* to HD name in *Henry Draper
@@ -121,19 +429,14 @@ def HIP_to_HD(name):
     """
 
     hip = _get_HIP_number(name)
+    if hip is None:
+        return None
 
-    filename = os.path.join(xindex_path, 'HIP-HD.csv')
-    f1 = lambda row: int(row.split(',')[0])
-    f2 = lambda row: 'HD '+row.split(',')[1].strip()
-    if hip<100:
-        HDname = find_sortedfile(hip, filename, f1, f2)
-    else:
-        HDname = quickfind_sortedfile(hip, filename, f1, f2)
-
-    if HDname == None:
+    values = xindex_find('HIP', 'HD', hip)
+    if values.size == 0:
         return None
     else:
-        return [HDname]
+        return ['HD %s'%_decode(values[0])]
 
 def HIP_to_BD(name):
     """Convert an HIP name in *Hipparcos Catalogue* to BD name in *Bonner
@@ -152,19 +455,14 @@ def HIP_to_BD(name):
     """
 
     hip = _get_HIP_number(name)
+    if hip is None:
+        return None
 
-    filename = os.path.join(xindex_path, 'HIP-BD.csv')
-    f1 = lambda row: int(row.split(',')[0])
-    f2 = lambda row: 'BD '+row.split(',')[1].strip()
-    if hip<100:
-        HIPname = find_sortedfile(hip, filename, f1, f2)
-    else:
-        HIPname = quickfind_sortedfile(hip, filename, f1, f2)
-
-    if HIPname == None:
+    values = xindex_find('HIP', 'BD', hip)
+    if values.size == 0:
         return None
     else:
-        return [HIPname]
+        return ['BD %s'%_decode(values[0])]
 
 def HIP_to_CD(name):
     """Convert an HIP name in *Hipparcos Catalogue* to CD name in *Cordoba
@@ -184,19 +482,14 @@ def HIP_to_CD(name):
     """
 
     hip = _get_HIP_number(name)
+    if hip is None:
+        return None
 
-    filename = os.path.join(xindex_path, 'HIP-CD.csv')
-    f1 = lambda row: int(row.split(',')[0])
-    f2 = lambda row: 'CD '+row.split(',')[1].strip()
-    if hip<100:
-        CDname = find_sortedfile(hip, filename, f1, f2)
-    else:
-        CDname = quickfind_sortedfile(hip, filename, f1, f2)
-
-    if CDname == None:
+    values = xindex_find('HIP', 'CD', hip)
+    if values.size == 0:
         return None
     else:
-        return [CDname]
+        return ['CD %s'%_decode(values[0])]
 
 def HIP_to_TYC(name):
     """Convert an HIP name in *Hipparcos Catalogue* to TYC name in *Tycho-2
@@ -215,16 +508,31 @@ def HIP_to_TYC(name):
     """
 
     hip = _get_HIP_number(name)
+    if hip is None:
+        return None
 
-    filename = os.path.join(xindex_path, 'HIP-TYC.fits')
-    f = fits.open(filename)
-    data = f[1].data
-    f.close()
-    m = data['HIP']==hip
-    if m.sum()==0:
+    table = _get_xindex_table('HIP-TYC.fits', ('HIP',))
+    rows = table.find(hip)
+    if rows.size==0:
         return None
     else:
-        return ['TYC %d-%d-%d'%(rec['TYC1'],rec['TYC2'],rec['TYC3']) for rec in data[m]]
+        return _format_TYC_names(table.take(rows, ['TYC1', 'TYC2', 'TYC3']))
+
+def HIP_to_TYC_many(names):
+    """Convert a list of HIP names to TYC names in *Tycho-2 Catalogue*.
+
+    Args:
+        names (list or :class:`numpy.ndarray`): Names or numbers of stars in
+            *Hipparcos Catalogue*.
+    Returns:
+        list: A list of the same length as `names`. Each element is a list of
+            TYC names as returned by :func:`HIP_to_TYC`, or *None*.
+    """
+    hip = _get_star_numbers(names, 'HIP')
+    table = _get_xindex_table('HIP-TYC.fits', ('HIP',))
+    qid, rows = table.find_many(hip)
+    values = _format_TYC_names(table.take(rows, ['TYC1', 'TYC2', 'TYC3']))
+    return _group_results(hip.size, qid, values)
 
 def HIP_to_2MASS(name, full=False):
     """Convert an HIP name in *Hipparcos Catalogue* to 2MASS name.
@@ -242,19 +550,32 @@ def HIP_to_2MASS(name, full=False):
     """
 
     hip = _get_HIP_number(name)
+    if hip is None:
+        return None
 
-    filename = os.path.join(xindex_path, 'HIP-2MASS.fits')
-    f = fits.open(filename)
-    data = f[1].data
-    i = np.searchsorted(data['HIP'],hip)
-    row = data[i]
-    des_2mass = '2MASS J%s'%row['2MASS']
-    f.close()
-    if full:
-        return [(des_2mass, row['Jmag'], row['Hmag'], row['Kmag'],
-                row['e_Jmag'], row['e_Hmag'], row['e_Kmag'])]
+    table = _get_xindex_table('HIP-2MASS.fits', ('HIP',))
+    rows = table.find(hip)
+    if rows.size==0:
+        return None
     else:
-        return [des_2mass]
+        return _format_2MASS_names(table.take(rows, _2MASS_columns), full)
+
+def HIP_to_2MASS_many(names, full=False):
+    """Convert a list of HIP names to 2MASS names.
+
+    Args:
+        names (list or :class:`numpy.ndarray`): Names or numbers of stars in
+            *Hipparcos Catalogue*.
+        full (bool): Also return the *JHK* magnitudes and errors if *True*.
+    Returns:
+        list: A list of the same length as `names`. Each element is a list as
+            returned by :func:`HIP_to_2MASS`, or *None*.
+    """
+    hip = _get_star_numbers(names, 'HIP')
+    table = _get_xindex_table('HIP-2MASS.fits', ('HIP',))
+    qid, rows = table.find_many(hip)
+    values = _format_2MASS_names(table.take(rows, _2MASS_columns), full)
+    return _group_results(hip.size, qid, values)
 
 def HD_to_HIP(name):
     """Convert an HD name in *Henry Draper Catalogue* to HIP name in *Hipparcos
@@ -266,15 +587,11 @@ def HD_to_HIP(name):
     name = get_regular_name(name)
     hd = name[2:].strip()
 
-    filename = os.path.join(xindex_path, 'HD-HIP.csv')
-    f1 = lambda row: row.split(',')[0].strip()
-    f2 = lambda row: 'HIP %d'%(int(row.split(',')[1]))
-    HIPname = quickfind_sortedfile(hd, filename, f1, f2)
-
-    if HIPname is None:
+    values = xindex_find('HD', 'HIP', hd)
+    if values.size == 0:
         return None
     else:
-        return [HIPname]
+        return ['HIP %s'%_decode(values[0])]
 
 def HD_to_TYC(name):
     """Convert an HD name in *Henry Draper Catalogue* to TYC name in *Tycho-2
@@ -286,15 +603,11 @@ def HD_to_TYC(name):
     name = get_regular_name(name)
     hd = name[2:].strip()
 
-    filename = os.path.join(xindex_path, 'HD-TYC.csv')
-    f1 = lambda row: row.split(',')[0].strip()
-    f2 = lambda row: 'TYC %s'%(row.split(',')[1].strip())
-
-    TYCname = quickfind_sortedfile(hd, filename, f1, f2)
-    if TYCname == None:
+    values = xindex_find('HD', 'TYC', hd)
+    if values.size == 0:
         return None
     else:
-        return [TYCname]
+        return ['TYC %s'%_decode(values[0])]
 
 def BD_to_HIP(name):
     """Convert a BD name in *Bonner Durchmusterung* to HIP name in *Hipparcos
@@ -306,15 +619,11 @@ def BD_to_HIP(name):
     name = get_regular_name(name)
     bd = name[2:].strip()
 
-    filename = os.path.join(xindex_path, 'BD-HIP.csv')
-    f1 = lambda row: row.split(',')[0].strip()
-    f2 = lambda row: 'HIP %d'%(int(row.split(',')[1]))
-
-    HIPname = quickfind_sortedfile(bd, filename, f1, f2)
-    if HIPname == None:
+    values = xindex_find('BD', 'HIP', bd)
+    if values.size == 0:
         return None
     else:
-        return [HIPname]
+        return ['HIP %s'%_decode(values[0])]
 
 def CD_to_HIP(name):
     """Convert a CD name in *Cordoba Durchmusterung* to HIP name in *Hipparcos
@@ -326,35 +635,43 @@ def CD_to_HIP(name):
     name = get_regular_name(name)
     cd = name[2:].strip()
 
-    filename = os.path.join(xindex_path, 'CD-HIP.csv')
-    f1 = lambda row: row.split(',')[0].strip()
-    f2 = lambda row: 'HIP %d'%(int(row.split(',')[1]))
-    
-    HIPname = quickfind_sortedfile(cd, filename, f1, f2)
-    if HIPname == None:
+    values = xindex_find('CD', 'HIP', cd)
+    if values.size == 0:
         return None
     else:
-        return [HIPname]
+        return ['HIP %s'%_decode(values[0])]
 
 def TYC_to_HIP(name):
     """Convert a TYC name in *Tycho-2 Catalogue* to HIP name in *Hipparcos
     Catalogue*.
     """
-    if name[0:3] == 'TYC':
-        g = name[3:].split('-')
-        tyc1, tyc2, tyc3 = int(g[0]), int(g[1]), int(g[2])
-
-    filename = os.path.join(xindex_path, 'TYC-HIP.fits')
-    f = fits.open(filename)
-    data = f[1].data
-    f.close()
-    m1 = data['TYC1']==tyc1
-    m2 = data[m1]['TYC2']==tyc2
-    m3 = data[m1][m2]['TYC3']==tyc3
-    if m3.sum()==0:
+    tyc = _get_TYC_number(name)
+    if tyc is None:
+        return None
+
+    table = _get_xindex_table('TYC-HIP.fits', ('TYC1', 'TYC2', 'TYC3'))
+    rows = table.find(*tyc)
+    if rows.size==0:
         return None
     else:
-        return ['HIP %d'%rec['HIP'] for rec in data[m1][m2][m3]]
+        return ['HIP %d'%hip for hip in table.take(rows, ['HIP'])['HIP']]
+
+def TYC_to_HIP_many(names):
+    """Convert a list of TYC names to HIP names in *Hipparcos Catalogue*.
+
+    Args:
+        names (list or :class:`numpy.ndarray`): Names of stars in *Tycho-2
+            Catalogue*, or an integer array of TYC numbers with shape (*N*,
+            3).
+    Returns:
+        list: A list of the same length as `names`. Each element is a list of
+            HIP names as returned by :func:`TYC_to_HIP`, or *None*.
+    """
+    tyc1, tyc2, tyc3 = _get_TYC_numbers(names)
+    table = _get_xindex_table('TYC-HIP.fits', ('TYC1', 'TYC2', 'TYC3'))
+    qid, rows = table.find_many(tyc1, tyc2, tyc3)
+    values = ['HIP %d'%hip for hip in table.take(rows, ['HIP'])['HIP']]
+    return _group_results(tyc1.size, qid, values)
 
 def TYC_to_2MASS(name, full=False):
     """Convert a TYC name to 2MASS name.
@@ -366,27 +683,34 @@ def TYC_to_2MASS(name, full=False):
     Returns:
 
     """
-    if name[0:3] == 'TYC':
-        g = name[3:].split('-')
-        tyc1, tyc2, tyc3 = int(g[0]), int(g[1]), int(g[2])
-
-    filename = os.path.join(xindex_path, 'TYC-2MASS.fits')
-    f = fits.open(filename)
-    data = f[1].data
-    f.close()
+    tyc = _get_TYC_number(name)
+    if tyc is None:
+        return None
 
-    m1 = data['TYC1']==tyc1
-    m2 = data[m1]['TYC2']==tyc2
-    m3 = data[m1][m2]['TYC3']==tyc3
-    if m3.sum()==0:
+    table = _get_xindex_table('TYC-2MASS.fits', ('TYC1', 'TYC2', 'TYC3'))
+    rows = table.find(*tyc)
+    if rows.size==0:
         return None
-    elif full:
-        return [('2MASS J%s'%row['2MASS'], row['Jmag'], row['Hmag'],
-                 row['Kmag'],row['e_Jmag'], row['e_Hmag'], row['e_Kmag']) for
-                 row in data[m1][m2][m3]
-                ]
     else:
-        return ['2MASS J%s'%row['2MASS'] for row in data[m1][m2][m3]]
+        return _format_2MASS_names(table.take(rows, _2MASS_columns), full)
+
+def TYC_to_2MASS_many(names, full=False):
+    """Convert a list of TYC names to 2MASS names.
+
+    Args:
+        names (list or :class:`numpy.ndarray`): Names of stars in *Tycho-2
+            Catalogue*, or an integer array of TYC numbers with shape (*N*,
+            3).
+        full (bool): Also return the *JHK* magnitudes and errors if *True*.
+    Returns:
+        list: A list of the same length as `names`. Each element is a list as
+            returned by :func:`TYC_to_2MASS`, or *None*.
+    """
+    tyc1, tyc2, tyc3 = _get_TYC_numbers(names)
+    table = _get_xindex_table('TYC-2MASS.fits', ('TYC1', 'TYC2', 'TYC3'))
+    qid, rows = table.find_many(tyc1, tyc2, tyc3)
+    values = _format_2MASS_names(table.take(rows, _2MASS_columns), full)
+    return _group_results(tyc1.size, qid, values)
 
 def G_to_TYC(name):
     """Convert a G name to TYC name in *Tycho-2 Catalogue*.
@@ -400,15 +724,11 @@ def G_to_TYC(name):
     if name[0:2] == 'G ':
         Gname = name[2:].strip()
 
-    filename = os.path.join(xindex_path, 'G-TYC.csv')
-    f1 = lambda row: row.split(',')[0].strip()
-    f2 = lambda row: 'TYC %s'%(row.split(',')[1].strip())
-
-    TYCname = quickfind_sortedfile(Gname, filename, f1, f2)
-    if TYCname == None:
+    values = xindex_find('G', 'TYC', Gname)
+    if values.size == 0:
         return None
     else:
-        return [TYCname]
+        return ['TYC %s'%_decode(values[0])]
 
 def KIC_to_KOI(name):
     """Convert a KIC name in *Kepler Input Catalog* to KOI name.
@@ -423,11 +743,12 @@ def KIC_to_KOI(name):
         * :func:`stella.catalog.xindex.Kepler_to_KOI`
         * :func:`stella.catalog.xindex.KOI_to_Kepler`
     """
-    filename = os.path.join(xindex_path, 'KIC-KOI.csv')
     kic = _get_KIC_number(name)
-    f1 = lambda row: int(row.split(',')[0])
-    f2 = lambda row: int(row.split(',')[1])
-    return quickfind_sortedfile(kic, filename, f1, f2)
+    values = xindex_find('KIC', 'KOI', kic)
+    if values.size == 0:
+        return None
+    else:
+        return int(values[0])
 
 def KIC_to_Kepler(name):
     """Convert a KIC name in *Kepler Input Catalog* to Kepler name.
@@ -439,11 +760,12 @@ def KIC_to_Kepler(name):
         * :func:`stella.catalog.xindex.Kepler_to_KOI`
         * :func:`stella.catalog.xindex.KOI_to_Kepler`
     """
-    filename = os.path.join(xindex_path, 'KIC-Kepler.csv')
     kic = _get_KIC_number(name)
-    f1 = lambda row: int(row.split(',')[0])
-    f2 = lambda row: int(row.split(',')[1])
-    return quickfind_sortedfile(kic, filename, f1, f2)
+    values = xindex_find('KIC', 'Kepler', kic)
+    if values.size == 0:
+        return None
+    else:
+        return int(values[0])
 
 def KOI_to_KIC(name):
     """Convert a KOI name to KIC name in *Kepler Input Catalog*.
@@ -458,14 +780,12 @@ def KOI_to_KIC(name):
         * :func:`stella.catalog.xindex.Kepler_to_KIC`
         * :func:`stella.catalog.xindex.KIC_to_Kepler`
     """
-    filename = os.path.join(xindex_path, 'KOI-KIC.csv')
     koi = int(name)
-    f1 = lambda row: int(row.split(',')[0])
-    f2 = lambda row: int(row.split(',')[1])
-    if koi < 100:
-        return find_sortedfile(koi, filename, f1, f2)
+    values = xindex_find('KOI', 'KIC', koi)
+    if values.size == 0:
+        return None
     else:
-        return quickfind_sortedfile(koi, filename, f1, f2)
+        return int(values[0])
 
 def KOI_to_Kepler(name):
     """Convert a KOI name to Kepler name.
@@ -480,14 +800,12 @@ def KOI_to_Kepler(name):
         * :func:`stella.catalog.xindex.KIC_to_Kepler`
         * :func:`stella.catalog.xindex.Kepler_to_KIC`
     """
-    filename = os.path.join(xindex_path, 'KOI-Kepler.csv')
     koi = int(name)
-    f1 = lambda row: int(row.split(',')[0])
-    f2 = lambda row: int(row.split(',')[1])
-    if koi < 100:
-        return find_sortedfile(koi, filename, f1, f2)
+    values = xindex_find('KOI', 'Kepler', koi)
+    if values.size == 0:
+        return None
     else:
-        return quickfind_sortedfile(koi, filename, f1, f2)
+        return int(values[0])
 
 def Kepler_to_KIC(name):
     """Convert a Kepler name to KIC name.
@@ -502,14 +820,12 @@ def Kepler_to_KIC(name):
         * :func:`stella.catalog.xindex.KOI_to_KIC`
         * :func:`stella.catalog.xindex.KIC_to_KOI`
     """
-    filename = os.path.join(xindex_path, 'Kepler-KIC.csv')
     kepler = int(name)
-    f1 = lambda row: int(row.split(',')[0])
-    f2 = lambda row: int(row.split(',')[1])
-    if kepler < 100:
-        return find_sortedfile(kepler, filename, f1, f2)
+    values = xindex_find('Kepler', 'KIC', kepler)
+    if values.size == 0:
+        return None
     else:
-        return quickfind_sortedfile(kepler, filename, f1, f2)
+        return int(values[0])
 
 def Kepler_to_KOI(name):
     """Convert a Kepler name to KOI name.
@@ -524,14 +840,12 @@ def Kepler_to_KOI(name):
         * :func:`stella.catalog.xindex.KOI_to_KIC`
         * :func:`stella.catalog.xindex.KIC_to_KOI`
     """
-    filename = os.path.join(xindex_path, 'Kepler-KOI.csv')
     kepler = int(name)
-    f1 = lambda row: int(row.split(',')[0])
-    f2 = lambda row: int(row.split(',')[1])
-    if kepler < 100:
-        return find_sortedfile(kepler, filename, f1, f2)
+    values = xindex_find('Kepler', 'KOI', kepler)
+    if values.size == 0:
+        return None
     else:
-        return quickfind_sortedfile(kepler, filename, f1, f2)
+        return int(values[0])
 
 def HIP_to_Gaia(name):
     """Convert an HIP name in *Hipparcos Catalogue* to Gaia name.
@@ -539,23 +853,17 @@ def HIP_to_Gaia(name):
     Args:
         name (str):
     """
-    if isinstance(name, int):
-        hip = name
-    elif isinstance(name, str):
-        if name[0:3]=='HIP':
-            hip = int(name[3:])
-        else:
-            print('Unknown name: %s'%name)
-    else:
-        print('Unknown name')
+    hip = _get_HIP_number(name)
+    if hip is None:
+        print('Unknown name: %s'%name)
+        return None
 
-    filename = os.path.join(xindex_path, 'HIP-Gaia.fits')
-    data = fits.getdata()
-    m = data['HIP']==hip
-    if m.sum()==0:
+    table = _get_xindex_table('HIP-Gaia.fits', ('HIP',))
+    rows = table.find(hip)
+    if rows.size==0:
         return None
     else:
-        return data[m][0]['source_id']
+        return table.take(rows[0:1], ['source_id'])['source_id'][0]
 
 def TOI_to_TIC(name):
     """Convert TOI (TESS Object of Interest) name to TIC name.
@@ -566,11 +874,12 @@ def TOI_to_TIC(name):
     See also:
         * :func:`stella.catalog.xindex.TIC_to_TOI`
     """
-    filename = os.path.join(xindex_path, 'TOI-TIC.csv')
     toi = int(name)
-    f1 = lambda row: int(row.split(',')[0])
-    f2 = lambda row: int(row.split(',')[1])
-    return find_sortedfile(toi, filename, f1, f2)
+    values = xindex_find('TOI', 'TIC', toi)
+    if values.size == 0:
+        return None
+    else:
+        return int(values[0])
 
 def TIC_to_TOI(name):
     """Convert TIC name to TOI name.
@@ -581,8 +890,9 @@ def TIC_to_TOI(name):
     See also:
         * :func:`stella.catalog.xindex.TOI_to_TIC`
     """
-    filename = os.path.join(xindex_path, 'TIC-TOI.csv')
     tic = int(name)
-    f1 = lambda row: int(row.split(',')[0])
-    f2 = lambda row: int(row.split(',')[1])
-    return find_sortedfile(tic, filename, f1, f2)
+    values = xindex_find('TIC', 'TOI', tic)
+    if values.size == 0:
+        return None
+    else:
+        return int(values[0])
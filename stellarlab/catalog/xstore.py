@@ -0,0 +1,289 @@
+import os
+import numpy as np
+from .cache import load_cache, save_cache
+
+# types of the two columns of the cross-identification tables stored as
+# sorted CSV files. identifiers of BD, CD, G and TYC are kept as byte strings
+xindex_schema = {
+    'HIP-HD':     ('int', 'int'),
+    'HIP-BD':     ('int', 'str'),
+    'HIP-CD':     ('int', 'str'),
+    'HD-HIP':     ('int', 'int'),
+    'HD-TYC':     ('int', 'str'),
+    'BD-HIP':     ('str', 'int'),
+    'CD-HIP':     ('str', 'int'),
+    'G-TYC':      ('str', 'str'),
+    'KIC-KOI':    ('int', 'int'),
+    'KIC-Kepler': ('int', 'int'),
+    'KOI-KIC':    ('int', 'int'),
+    'KOI-Kepler': ('int', 'int'),
+    'Kepler-KIC': ('int', 'int'),
+    'Kepler-KOI': ('int', 'int'),
+    'TOI-TIC':    ('int', 'int'),
+    'TIC-TOI':    ('int', 'int'),
+}
+
+xindex_pairs = list(xindex_schema)
+
+def _get_csv_path(pair):
+    """Get the name of the CSV file of a cross-identification table.
+
+    Args:
+        pair (str): Name of table (e.g. *"HIP-HD"*).
+    Returns:
+        str: Name of the CSV file in the xindex directory.
+    """
+    # imported here because xindex imports this module
+    from .xindex import xindex_path
+    return os.path.join(xindex_path, pair+'.csv')
+
+def _parse_column(strings, kind):
+    """Convert a column of strings into a typed array.
+
+    Args:
+        strings (:class:`numpy.ndarray`): Stripped strings.
+        kind (str): Type of the column in :data:`xindex_schema` (*"int"*
+            or *"str"*).
+    Returns:
+        tuple: A tuple of (`array`, `valid`), where `array` contains 64-bit
+            integers or byte strings, and `valid` is *False* for the strings
+            that can not be converted.
+    """
+    if kind == 'int':
+        valid = np.char.isdigit(strings)
+        array = np.zeros(strings.size, dtype=np.int64)
+        array[valid] = strings[valid].astype(np.int64)
+        return array, valid
+    else:
+        return np.char.encode(strings), np.char.str_len(strings) > 0
+
+def _build_store(keys, values):
+    """Build the lookup arrays of one direction of a cross-identification
+    table.
+
+    Args:
+        keys (:class:`numpy.ndarray`): Keys of all rows.
+        values (:class:`numpy.ndarray`): Values of all rows.
+    Returns:
+        dict: A dict containing the sorted unique keys `key`, the offsets
+            `offset` of their values (with one more element than `key`), and
+            the values `value` grouped by key in the original order of rows.
+    """
+    order = np.argsort(keys, kind='stable')
+    keys, values = keys[order], values[order]
+    ukeys, first = np.unique(keys, return_index=True)
+    offset = np.append(first, keys.size).astype(np.int64)
+    return {'key': ukeys, 'offset': offset, 'value': values}
+
+def compile_xindex(pairs=None):
+    """Compile cross-identification CSV files into typed binary stores.
+
+    Each CSV file `<A>-<B>.csv` in the xindex directory is compiled into two
+    stores under `$STELLA_DATA/cache/catalog/<A>-<B>`, one for the lookups
+    from *A* to *B*, and one generated for the reverse direction. A store
+    contains sorted keys, an offset table and the values, saved as `.npy`
+    files which are memory-mapped by the lookups. Stores are rebuilt
+    automatically if the CSV files change, so calling this function is only
+    needed to build all stores in advance.
+
+    Args:
+        pairs (list): Names of tables (e.g. *"HIP-HD"*). All the tables in
+            :data:`xindex_pairs` which exist are compiled if *None*.
+    """
+    if pairs is None:
+        pairs = [pair for pair in xindex_pairs
+                 if os.path.exists(_get_csv_path(pair))]
+    for pair in pairs:
+        _compile_pair(pair)
+
+def _compile_pair(pair):
+    """Compile a cross-identification CSV file. The types of columns are
+    given in :data:`xindex_schema`. Rows with less than two columns, or with
+    values that do not match the types, are skipped, and a warning with the
+    number of skipped rows is printed.
+
+    Args:
+        pair (str): Name of table (e.g. *"HIP-HD"*).
+    """
+    if pair not in xindex_schema:
+        print('Error: Unknown cross-identification table "%s"'%pair)
+        raise ValueError
+    filename = _get_csv_path(pair)
+    keys, values = [], []
+    nbad = 0
+    infile = open(filename)
+    for row in infile:
+        g = row.split(',')
+        if len(g) < 2:
+            if row.strip():
+                nbad += 1
+            continue
+        keys.append(g[0].strip())
+        values.append(g[1].strip())
+    infile.close()
+    key_kind, value_kind = xindex_schema[pair]
+    keys,   valid1 = _parse_column(np.array(keys, dtype=str), key_kind)
+    values, valid2 = _parse_column(np.array(values, dtype=str), value_kind)
+    valid = valid1 & valid2
+    nbad += int((~valid).sum())
+    if nbad > 0:
+        print('Warning: %d malformed rows skipped in %s'%(nbad, filename))
+    keys, values = keys[valid], values[valid]
+    save_cache(filename, 'xstore', _build_store(keys, values))
+    save_cache(filename, 'xstore_reverse', _build_store(values, keys))
+
+class _XStore(object):
+    """One direction of a compiled cross-identification table.
+
+    Args:
+        pair (str): Name of table (e.g. *"HIP-HD"*).
+        reverse (bool): Look up the first column from the second one if
+            *True*.
+    """
+
+    def __init__(self, pair, reverse=False):
+        self.filename = _get_csv_path(pair)
+        self.name = 'xstore_reverse' if reverse else 'xstore'
+        self._store = None
+
+    def _load(self):
+        """Load the memory-mapped store, compiling it if needed."""
+        if self._store is None:
+            store = load_cache(self.filename, self.name)
+            if store is None:
+                pair = os.path.splitext(os.path.basename(self.filename))[0]
+                _compile_pair(pair)
+                store = load_cache(self.filename, self.name)
+            self._store = store
+        return self._store
+
+    def _convert_keys(self, keys):
+        """Convert keys into the type of the store.
+
+        Args:
+            keys (list or :class:`numpy.ndarray`): Keys as integers or
+                strings.
+        Returns:
+            tuple: A tuple of (`keys`, `valid`), where `valid` is *False* for
+                keys which can not be in the store.
+        """
+        store = self._load()
+        keys = np.atleast_1d(keys)
+        if store['key'].dtype.kind in 'iu':
+            if keys.dtype.kind in 'iu':
+                return keys.astype(np.int64), np.ones(keys.size, dtype=bool)
+            keys = np.char.strip(keys.astype(str))
+            valid = np.char.isdigit(keys)
+            result = np.zeros(keys.size, dtype=np.int64)
+            result[valid] = keys[valid].astype(np.int64)
+            return result, valid
+        else:
+            keys = np.char.encode(np.char.strip(keys.astype(str)))
+            return keys, np.ones(keys.size, dtype=bool)
+
+    def find(self, key):
+        """Find the values of a key.
+
+        Args:
+            key (int or str): Key.
+        Returns:
+            :class:`numpy.ndarray`: Values in the order of rows in table.
+        """
+        qid, values = self.find_many([key])
+        return values
+
+    def find_many(self, keys):
+        """Find the values of a list of keys.
+
+        Args:
+            keys (list or :class:`numpy.ndarray`): Keys.
+        Returns:
+            tuple: A tuple containing:
+
+                * **qid** (:class:`numpy.ndarray`): Indices of input keys.
+                * **values** (:class:`numpy.ndarray`): Matched values.
+
+                The results are sorted by `qid`.
+        """
+        store = self._load()
+        keys, valid = self._convert_keys(keys)
+        skeys = store['key']
+        i = np.minimum(np.searchsorted(skeys, keys), max(skeys.size-1, 0))
+        found = valid & (skeys.size > 0)
+        if skeys.size > 0:
+            found &= skeys[i] == keys
+        offset = store['offset']
+        i1 = np.where(found, offset[i], 0)
+        i2 = np.where(found, offset[np.minimum(i+1, offset.size-1)], 0)
+        count = i2 - i1
+        cum = np.cumsum(count)
+        ntotal = cum[-1] if cum.size > 0 else 0
+        pos = np.arange(ntotal) - np.repeat(cum - count, count) \
+              + np.repeat(i1, count)
+        qid = np.repeat(np.arange(keys.size), count)
+        return qid, np.asarray(store['value'][pos])
+
+# process-wide stores, keyed by (source, destination)
+_xstores = {}
+
+def _get_xstore(src, dst):
+    """Get the store for lookups from one catalogue to another.
+
+    Args:
+        src (str): Name of the source catalogue (e.g. *"HIP"*).
+        dst (str): Name of the destination catalogue (e.g. *"HD"*).
+    Returns:
+        :class:`_XStore`: The store. A table `<src>-<dst>.csv` is used if it
+            exists, otherwise the reverse direction of `<dst>-<src>.csv`.
+    """
+    if (src, dst) not in _xstores:
+        pair = '%s-%s'%(src, dst)
+        if os.path.exists(_get_csv_path(pair)):
+            _xstores[(src, dst)] = _XStore(pair)
+        else:
+            pair = '%s-%s'%(dst, src)
+            if not os.path.exists(_get_csv_path(pair)):
+                print('Error: No cross-identification between %s and %s'%(
+                        src, dst))
+                raise ValueError
+            _xstores[(src, dst)] = _XStore(pair, reverse=True)
+    return _xstores[(src, dst)]
+
+def xindex_find(src, dst, key):
+    """Find the identifiers in one catalogue of a star in another catalogue.
+
+    Args:
+        src (str): Name of the source catalogue (e.g. *"HIP"*).
+        dst (str): Name of the destination catalogue (e.g. *"HD"*).
+        key (int or str): Identifier in the source catalogue without the
+            catalogue prefix (e.g. *8102*, or *"+12 345"* for BD).
+    Returns:
+        :class:`numpy.ndarray`: Identifiers in the destination catalogue, as
+            integers or byte strings. Empty if not found.
+    Examples:
+
+        .. code-block:: python
+
+            >>> from stella.catalog.xstore import xindex_find
+            >>> xindex_find('HIP', 'HD', 8102)
+            array([10700])
+            >>> xindex_find('HD', 'HIP', 10700)
+            array([8102])
+
+    """
+    return _get_xstore(src, dst).find(key)
+
+def xindex_find_many(src, dst, keys):
+    """Find the identifiers in one catalogue of a list of stars in another
+    catalogue.
+
+    Args:
+        src (str): Name of the source catalogue (e.g. *"KIC"*).
+        dst (str): Name of the destination catalogue (e.g. *"KOI"*).
+        keys (list or :class:`numpy.ndarray`): Identifiers in the source
+            catalogue without the catalogue prefix.
+    Returns:
+        tuple: A tuple of (`qid`, `values`), where `qid` are the indices of
+            input keys, and `values` the matched identifiers, sorted by `qid`.
+    """
+    return _get_xstore(src, dst).find_many(keys)
@@ -0,0 +1,191 @@
+import math
+import numpy as np
+
+def _radec_to_xyz(ra, dec):
+    """Convert equatorial coordinates to unit vectors.
+
+    Args:
+        ra (:class:`numpy.ndarray`): Right ascensions in degree.
+        dec (:class:`numpy.ndarray`): Declinations in degree.
+    Returns:
+        :class:`numpy.ndarray`: Unit vectors with shape (*N*, 3).
+    """
+    ra  = np.deg2rad(ra)
+    dec = np.deg2rad(dec)
+    cosdec = np.cos(dec)
+    return np.stack((cosdec*np.cos(ra), cosdec*np.sin(ra), np.sin(dec)),
+                    axis=-1)
+
+def _get_separation(xyz1, xyz2):
+    """Get the angular separations between unit vectors.
+
+    The separation is computed from the chord length, which is accurate for
+    both small and large angles.
+
+    Args:
+        xyz1 (:class:`numpy.ndarray`): Unit vectors with shape (*N*, 3).
+        xyz2 (:class:`numpy.ndarray`): Unit vectors with shape (*N*, 3).
+    Returns:
+        :class:`numpy.ndarray`: Angular separations in degree.
+    """
+    chord = np.sqrt(((xyz1 - xyz2)**2).sum(axis=-1))
+    return np.rad2deg(2*np.arcsin(np.minimum(chord/2, 1.0)))
+
+def _get_zone(dec, height):
+    """Get the numbers of declination zones.
+
+    Args:
+        dec (:class:`numpy.ndarray`): Declinations in degree.
+        height (float): Height of zones in degree.
+    Returns:
+        :class:`numpy.ndarray`: Zone numbers, starting from 0 at Dec = −90°.
+    """
+    nzone = int(math.ceil(180./height))
+    zone = np.floor((np.asarray(dec) + 90.)/height).astype(np.int64)
+    return np.clip(zone, 0, nzone-1)
+
+def build_zone_index(ra, dec, height=0.2):
+    """Build a spatial index of a catalogue based on declination zones.
+
+    Stars are grouped into zones of constant height in declination, and sorted
+    by RA in each zone. The index stores a sorting key `zone*360 + RA`, the
+    declinations, and the row numbers of stars in the catalogue, all in this
+    order. Stars with non-finite coordinates are not indexed.
+
+    Args:
+        ra (:class:`numpy.ndarray`): Right ascensions of stars in degree.
+        dec (:class:`numpy.ndarray`): Declinations of stars in degree.
+        height (float): Height of zones in degree.
+    Returns:
+        dict: A dict containing arrays `key`, `dec`, `rowid` and `height`.
+    """
+    ra  = np.asarray(ra, dtype=np.float64)
+    dec = np.asarray(dec, dtype=np.float64)
+    rowid = np.nonzero(np.isfinite(ra) & np.isfinite(dec))[0]
+    ra  = np.mod(ra[rowid], 360.)
+    dec = dec[rowid]
+    key = _get_zone(dec, height)*360. + ra
+    order = np.argsort(key, kind='stable')
+    return {'key':    key[order],
+            'dec':    dec[order],
+            'rowid':  rowid[order],
+            'height': np.array([height]),
+            }
+
+def _get_ra_intervals(ra, dec, radius):
+    """Get the intervals in RA covering cones on the sky.
+
+    Args:
+        ra (:class:`numpy.ndarray`): Right ascensions of cone centers in degree.
+        dec (:class:`numpy.ndarray`): Declinations of cone centers in degree.
+        radius (:class:`numpy.ndarray`): Radii of cones in degree.
+    Returns:
+        tuple: A tuple containing (`qid`, `ra1`, `ra2`), where `qid` is the
+            index of cone for each interval. A cone crossing RA = 0° is covered
+            by two intervals.
+    """
+    n = ra.size
+    qid = np.arange(n)
+    ra  = np.mod(ra, 360.)
+    cosdec = np.cos(np.deg2rad(dec))
+    full = np.abs(dec) + radius >= 90.
+    ratio = np.sin(np.deg2rad(radius))/np.where(full, 1.0, cosdec)
+    dra = np.where(full | (ratio >= 1.0), 180.,
+                   np.rad2deg(np.arcsin(np.minimum(ratio, 1.0)))*1.0000001)
+    ra1 = ra - dra
+    ra2 = ra + dra
+    full |= dra >= 180.
+
+    # split intervals crossing RA = 0
+    m1 = ~full & (ra1 < 0)
+    m2 = ~full & (ra2 >= 360.)
+    qid = np.concatenate((qid, qid[m1], qid[m2]))
+    ra1 = np.concatenate((np.where(full, 0., np.maximum(ra1, 0.)),
+                          ra1[m1] + 360., np.zeros(m2.sum())))
+    ra2 = np.concatenate((np.where(full, 360., np.minimum(ra2, 360.)),
+                          np.full(m1.sum(), 360.), ra2[m2] - 360.))
+    return qid, ra1, ra2
+
+def query_zone_index(index, ra, dec, radius, chunk=65536):
+    """Find stars within given radii of a list of positions using a zone
+    index.
+
+    Args:
+        index (dict): Zone index returned by :func:`build_zone_index`.
+        ra (float or :class:`numpy.ndarray`): Right ascensions of positions in
+            degree.
+        dec (float or :class:`numpy.ndarray`): Declinations of positions in
+            degree.
+        radius (float or :class:`numpy.ndarray`): Search radii in degree.
+        chunk (int): Number of positions processed at a time.
+    Returns:
+        tuple: A tuple containing:
+
+            * **qid** (:class:`numpy.ndarray`): Indices of input positions.
+            * **rowid** (:class:`numpy.ndarray`): Row numbers of matched stars
+              in catalogue.
+            * **sep** (:class:`numpy.ndarray`): Angular separations in degree.
+
+            The results are sorted by `qid`, and by `sep` for each position.
+    """
+    ra, dec, radius = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(ra, dtype=np.float64)),
+            np.atleast_1d(np.asarray(dec, dtype=np.float64)),
+            np.atleast_1d(np.asarray(radius, dtype=np.float64)))
+
+    results = []
+    for i0 in range(0, ra.size, chunk):
+        results.append(_query_zone_index(index, ra[i0:i0+chunk],
+                    dec[i0:i0+chunk], radius[i0:i0+chunk], i0))
+
+    if len(results) == 0:
+        return (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64),
+                np.zeros(0))
+    return tuple(np.concatenate(arrays) for arrays in zip(*results))
+
+def _query_zone_index(index, ra, dec, radius, offset=0):
+    """Find stars within given radii of a list of positions.
+
+    See :func:`query_zone_index` for the arguments. `offset` is added to the
+    returned indices of positions.
+    """
+    key    = index['key']
+    height = float(index['height'][0])
+
+    # expand every cone into the RA intervals in each zone it covers
+    qid, ra1, ra2 = _get_ra_intervals(ra, dec, radius)
+    zone1 = _get_zone(dec[qid] - radius[qid], height)
+    zone2 = _get_zone(dec[qid] + radius[qid], height)
+    nz = zone2 - zone1 + 1
+    cum = np.cumsum(nz)
+    zone = np.arange(cum[-1] if cum.size > 0 else 0) - np.repeat(cum - nz, nz) \
+           + np.repeat(zone1, nz)
+    qid = np.repeat(qid, nz)
+    ra1 = np.repeat(ra1, nz)
+    ra2 = np.repeat(ra2, nz)
+    i1 = np.searchsorted(key, zone*360. + ra1, side='left')
+    i2 = np.searchsorted(key, zone*360. + ra2, side='right')
+    # intervals ending at RA = 360 must not include stars at RA = 0 in the
+    # next zone
+    m = ra2 >= 360.
+    i2[m] = np.searchsorted(key, zone[m]*360. + 360., side='left')
+
+    # expand the candidates in each interval
+    count = i2 - i1
+    cum = np.cumsum(count)
+    ntotal = cum[-1] if cum.size > 0 else 0
+    cand = np.arange(ntotal) - np.repeat(cum - count, count) \
+           + np.repeat(i1, count)
+    qid = np.repeat(qid, count)
+
+    # compute the distances with unit vectors
+    cand_ra = np.mod(np.asarray(key[cand]), 360.)
+    xyz1 = _radec_to_xyz(ra[qid], dec[qid])
+    xyz2 = _radec_to_xyz(cand_ra, np.asarray(index['dec'][cand]))
+    sep = _get_separation(xyz1, xyz2)
+
+    m = sep <= radius[qid]
+    qid, cand, sep = qid[m], cand[m], sep[m]
+    order = np.lexsort((sep, qid))
+    return (qid[order] + offset, np.asarray(index['rowid'][cand[order]]),
+            sep[order])
@@ -2,15 +2,43 @@ import re
 import numpy as np
 from astropy.coordinates import SkyCoord
 import astropy.units as units
-from astropy.table import Table
-from astroquery.simbad import Simbad
-from astroquery.vizier import Vizier
+from astropy.table import Table, MaskedColumn
 
 from . import name_parser
+from . import query
+from .local import resolve_local, local_columns
+
+# patterns of identifiers returned by Simbad, in the order they are tried.
+# The group `<id>_v` gives the part of identifier stored in the name list.
+_id_patterns = [
+        ('Bayer',     r'\*\s*(?P<Bayer_v>[a-zA-Q\.]+\d*\s+[a-zA-Z]{3}\s?[A-D]?)$'),
+        ('Flamsteed', r'\*\s*(?P<Flamsteed_v>\d+\s+[a-zA-Z]{3}\s?[A-D]?)$'),
+        ('Var',       r'V\*\s*(?P<Var_v>[\s\S]+)$'),
+        ('HD',        r'HD\s*(?P<HD_v>\d*[A-D]?)$'),
+        ('HR',        r'HR\s*(?P<HR_v>\d+)$'),
+        ('HIP',       r'HIP\s*(?P<HIP_v>\d+)$'),
+        ('DM',        r'[BC]D[+\-]?\d+\s*\d+[a-zA-Z]?$'),
+        ('CPD',       r'CPD[+\-]?\d+\s*\d+[a-zA-Z]?$'),
+        ('TYC',       r'TYC\s*\d*\-\d*\-\d$'),
+        ('TIC',       r'TIC\s*(?P<TIC_v>\d*)$'),
+        ('GSC',       r'GSC\s*(?P<GSC_v>\d+\-\d+)$'),
+        ('CCDM',      r'CCDM\s*J(?P<CCDM_v>\S*)$'),
+        ('TMASS',     r'2MASS\s*J(?P<TMASS_v>\S*)$'),
+        ('Gaia2',     r'Gaia DR2 (?P<Gaia2_v>\d*)'),
+        ('UCAC4',     r'UCAC4\s*(?P<UCAC4_v>\d+\-\d+)'),
+        ]
+
+# one alternation of all patterns, with the type of identifier as the group
+# name
+_id_re = re.compile('|'.join(['(?P<%s>%s)'%(key, pattern)
+                              for key, pattern in _id_patterns]))
 
 def get_names(names, catalogs=None):
     """Get names from Simbad data base.
 
+    Each identifier is classified with one match of a precompiled regular
+    expression.
+
     Args:
         names (list): A list of strings.
     """
@@ -18,99 +46,73 @@ def get_names(names, catalogs=None):
     name_lst = {}
 
     for name in names:
-        mobj = re.match('\*\s*([a-zA-Q\.]+\d*\s+[a-zA-Z]{3}\s?[A-D]?)$', name)
-        if mobj and name_parser.is_Bayer_name(mobj.group(1)):
-            newname = name_parser.parse_Bayer_name(mobj.group(1))
-            if 'Bayer' not in name_lst:
-                name_lst['Bayer'] = []
-            name_lst['Bayer'].append(newname)
-            continue
-
-        mobj = re.match('\*\s*(\d+\s+[a-zA-Z]{3}\s?[A-D]?)$', name)
-        if mobj and name_parser.is_Flamsteed_name(mobj.group(1)):
-            newname = name_parser.parse_Flamsteed_name(mobj.group(1))
-            if 'Flamsteed' not in name_lst:
-                name_lst['Flamsteed'] = []
-            name_lst['Flamsteed'].append(newname)
-            continue
-
-        mobj = re.match('V\*\s*([\s\S]+)$', name)
-        if mobj and name_parser.is_Var_name(mobj.group(1)):
-            newname = name_parser.parse_Var_name(mobj.group(1))
-            name_lst['Var'] = newname
-            continue
-
-        mobj = re.match('HD\s*(\d*[A-D]?)$', name)
-        if mobj:
-            name_lst['HD'] = mobj.group(1)
-            continue
-
-        mobj = re.match('HR\s*(\d+)$', name)
-        if mobj:
-            name_lst['HR'] = int(mobj.group(1))
-            continue
-
-        mobj = re.match('HIP\s*(\d+)$', name)
-        if mobj:
-            name_lst['HIP'] = int(mobj.group(1))
+        mobj = _id_re.match(name)
+        if mobj is None:
             continue
-
-        if name_parser.is_DM_name(name):
+        key = mobj.lastgroup
+        if key+'_v' in _id_re.groupindex:
+            value = mobj.group(key+'_v')
+
+        if key == 'Bayer':
+            if name_parser.is_Bayer_name(value):
+                newname = name_parser.parse_Bayer_name(value)
+                if 'Bayer' not in name_lst:
+                    name_lst['Bayer'] = []
+                name_lst['Bayer'].append(newname)
+
+        elif key == 'Flamsteed':
+            if name_parser.is_Flamsteed_name(value):
+                newname = name_parser.parse_Flamsteed_name(value)
+                if 'Flamsteed' not in name_lst:
+                    name_lst['Flamsteed'] = []
+                name_lst['Flamsteed'].append(newname)
+
+        elif key == 'Var':
+            if name_parser.is_Var_name(value):
+                newname = name_parser.parse_Var_name(value)
+                name_lst['Var'] = newname
+
+        elif key == 'HD':
+            name_lst['HD'] = value
+
+        elif key in ['HR', 'HIP', 'Gaia2']:
+            name_lst[key] = int(value)
+
+        elif key == 'DM':
             if 'DM' not in name_lst:
                 name_lst['DM'] = []
             name_lst['DM'].append(name_parser.parse_DM_name(name))
-            continue
 
-        if name_parser.is_CPD_name(name):
+        elif key == 'CPD':
             name_lst['CPD'] = name_parser.parse_CPD_name(name)
-            continue
 
-        mobj = re.match('TYC\s*(\d*)\-(\d*)\-(\d)$', name)
-        if mobj:
+        elif key == 'TYC':
             name_lst['TYC'] = name_parser.parse_TYC_name(name)
-            continue
 
-        mobj = re.match('TIC\s*(\d*)$', name)
-        if mobj:
-            name_lst['TIC'] = int(mobj.group(1))
-            continue
+        elif key == 'TIC':
+            name_lst['TIC'] = int(value)
 
-        mobj = re.match('GSC\s*(\d+\-\d+)$', name)
-        if mobj:
-            gsc = mobj.group(1)
-            if len(gsc)>11:
-                print('Warning: GSC name truncated:', gsc)
-            name_lst['GSC'] = gsc
-            continue
+        elif key == 'GSC':
+            if len(value)>11:
+                print('Warning: GSC name truncated:', value)
+            name_lst['GSC'] = value
 
-        mobj = re.match('CCDM\s*J(\S*)$', name)
-        if mobj:
+        elif key == 'CCDM':
             if 'CCDM' in name_lst:
-                print('CCDM already in names, ', name_lst['CCDM'], mobj.group(1))
-            name_lst['CCDM'] = mobj.group(1)
-            continue
-
-        mobj = re.match('2MASS\s*J(\S*)$', name)
-        if mobj:
-            tmass = mobj.group(1)
-            if len(tmass)>16:
-                print('Warning: 2MASS name truncated:', tmass)
-            name_lst['2MASS'] = tmass
-            continue
+                print('CCDM already in names, ', name_lst['CCDM'], value)
+            name_lst['CCDM'] = value
 
-        mobj = re.match('Gaia DR2 (\d*)', name)
-        if mobj:
-            gaia2 = int(mobj.group(1))
-            name_lst['Gaia2'] = gaia2
-            continue
+        elif key == 'TMASS':
+            if len(value)>16:
+                print('Warning: 2MASS name truncated:', value)
+            name_lst['2MASS'] = value
 
-        mobj = re.match('UCAC4\s*(\d+\-\d+)', name)
-        if mobj:
-            ucac4 = mobj.group(1).strip()
+        elif key == 'UCAC4':
+            ucac4 = value.strip()
             if len(ucac4)>10:
                 print('Warning: UCAC4 name truncated:', ucac4)
             name_lst['UCAC4'] = ucac4
-            continue
+
     return name_lst
 
 def select_main_name(name_lst, altname=None):
@@ -146,11 +148,155 @@ def select_main_name(name_lst, altname=None):
     else:
         return main_name
 
+def _resolve_star(i, name, coord, backend, verbose=False):
+    """Find the names and coordinates of a star with a query backend.
+
+    Args:
+        i (int): Index of star, used in messages.
+        name (str): Name of star.
+        coord (:class:`astropy.coordinates.SkyCoord`): Coordinate of star used
+            if the star is not found in Simbad, or *None*.
+        backend (object): Query backend.
+        verbose (bool):
+    Returns:
+        tuple: A tuple of (`main_name`, `ra`, `dec`, `mask_ra`, `mask_dec`,
+            `crossname_lst`).
+    """
+    # query object ID to get names in various catalogues
+    result1 = backend.query_objectids(name)
+    if result1 is None:
+        # cannot find this object in Simbad
+        print('\033[31mWarning: Missing object id:{}\033[0m'.format(name))
+        main_name = name
+        if coord is None:
+            ra,  mask_ra  = 0.0, True
+            dec, mask_dec = 0.0, True
+        else:
+            ra,  mask_ra  = coord.ra.deg,  False
+            dec, mask_dec = coord.dec.deg, False
+        crossname_lst = get_names([main_name])
+        return main_name, ra, dec, mask_ra, mask_dec, crossname_lst
+
+    crossname_lst = get_names(list(result1['ID']))
+
+    # query object to get coordinates
+    result2 = backend.query_object(name)
+    if result2 is None:
+        # cannot get the coordinates. return a fully masked row
+        print('\033[31mWarning: Missing object:{}\033[0m'.format(name))
+        return name, 0.0, 0.0, True, True, {}
+    row0 = result2[0]
+    newcoord = SkyCoord(row0['RA'], row0['DEC'], unit=(units.hourangle, units.deg))
+
+    # query additional catalogues to get more names
+    # query TIC
+    if 'TIC' in crossname_lst:
+        tic = int(crossname_lst['TIC'])
+        if verbose:
+            print(i, 'search TIC:', tic)
+        result3 = backend.query_tic(tic)
+        if len(result3)==0:
+            print('Error: no reults in TIC')
+            ticrow = None
+        else:
+            ticrow = result3[0][0]
+    else:
+        if verbose:
+            print(i, 'search coordinate in TIC:',
+                    newcoord.ra.deg, newcoord.dec.deg)
+        result3 = backend.query_tic_region(newcoord.ra.deg, newcoord.dec.deg, 3)
+        if len(result3)==0:
+            print('Error: no reults in TIC')
+            ticrow = None
+        elif 'TYC' in crossname_lst:
+            mask = result3[0]['TYC']==crossname_lst['TYC']
+            if mask.sum()==1:
+                ticrow = result3[0][mask][0]
+            else:
+                ticrow = None
+        elif len(result3[0])==1 and result3[0][0]['_r']<0.1:
+            print(result3[0])
+            ticrow = result3[0][0]
+        else:
+            ticrow = None
+    if ticrow is not None:
+        if 'TIC' not in crossname_lst:
+            crossname_lst['TIC'] = ticrow['TIC']
+        if 'HIP' not in crossname_lst and ticrow['HIP'] is not np.ma.masked:
+            crossname_lst['HIP'] = ticrow['HIP']
+        if 'TYC' not in crossname_lst and ticrow['TYC'] is not np.ma.masked \
+            and len(ticrow['TYC'])>0:
+            crossname_lst['TYC'] = ticrow['TYC']
+        if 'UCAC4' not in crossname_lst and ticrow['UCAC4'] is not np.ma.masked:
+            crossname_lst['UCAC4'] = ticrow['UCAC4']
+        if '2MASS' not in crossname_lst and ticrow['_2MASS'] is not np.ma.masked:
+            crossname_lst['2MASS'] = ticrow['_2MASS']
+        if 'Gaia2' not in crossname_lst and ticrow['GAIA'] is not np.ma.masked:
+            crossname_lst['Gaia2'] = ticrow['GAIA']
+
+    main_name = select_main_name(crossname_lst, altname=name)
+    ra,  mask_ra  = newcoord.ra.deg,  False
+    dec, mask_dec = newcoord.dec.deg, False
+    return main_name, ra, dec, mask_ra, mask_dec, crossname_lst
+
 def make_crosstable(name_lst, coord_lst,
         columns=['HD','DM','HIP','TYC','TIC','GSC','CCDM','UCAC4',
                 '2MASS','Gaia2'],
         verbose = False,
+        backend = None,
+        cache = None,
+        max_workers = 4,
+        rate = 5.0,
+        local = False,
         ):
+    """Make a table of cross identifications of stars.
+
+    Stars are resolved concurrently, with at most `max_workers` requests in
+    flight and at most `rate` requests per second. If `cache` is given,
+    results of queries are saved in a persistent cache, so that running again
+    on the same stars sends no requests.
+
+    If `local` is *True*, stars are first resolved with the local
+    cross-identification tables (see :mod:`stella.catalog.xindex`). A star
+    resolved offline is not sent to the remote service only if the local
+    tables give all the names in `columns`. Since the local tables only
+    contain the names in :data:`stella.crossname.local.local_columns`, all
+    stars are sent to the remote service if `columns` includes others (e.g.
+    TIC or Gaia2).
+
+    Args:
+        name_lst (list): Names of stars.
+        coord_lst (list): Coordinates (:class:`astropy.coordinates.SkyCoord`)
+            of stars used if they are not found in Simbad. Elements can be
+            *None*.
+        columns (list): Catalogues included in the table.
+        verbose (bool):
+        backend (object): Query backend (see
+            :class:`stella.crossname.query.RemoteBackend`). Simbad and Vizier
+            are queried if *None*.
+        cache (str or :class:`stella.crossname.query.QueryCache`): Cache of
+            query results, or the name of its database file. The default
+            cache in `$STELLA_DATA/cache/crossname` is used if *True*. No
+            cache is used if *None* or *False*.
+        max_workers (int): Number of concurrent requests.
+        rate (float): Maximum number of requests per second. No limit if
+            *None*.
+        local (bool): Resolve stars with local data first if *True*. The
+            local tables must be installed.
+    Returns:
+        :class:`astropy.table.Table`: A masked table of names and
+            coordinates.
+    """
+
+    if backend is None:
+        backend = query.RemoteBackend()
+    if cache is True:
+        cache = query.QueryCache()
+    elif cache is None or cache is False:
+        cache = None
+    elif isinstance(cache, str):
+        cache = query.QueryCache(cache)
+    backend = query.CachedBackend(backend, cache=cache, rate=rate)
 
     dtype = [
         ('name',    'S50'),
@@ -178,92 +324,36 @@ def make_crosstable(name_lst, coord_lst,
         if column in column_types:
             dtype.append((column, column_types[column]))
 
-    crosstable = Table(dtype=dtype, masked=True)
-
-    for i, (name, coord) in enumerate(zip(name_lst, coord_lst)):
-
-        # query object ID to get names in various catalogues
-        result1 = Simbad.query_objectids(name)
-        if result1 is None:
-            # cannot find this object in Simbad
-            print('\033[31mWarning: Missing object id:{}\033[0m'.format(name))
-            main_name = name
-            mask_name = False
-            if coord is None:
-                ra,  mask_ra  = 0.0, True
-                dec, mask_dec = 0.0, True
-            else:
-                ra,  mask_ra  = coord.ra.deg,  False
-                dec, mask_dec = coord.dec.deg, False
-            crossname_lst = get_names([main_name])
-        else:
-            crossname_lst = get_names(list(result1['ID']))
-
-            # query object to get coordinates
-            result2 = Simbad.query_object(name)
-            if result2 is None:
-                print('\033[31mWarning: Missing object:{}\033[0m'.format(name))
-            row0 = result2[0]
-            newcoord = SkyCoord(row0['RA'], row0['DEC'], unit=(units.hourangle, units.deg))
-
-            # query additional catalogues to get more names
-            # query TIC
-            if 'TIC' in crossname_lst:
-                tic = int(crossname_lst['TIC'])
-                if verbose:
-                    print(i, 'search TIC:', tic)
-                result3 = Vizier(catalog='IV/38/tic', columns=['**'],
-                                column_filters={'TIC':'={}'.format(tic)}
-                                ).query_constraints()
-                if len(result3)==0:
-                    print('Error: no reults in TIC')
-                    ticrow = None
-                else:
-                    ticrow = result3[0][0]
-            else:
-                if verbose:
-                    print(i, 'search coordinate in TIC:',
-                            newcoord.ra.deg, newcoord.dec.deg)
-                result3 = Vizier(catalog='IV/38/tic', columns=['**','+_r']
-                            ).query_region(newcoord, radius=3*units.arcsec)
-                if len(result3)==0:
-                    print('Error: no reults in TIC')
-                    ticrow = None
-                elif 'TYC' in crossname_lst:
-                    mask = result3[0]['TYC']==crossname_lst['TYC']
-                    if mask.sum()==1:
-                        ticrow = result3[0][mask][0]
-                    else:
-                        ticrow = None
-                elif len(result3[0])==1 and result3[0][0]['_r']<0.1:
-                    print(result3[0])
-                    ticrow = result3[0][0]
-                else:
-                    ticrow = None
-            if ticrow is not None:
-                if 'TIC' not in crossname_lst:
-                    crossname_lst['TIC'] = ticrow['TIC']
-                if 'HIP' not in crossname_lst and ticrow['HIP'] is not np.ma.masked:
-                    crossname_lst['HIP'] = ticrow['HIP']
-                if 'TYC' not in crossname_lst and ticrow['TYC'] is not np.ma.masked \
-                    and len(ticrow['TYC'])>0:
-                    crossname_lst['TYC'] = ticrow['TYC']
-                if 'UCAC4' not in crossname_lst and ticrow['UCAC4'] is not np.ma.masked:
-                    crossname_lst['UCAC4'] = ticrow['UCAC4']
-                if '2MASS' not in crossname_lst and ticrow['_2MASS'] is not np.ma.masked:
-                    crossname_lst['2MASS'] = ticrow['_2MASS']
-                if 'Gaia2' not in crossname_lst and ticrow['GAIA'] is not np.ma.masked:
-                    crossname_lst['Gaia2'] = ticrow['GAIA']
-            
+    results = [None]*len(name_lst)
+    if local and all([column in local_columns for column in columns]):
+        for i, (name, res) in enumerate(zip(name_lst,
+                                    resolve_local(name_lst, coord_lst))):
+            if res is None:
+                continue
+            ra, dec, crossname_lst = res
+            if not all([column in crossname_lst for column in columns]):
+                # some of the names may only be found remotely
+                continue
             main_name = select_main_name(crossname_lst, altname=name)
-            mask_name = False
-            ra,  mask_ra  = newcoord.ra.deg,  False
-            dec, mask_dec = newcoord.dec.deg, False
-
+            results[i] = (main_name, ra, dec, False, False, crossname_lst)
+
+    # send the unresolved stars to the remote service
+    remote_lst = [(i, name, coord) for i, (name, coord)
+                  in enumerate(zip(name_lst, coord_lst)) if results[i] is None]
+    func = lambda args: _resolve_star(args[0], args[1], args[2], backend,
+                                      verbose=verbose)
+    for (i, _, _), res in zip(remote_lst, query.map_concurrent(func,
+                                    remote_lst, max_workers=max_workers)):
+        results[i] = res
+
+    # accumulate values and masks column-wise
+    values = {key: [] for key, _ in dtype}
+    masks  = {key: [] for key, _ in dtype}
+    for main_name, ra, dec, mask_ra, mask_dec, crossname_lst in results:
         item = [
-            (main_name, mask_name),
-            (ra,        mask_ra),
-            (dec,       mask_dec),
+            ('name', main_name, False),
+            ('ra',   ra,        mask_ra),
+            ('dec',  dec,       mask_dec),
             ]
 
         for column in columns:
@@ -293,10 +383,15 @@ def make_crosstable(name_lst, coord_lst,
                     value = 0
                     mask = True
 
-            item.append((value, mask))
+            item.append((column, value, mask))
+
+        for key, value, mask in item:
+            values[key].append(value)
+            masks[key].append(mask)
 
-        value, mask = list(zip(*item))
-        crosstable.add_row(value, mask=mask)
+    crosstable = Table([MaskedColumn(np.array(values[key], dtype=dt),
+                                     mask=masks[key], name=key)
+                        for key, dt in dtype], masked=True)
 
     crosstable['ra'].info.format  = '%9.5f'
     crosstable['dec'].info.format = '%9.5f'
@@ -304,7 +399,8 @@ def make_crosstable(name_lst, coord_lst,
         if column in crosstable.colnames:
             lenlist = [len(row[column]) for row in crosstable
                         if row[column] is not np.ma.masked]
-            maxlen = max(lenlist)
-            crosstable[column].info.format = '<{}s'.format(maxlen)
+            if len(lenlist)>0:
+                maxlen = max(lenlist)
+                crosstable[column].info.format = '<{}s'.format(maxlen)
 
     return crosstable
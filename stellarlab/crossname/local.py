@@ -0,0 +1,111 @@
+import os
+import numpy as np
+
+from . import name_parser
+
+# names of a star given by the local cross-identification tables
+local_columns = ['HD', 'DM', 'HIP', 'TYC', '2MASS']
+
+def _convert_names(row):
+    """Convert the names of a star found in local cross-identification tables
+    to the form returned by :func:`stella.crossname.get_names`.
+
+    Args:
+        row (dict): Names of a star in catalogues, as returned by
+            :func:`stella.catalog.xindex.cross_starnames`.
+    Returns:
+        dict: Names of the star.
+    """
+    name_lst = {}
+    if row.get('HD') is not None:
+        name_lst['HD'] = row['HD'][0][2:].replace(' ', '')
+    if row.get('HIP') is not None:
+        name_lst['HIP'] = int(row['HIP'][0].split()[1])
+    dm_lst = (row.get('BD') or []) + (row.get('CD') or [])
+    if len(dm_lst)>0:
+        name_lst['DM'] = [name_parser.parse_DM_name(name[0:2]+name[2:].strip())
+                          for name in dm_lst]
+    if row.get('TYC') is not None:
+        name_lst['TYC'] = name_parser.parse_TYC_name(row['TYC'][0])
+    if row.get('2MASS') is not None:
+        name_lst['2MASS'] = row['2MASS'][0][7:]
+    return name_lst
+
+def _find_coordinates(catalog, names, ra, dec, rows):
+    """Fill the coordinates of stars found in a local catalogue.
+
+    Args:
+        catalog (object): Catalogue object (e.g. :data:`stella.catalog.HIP`).
+        names (list): Names of stars in the catalogue.
+        ra (:class:`numpy.ndarray`): Right ascensions to be filled.
+        dec (:class:`numpy.ndarray`): Declinations to be filled.
+        rows (list): Indices of stars in `ra` and `dec`.
+    """
+    if len(rows)==0:
+        return
+    try:
+        res = catalog.find_objects(names, epoch=2000.0,
+                                   columns=['RAdeg', 'DEdeg'], output='dict')
+    except (OSError, ValueError):
+        # catalogue file not installed. coordinates are left as NaN
+        return
+    found = ~np.ma.getmaskarray(res['RAdeg'])
+    rows = np.array(rows)
+    ra[rows[found]]  = res['RAdeg'].data[found]
+    dec[rows[found]] = res['DEdeg'].data[found]
+
+def resolve_local(name_lst, coord_lst=None):
+    """Resolve the names and coordinates of stars with local data only.
+
+    Names are converted with the batch lookups of
+    :func:`stella.catalog.xindex.cross_starnames_many`. The coordinates at
+    J2000.0 are taken from *Hipparcos Catalogue* for stars with HIP names and
+    from *Tycho-2 Catalogue* for the other stars with TYC names, or from
+    `coord_lst` if they are not found there.
+
+    Args:
+        name_lst (list): Names of stars.
+        coord_lst (list): Coordinates (:class:`astropy.coordinates.SkyCoord`)
+            of stars, or *None*.
+    Returns:
+        list: A list of the same length as `name_lst`. Each element is a
+            tuple of (`ra`, `dec`, `crossname_lst`), or *None* if the star can
+            not be resolved locally, i.e. it has neither HIP nor TYC names, or
+            no coordinates, or the local tables are not installed.
+    """
+    from ..catalog import HIP, TYC2
+    from ..catalog.xindex import cross_starnames_many, xindex_path
+
+    n = len(name_lst)
+    if not os.path.isdir(xindex_path):
+        # local cross-identification tables not installed
+        return [None]*n
+    try:
+        table = cross_starnames_many(name_lst)
+    except (OSError, ValueError):
+        # some of the tables are missing
+        return [None]*n
+    rows = [{key: table[key][i] for key in table} for i in range(n)]
+
+    ra  = np.full(n, np.nan)
+    dec = np.full(n, np.nan)
+    hip_rows = [i for i in range(n) if rows[i]['HIP'] is not None]
+    tyc_rows = [i for i in range(n) if rows[i]['HIP'] is None
+                and rows[i]['TYC'] is not None]
+    _find_coordinates(HIP, [rows[i]['HIP'][0] for i in hip_rows],
+                      ra, dec, hip_rows)
+    _find_coordinates(TYC2, [rows[i]['TYC'][0] for i in tyc_rows],
+                      ra, dec, tyc_rows)
+
+    results = []
+    for i in range(n):
+        if rows[i]['HIP'] is None and rows[i]['TYC'] is None:
+            results.append(None)
+            continue
+        if np.isnan(ra[i]):
+            if coord_lst is None or coord_lst[i] is None:
+                results.append(None)
+                continue
+            ra[i], dec[i] = coord_lst[i].ra.deg, coord_lst[i].dec.deg
+        results.append((ra[i], dec[i], _convert_names(rows[i])))
+    return results
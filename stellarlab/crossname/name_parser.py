@@ -27,8 +27,21 @@ greek_letter_abbr_lst = {
 
 greek_letter_lst = greek_letter_abbr_lst.values()
 
+# precompiled patterns of star names
+_Bayer_re        = re.compile('^([a-zA-Q\.]+)(\d*)\s*([a-zA-Z]{3})\s?([A-D]?)$')
+_Bayer_letter_re = re.compile('^[a-zA-Q]$')
+_Flamsteed_re    = re.compile('^(\d+)\s+([a-zA-Z]{3})\s?([A-D]?)$')
+_DM_re           = re.compile('([BC]D[+\-]?\d+\s*\d+[a-zA-Z]?)$')
+_DM_parse_re     = re.compile('([BC]D)([+\-]?\d+)\s*(\d+)([a-zA-Z]?)$')
+_CPD_re          = re.compile('CPD[+\-]?\d+\s*\d+[a-zA-Z]?$')
+_CPD_parse_re    = re.compile('CPD([+\-]?\d+)\s*(\d+)([a-zA-Z]?)$')
+_Var_re          = re.compile('([R-Z])\s*([a-zA-Z]{3})$')
+_Var_double_re   = re.compile('([A-Z]{2})\s*([a-zA-Z]{3})$')
+_Var_V_re        = re.compile('(V\d+)\s*([a-zA-Z]{3})$')
+_TYC_re          = re.compile('TYC\s*(\d*)\-(\d*)\-(\d)$')
+
 def is_Bayer_name(starname):
-    mobj = re.match('^([a-zA-Q\.]+)(\d*)\s*([a-zA-Z]{3})\s?([A-D]?)$', starname)
+    mobj = _Bayer_re.match(starname)
     if mobj:
         letter = mobj.group(1)
         number = mobj.group(2)
@@ -37,14 +50,14 @@ def is_Bayer_name(starname):
         if conste in constellation_abbr_lst and \
             (letter in greek_letter_abbr_lst \
             or letter in greek_letter_lst \
-            or re.match('^[a-zA-Q]$', letter)):
+            or _Bayer_letter_re.match(letter)):
             return True
         else:
             return False
     return False
 
 def parse_Bayer_name(starname):
-    mobj = re.match('^([a-zA-Q\.]+)(\d*)\s*([a-zA-Z]{3})\s?([A-D]?)$', starname)
+    mobj = _Bayer_re.match(starname)
     if mobj:
         letter = mobj.group(1)
         number = mobj.group(2)
@@ -61,7 +74,7 @@ def parse_Bayer_name(starname):
 
 def is_Flamsteed_name(starname):
 
-    mobj = re.match('^(\d+)\s+([a-zA-Z]{3})\s?([A-D]?)$', starname)
+    mobj = _Flamsteed_re.match(starname)
     if mobj:
         number = mobj.group(1)
         conste = mobj.group(2)
@@ -73,7 +86,7 @@ def is_Flamsteed_name(starname):
 
 def parse_Flamsteed_name(starname):
     
-    mobj = re.match('^(\d+)\s+([a-zA-Z]{3})\s?([A-D]?)$', starname)
+    mobj = _Flamsteed_re.match(starname)
     if mobj:
         number = mobj.group(1)
         conste = mobj.group(2)
@@ -86,13 +99,13 @@ def parse_Flamsteed_name(starname):
         return ''
 
 def is_DM_name(starname):
-    if re.match('([BC]D[+\-]?\d+\s*\d+[a-zA-Z]?)$', starname):
+    if _DM_re.match(starname):
         return True
     else:
         return False
 
 def parse_DM_name(starname):
-    mobj = re.match('([BC]D)([+\-]?\d+)\s*(\d+)([a-zA-Z]?)$', starname)
+    mobj = _DM_parse_re.match(starname)
     if mobj:
         catalog = mobj.group(1)
         zone    = int(mobj.group(2))
@@ -103,13 +116,13 @@ def parse_DM_name(starname):
         return ''
 
 def is_CPD_name(starname):
-    if re.match('CPD[+\-]?\d+\s*\d+[a-zA-Z]?$', starname):
+    if _CPD_re.match(starname):
         return True
     else:
         return False
 
 def parse_CPD_name(starname):
-    mobj = re.match('CPD([+\-]?\d+)\s*(\d+)([a-zA-Z]?)$', starname)
+    mobj = _CPD_parse_re.match(starname)
     if mobj:
         zone    = int(mobj.group(1))
         number  = int(mobj.group(2))
@@ -119,7 +132,7 @@ def parse_CPD_name(starname):
         return ''
 
 def is_Var_name(starname):
-    mobj = re.match('([R-Z])\s*([a-zA-Z]{3})$', starname)
+    mobj = _Var_re.match(starname)
     if mobj:
         # variable names from Q to Z
         number = mobj.group(1)
@@ -129,7 +142,7 @@ def is_Var_name(starname):
         else:
             return False
 
-    mobj = re.match('([A-Z]{2})\s*([a-zA-Z]{3})$', starname)
+    mobj = _Var_double_re.match(starname)
     if mobj:
         # Variable names with double uppercase letters
         number = mobj.group(1)
@@ -139,7 +152,7 @@ def is_Var_name(starname):
         else:
             return False
 
-    mobj = re.match('(V\d+)\s*([a-zA-Z]{3})$', starname)
+    mobj = _Var_V_re.match(starname)
     if mobj:
         # Variable names V???
         number = mobj.group(1)
@@ -152,7 +165,7 @@ def is_Var_name(starname):
     return False
 
 def parse_Var_name(starname):
-    mobj = re.match('([R-Z])\s*([a-zA-Z]{3})$', starname)
+    mobj = _Var_re.match(starname)
     if mobj:
         # variable names from Q to Z
         number = mobj.group(1)
@@ -162,7 +175,7 @@ def parse_Var_name(starname):
         else:
             return ''
 
-    mobj = re.match('([A-Z]{2})\s*([a-zA-Z]{3})$', starname)
+    mobj = _Var_double_re.match(starname)
     if mobj:
         # Variable names with double uppercase letters
         number = mobj.group(1)
@@ -172,7 +185,7 @@ def parse_Var_name(starname):
         else:
             return ''
 
-    mobj =  re.match('(V\d+)\s*([a-zA-Z]{3})$', starname)
+    mobj = _Var_V_re.match(starname)
     if mobj:
         # Variable names V???
         number = mobj.group(1)
@@ -186,7 +199,7 @@ def parse_Var_name(starname):
 
 
 def parse_TYC_name(starname):
-    mobj = re.match('TYC\s*(\d*)\-(\d*)\-(\d)$', starname)
+    mobj = _TYC_re.match(starname)
     if mobj:
         tyc1 = int(mobj.group(1))
         tyc2 = int(mobj.group(2))
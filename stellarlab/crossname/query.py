@@ -0,0 +1,245 @@
+import os
+import time
+import pickle
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class RemoteBackend(object):
+    """Query backend sending requests to Simbad and Vizier with
+    `astroquery`.
+
+    A backend used by :func:`stella.crossname.make_crosstable` can be any
+    object with the same four methods, e.g. a local stand-in service or a
+    reader of fixture files for tests and offline runs.
+    """
+
+    def query_objectids(self, name):
+        """Query the identifiers of an object in Simbad.
+
+        Args:
+            name (str): Name of object.
+        Returns:
+            :class:`astropy.table.Table`: A table with column `ID`, or *None*
+                if the object is not found.
+        """
+        from astroquery.simbad import Simbad
+        return Simbad.query_objectids(name)
+
+    def query_object(self, name):
+        """Query the basic data of an object in Simbad.
+
+        Args:
+            name (str): Name of object.
+        Returns:
+            :class:`astropy.table.Table`: A table with columns `RA` and `DEC`,
+                or *None* if the object is not found.
+        """
+        from astroquery.simbad import Simbad
+        return Simbad.query_object(name)
+
+    def query_tic(self, tic):
+        """Query an object in the TESS Input Catalog by its TIC number.
+
+        Args:
+            tic (int): TIC number.
+        Returns:
+            :class:`astroquery.utils.TableList`: Result of Vizier.
+        """
+        from astroquery.vizier import Vizier
+        return Vizier(catalog='IV/38/tic', columns=['**'],
+                      column_filters={'TIC':'={}'.format(tic)}
+                      ).query_constraints()
+
+    def query_tic_region(self, ra, dec, radius):
+        """Query the objects around a position in the TESS Input Catalog.
+
+        Args:
+            ra (float): Right ascension in degree.
+            dec (float): Declination in degree.
+            radius (float): Radius in arcsec.
+        Returns:
+            :class:`astroquery.utils.TableList`: Result of Vizier, with the
+                distances in column `_r`.
+        """
+        from astropy.coordinates import SkyCoord
+        import astropy.units as units
+        from astroquery.vizier import Vizier
+        coord = SkyCoord(ra, dec, unit='deg')
+        return Vizier(catalog='IV/38/tic', columns=['**','+_r']
+                      ).query_region(coord, radius=radius*units.arcsec)
+
+class QueryCache(object):
+    """Persistent cache of query results in an SQLite database.
+
+    Results are keyed by the name of query method and its arguments, and are
+    stored as pickles. Missing objects (*None* results) are cached as well.
+
+    The database records the :attr:`version` of the cache format and the
+    version of `astropy` whose tables are pickled. All results are dropped
+    when the database is opened with other versions, since the pickles may
+    not be readable any more.
+
+    Args:
+        filename (str): Name of the database file.
+            `$STELLA_DATA/cache/crossname/queries.sqlite` is used if *None*.
+    """
+
+    # version of the format of cached results
+    version = 1
+
+    def __init__(self, filename=None):
+        if filename is None:
+            filename = os.path.join(os.getenv('STELLA_DATA'), 'cache',
+                                    'crossname', 'queries.sqlite')
+        dirname = os.path.dirname(filename)
+        if len(dirname)>0 and not os.path.exists(dirname):
+            os.makedirs(dirname, exist_ok=True)
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(filename, check_same_thread=False)
+        with self._lock:
+            self._conn.execute('CREATE TABLE IF NOT EXISTS queries '
+                               '(key TEXT PRIMARY KEY, value BLOB)')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS meta '
+                               '(key TEXT PRIMARY KEY, value TEXT)')
+            row = self._conn.execute('SELECT value FROM meta WHERE key=?',
+                                     ('version',)).fetchone()
+            version = self._get_version()
+            if row is None or row[0] != version:
+                self._conn.execute('DELETE FROM queries')
+                self._conn.execute('INSERT OR REPLACE INTO meta VALUES (?,?)',
+                                   ('version', version))
+            self._conn.commit()
+
+    def _get_version(self):
+        """Get the version string stored in the database.
+
+        Returns:
+            str: Versions of the cache format and `astropy`.
+        """
+        import astropy
+        return '{}:astropy-{}'.format(self.version, astropy.__version__)
+
+    def get(self, key):
+        """Get a cached result.
+
+        Args:
+            key (str): Key of query.
+        Returns:
+            tuple: A tuple of (`found`, `value`).
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT value FROM queries WHERE key=?',
+                                     (key,)).fetchone()
+        if row is None:
+            return False, None
+        try:
+            return True, pickle.loads(row[0])
+        except Exception:
+            # unreadable result. query again
+            return False, None
+
+    def set(self, key, value):
+        """Save a result into the cache.
+
+        Args:
+            key (str): Key of query.
+            value: Result of query.
+        """
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO queries VALUES (?,?)',
+                               (key, blob))
+            self._conn.commit()
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+class RateLimiter(object):
+    """Limit the number of requests sent per second by all threads.
+
+    Args:
+        rate (float): Maximum number of requests per second. No limit if
+            *None*.
+    """
+
+    def __init__(self, rate):
+        self.interval = 0.0 if rate is None else 1.0/rate
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        """Wait until the next request can be sent."""
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            t = max(now, self._next)
+            self._next = t + self.interval
+        if t > now:
+            time.sleep(t - now)
+
+class CachedBackend(object):
+    """Wrapper of a query backend adding a persistent cache and rate
+    limiting.
+
+    Only the queries not found in the cache are sent to the backend and
+    count towards the rate limit.
+
+    Args:
+        backend (object): Query backend (e.g. :class:`RemoteBackend`).
+        cache (:class:`QueryCache`): Cache of results. No cache if *None*.
+        rate (float): Maximum number of requests per second sent to the
+            backend.
+    """
+
+    def __init__(self, backend, cache=None, rate=None):
+        self.backend = backend
+        self.cache   = cache
+        self.limiter = RateLimiter(rate)
+
+    def _query(self, method, *args, key=None):
+        if key is None:
+            key = '{}:{}'.format(method, ':'.join([str(arg) for arg in args]))
+        if self.cache is not None:
+            found, value = self.cache.get(key)
+            if found:
+                return value
+        self.limiter.wait()
+        value = getattr(self.backend, method)(*args)
+        if self.cache is not None:
+            self.cache.set(key, value)
+        return value
+
+    def query_objectids(self, name):
+        return self._query('query_objectids', name)
+
+    def query_object(self, name):
+        return self._query('query_object', name)
+
+    def query_tic(self, tic):
+        return self._query('query_tic', tic)
+
+    def query_tic_region(self, ra, dec, radius):
+        key = 'query_tic_region:{:.7f}:{:.7f}:{}'.format(ra, dec, radius)
+        return self._query('query_tic_region', ra, dec, radius, key=key)
+
+def map_concurrent(func, items, max_workers=4):
+    """Apply a function to items with a pool of threads, keeping at most
+    `max_workers` requests in flight.
+
+    Args:
+        func (callable): Function applied to each item.
+        items (list): Items.
+        max_workers (int): Number of threads. Items are processed in the
+            current thread if `max_workers` is 1.
+    Returns:
+        list: Results in the order of `items`.
+    """
+    if max_workers <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(func, items))
@@ -4,6 +4,7 @@ from .y2     import Y2
 #from .geneva import GenevaTrack
 from . import geneva
 from .yapsi import YaPSI
+from .fit   import fit_stars, get_grid
 
 def get_track(track,**kwargs):
     track = track.lower().strip()
@@ -1,6 +1,7 @@
 import numpy as np
 from scipy.interpolate import splprep, splev
-from ..utils.interpolation import newton
+from scipy.sparse import csr_matrix
+from ..utils.interpolation import lagrange_weights
 
 def interpolate_data(track, n, k=1):
     '''Interpolate the evolution track.
@@ -21,29 +22,113 @@ def interpolate_data(track, n, k=1):
 def interpolate_param(track_lst, param_lst, param):
     '''Interpolate the tracks over a certain parameter space.
 
+    The Lagrange weights of the nodes are computed once for `param`, and
+    applied to all the points and parameters of the tracks at once. The
+    result is the same as Newton interpolation at each point.
+
     Args:
         track_lst (list): List of track tuples
         param_lst (list): List of node parameters in grid
-        param (integer or float): Input parameter
+        param (integer, float or :class:`numpy.ndarray`): Input parameter, or
+            an array of input parameters
     Returns:
-        tuple: A tuple containing (log\ *T*:sub:`eff`, log\ *L*, age, *M*)
+        tuple: A tuple containing (log\ *T*:sub:`eff`, log\ *L*, age, *M*). If
+            `param` is an array of *m* values, each element has a shape of
+            (*m*, *n*), where *n* is the number of points in the tracks.
     '''
 
-    ntrack = len(track_lst)
-    nparam = len(track_lst[0])
-    ngrid  = track_lst[0][0].size
+    # cube with shape (ntrack, nparam, ngrid)
+    cube = np.array([np.array(track, dtype=np.float64) for track in track_lst])
+    weights = lagrange_weights(param_lst, param)
+    inter = np.tensordot(weights, cube, axes=([-1], [0]))
 
-    inter1 = np.zeros((ngrid, nparam, ntrack))
-    inter2 = np.zeros((ngrid, nparam))
+    nparam = cube.shape[1]
+    newtrack = tuple(inter[..., k, :] for k in range(nparam))
 
-    for it, track in enumerate(track_lst):
-        for ip, v_lst in enumerate(track):
-            inter1[:, ip, it] = v_lst
+    return newtrack
 
-    for k1 in range(ngrid):
-        for k2 in range(nparam):
-            inter2[k1, k2] = newton(param_lst, inter1[k1, k2, :], param)
+def interpolate_cube(cube, mask, x_nodes, m_nodes, x, mass, log=False):
+    '''Interpolate a cube of node tracks for many pairs of (*x*, *M*) at
+    once, where *x* is the metallicity parameter of the grid.
 
-    newtrack = tuple(inter2[:,k] for k in range(nparam))
+    The interpolation is 4-point Lagrange interpolation over *M* among the
+    available mass nodes of each *x* node, followed by 4-point interpolation
+    over *x*. The weights of all pairs are put into a sparse matrix, which is
+    multiplied by the cube in one step.
 
-    return newtrack
+    Args:
+        cube (:class:`numpy.ndarray`): Node tracks with shape
+            (*n*:sub:`x`, *n*:sub:`M`, *n*:sub:`grid`, *n*:sub:`param`).
+        mask (:class:`numpy.ndarray`): *True* for the missing node tracks,
+            with shape (*n*:sub:`x`, *n*:sub:`M`). All nodes are used if
+            *None*.
+        x_nodes (list): Nodes of *x*.
+        m_nodes (list): Nodes of *M*.
+        x (:class:`numpy.ndarray`): Values of *x*.
+        mass (:class:`numpy.ndarray`): Values of *M*.
+        log (bool): Interpolate over log\ :sub:`10`\ (*x*) if *True*.
+    Returns:
+        :class:`numpy.ndarray`: Interpolated tracks with shape (*N*,
+            *n*:sub:`grid`, *n*:sub:`param`).
+    '''
+    x, mass = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(x,    dtype=np.float64)),
+            np.atleast_1d(np.asarray(mass, dtype=np.float64)))
+    m_nodes = np.asarray(m_nodes, dtype=np.float64)
+    npair = x.size
+    nx, nm = cube.shape[0:2]
+
+    # indices and weights of x nodes with shape (N, 4), and of mass nodes
+    # with shape (N, 4, 4)
+    ix, wx = _get_node_weights(x_nodes, x, log=log)
+    pm = np.broadcast_to(mass[:, np.newaxis], ix.shape)
+    im = np.zeros(ix.shape+(4,), dtype=np.int64)
+    wm = np.zeros(ix.shape+(4,))
+    for j in np.unique(ix):
+        if mask is None:
+            available = np.arange(nm)
+        else:
+            available = np.nonzero(~mask[j])[0]
+        m = ix == j
+        k, w = _get_node_weights(m_nodes[available], pm[m])
+        im[m, 0:k.shape[1]] = available[k]
+        wm[m, 0:k.shape[1]] = w
+
+    weights = wx[:, :, np.newaxis]*wm
+    columns = ix[:, :, np.newaxis]*nm + im
+    rows = np.broadcast_to(np.arange(npair)[:, np.newaxis, np.newaxis],
+                           weights.shape)
+    keep = weights != 0
+    matrix = csr_matrix((weights[keep], (rows[keep], columns[keep])),
+                        shape=(npair, nx*nm))
+    tracks = matrix.dot(cube.reshape(nx*nm, -1))
+    return tracks.reshape((npair,)+cube.shape[2:])
+
+def _get_node_weights(nodes, value, log=False):
+    '''Get the nodes and weights of 4-points interpolation for an array of
+    values.
+
+    Args:
+        nodes (list): Input node list. All nodes are used if there are less
+            than 4 nodes.
+        value (:class:`numpy.ndarray`): Input values.
+        log (bool): Interpolate in log\ :sub:`10` space if *True*.
+    Returns:
+        tuple: A tuple of (`index`, `weights`), both with shape (*N*, 4).
+            If a value is one of the nodes, its weight is 1 and the other
+            weights are 0.
+    '''
+    nodes  = np.asarray(nodes, dtype=np.float64)
+    npoint = min(4, nodes.size)
+    i0 = np.searchsorted(nodes, value)
+    start = np.clip(i0-2, 0, nodes.size-npoint)
+    index = start[:, np.newaxis] + np.arange(npoint)
+    ax = nodes[index]
+    if log:
+        weights = lagrange_weights(np.log10(ax), np.log10(value))
+    else:
+        weights = lagrange_weights(ax, value)
+    exact = ax == value[:, np.newaxis]
+    hit = exact.any(axis=1)
+    weights[hit] = exact[hit]
+    return index, weights
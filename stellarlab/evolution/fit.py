@@ -0,0 +1,393 @@
+import os
+import math
+import hashlib
+import multiprocessing
+import numpy as np
+
+from ..parameter.metal import feh_to_z
+from ..utils.memoize import memoized
+from ..utils.npycache import load_cache, save_cache
+
+# default grid nodes of initial mass and [Fe/H] for each model
+_default_nodes = {
+    'y2': (
+        np.concatenate((np.arange(0.40, 2.00, 0.02),
+                        np.arange(2.00, 5.00+1e-3, 0.05))),
+        np.arange(-2.5, 0.5+1e-3, 0.1),
+    ),
+    'geneva': (
+        np.concatenate((np.arange(0.80, 2.00, 0.02),
+                        np.arange(2.00, 10.0+1e-3, 0.10))),
+        np.arange(-1.2, 0.5+1e-3, 0.1),
+    ),
+    'yapsi': (
+        np.concatenate((np.arange(0.15, 2.00, 0.02),
+                        np.arange(2.00, 5.00+1e-3, 0.05))),
+        np.arange(-1.5, 0.3+1e-3, 0.1),
+    ),
+}
+
+# grid used by worker processes
+_worker_grid = None
+
+def _get_model_tracks(model, mass_nodes, feh_nodes, y=0.28):
+    '''Get the evolution tracks of all pairs of mass and [Fe/H] nodes.
+
+    Args:
+        model (str): Name of model (*"y2"*, *"geneva"*, or *"yapsi"*).
+        mass_nodes (:class:`numpy.ndarray`): Initial masses.
+        feh_nodes (:class:`numpy.ndarray`): Metallicities.
+        y (float): Helium content of YaPSI tracks.
+    Returns:
+        tuple: A tuple containing (log\ *T*:sub:`eff`, log\ *L*, age, log\
+            *g*). Each element has a shape of (*n*:sub:`[Fe/H]`,
+            *n*:sub:`M`, *n*:sub:`grid`).
+    '''
+    nfeh, nmass = feh_nodes.size, mass_nodes.size
+    feh  = np.repeat(feh_nodes, nmass)
+    mass = np.tile(mass_nodes, nfeh)
+
+    if model == 'y2':
+        from .y2 import Y2
+        tracks = Y2.get_tracks(mass, feh_to_z(feh))
+    elif model == 'geneva':
+        from .geneva import Geneva
+        logTeff, logL, age, mass1 = Geneva.get_tracks(mass, feh_to_z(feh))
+        logg = np.log10(mass1) + 4*(logTeff - math.log10(5777)) - logL + 4.44
+        tracks = (logTeff, logL, age, logg)
+    elif model == 'yapsi':
+        from .yapsi import YaPSI
+        tracks = YaPSI.get_tracks(y, feh, mass, n=150)[0:4]
+    else:
+        print('Error: Unknown model "%s"'%model)
+        raise ValueError
+
+    return tuple(np.asarray(track, dtype=np.float64).reshape(nfeh, nmass, -1)
+                 for track in tracks)
+
+def _get_grid_source(model):
+    '''Get the file from which the tracks of a model are read. Grids cached
+    on disk are out of date if this file changes.
+
+    Args:
+        model (str): Name of model (*"y2"*, *"geneva"*, or *"yapsi"*).
+    Returns:
+        str: Name of the data file, or the directory of converted YaPSI
+            tracks, which changes when tracks of new [Fe/H] or *Y* are
+            converted.
+    '''
+    if model == 'y2':
+        return '%s/evolution/Y2_tracks.fits'%os.getenv('STELLA_DATA')
+    elif model == 'geneva':
+        return '%s/evolution/Geneva_tracks.fits'%os.getenv('STELLA_DATA')
+    else:
+        return os.path.join(os.path.expanduser('~'), '.stellarlab',
+                            'thirdpartydata', 'yapsi')
+
+def _build_grid(model, mass_nodes, feh_nodes, y):
+    '''Build a grid of stellar models from the evolution tracks.
+
+    Args:
+        model (str): Name of model (*"y2"*, *"geneva"*, or *"yapsi"*).
+        mass_nodes (:class:`numpy.ndarray`): Initial masses.
+        feh_nodes (:class:`numpy.ndarray`): Metallicities.
+        y (float): Helium content of YaPSI tracks.
+    Returns:
+        dict: Grid of models, see :func:`get_grid`.
+    '''
+    logTeff, logL, age, logg = _get_model_tracks(model, mass_nodes, feh_nodes,
+                                                 y=y)
+    nfeh, nmass, npoint = logTeff.shape
+    mass = np.broadcast_to(mass_nodes[np.newaxis, :, np.newaxis], age.shape)
+    feh  = np.broadcast_to(feh_nodes[:, np.newaxis, np.newaxis], age.shape)
+
+    # volume of each model in (mass, [Fe/H], age) space
+    dmass = np.abs(np.gradient(mass_nodes)) if nmass > 1 else np.ones(1)
+    dfeh  = np.abs(np.gradient(feh_nodes)) if nfeh > 1 else np.ones(1)
+    dage  = np.abs(np.gradient(age, axis=2)) if npoint > 1 else np.ones(age.shape)
+    with np.errstate(divide='ignore'):
+        logw = np.log(dage) + np.log(dmass)[np.newaxis, :, np.newaxis] \
+                            + np.log(dfeh)[:, np.newaxis, np.newaxis]
+
+    grid = {'logTeff': logTeff, 'logL': logL, 'age': age, 'logg': logg,
+            'mass': mass, 'feh': feh, 'logw': logw}
+    # remove models with missing values or zero weights, and sort the models
+    # by [Fe/H]
+    m = np.ones(age.shape, dtype=bool)
+    for array in grid.values():
+        m &= np.isfinite(array)
+    order = np.argsort(feh[m], kind='stable')
+    return {key: np.ascontiguousarray(array[m][order])
+            for key, array in grid.items()}
+
+@memoized(maxsize=4)
+def _load_grid(model, mass_nodes, feh_nodes, y):
+    '''Load a grid of stellar models from the disk cache, or build and save
+    it if the cache does not exist or is out of date. The cache is stored in
+    `$STELLA_DATA/cache/evolution/<source>/grid_<hash>`, where the hash
+    is computed from the nodes and *Y*.
+
+    Args:
+        model (str): Name of model (*"y2"*, *"geneva"*, or *"yapsi"*).
+        mass_nodes (tuple): Initial masses.
+        feh_nodes (tuple): Metallicities.
+        y (float): Helium content of YaPSI tracks, or *None* for other
+            models.
+    Returns:
+        dict: Grid of models, see :func:`get_grid`.
+    '''
+    mass_nodes = np.array(mass_nodes, dtype=np.float64)
+    feh_nodes  = np.array(feh_nodes, dtype=np.float64)
+    digest = hashlib.md5()
+    for array in (mass_nodes, feh_nodes, np.array([np.nan if y is None else y])):
+        digest.update(array.tobytes())
+    name = 'grid_%s'%digest.hexdigest()[0:16]
+
+    source = _get_grid_source(model)
+    grid = None
+    if os.path.exists(source):
+        grid = load_cache('evolution', source, name)
+    if grid is None:
+        save_cache('evolution', source, name,
+                   _build_grid(model, mass_nodes, feh_nodes, y))
+        grid = load_cache('evolution', source, name)
+    return grid
+
+def get_grid(model='Y2', mass_nodes=None, feh_nodes=None, y=0.28):
+    '''Get a dense grid of stellar models over (*M*, [Fe/H], age).
+
+    The grid is built from the evolution tracks of all pairs of mass and
+    [Fe/H] nodes. Built grids are cached on disk in
+    `$STELLA_DATA/cache/evolution`, and the most recently used ones are also
+    kept in memory.
+
+    Args:
+        model (str): Name of model (*"Y2"*, *"Geneva"*, or *"YaPSI"*).
+        mass_nodes (list): Initial masses of the tracks. Default nodes of the
+            model are used if *None*.
+        feh_nodes (list): Metallicities of the tracks. Default nodes of the
+            model are used if *None*.
+        y (float): Helium content of YaPSI tracks.
+    Returns:
+        dict: A dict of 1-d arrays of all models in the grid, containing
+            `logTeff`, `logL`, `age`, `logg`, `mass` (initial mass), `feh`,
+            and `logw`, the logarithmic prior weights, which are proportional
+            to the volume of each model in (*M*, [Fe/H], age) space. The
+            arrays are read-only.
+    '''
+    model = model.lower().strip()
+    if model not in _default_nodes:
+        print('Error: Unknown model "%s"'%model)
+        raise ValueError
+    if mass_nodes is None:
+        mass_nodes = _default_nodes[model][0]
+    if feh_nodes is None:
+        feh_nodes = _default_nodes[model][1]
+    mass_nodes = tuple(np.asarray(mass_nodes, dtype=np.float64).tolist())
+    feh_nodes  = tuple(np.asarray(feh_nodes, dtype=np.float64).tolist())
+    if model != 'yapsi':
+        # Y is only used by YaPSI
+        y = None
+    return _load_grid(model, mass_nodes, feh_nodes, y)
+
+def _fit_chunk(grid, logTeff, logL, feh, e_logTeff, e_logL, e_feh, levels,
+        nsigma):
+    '''Compute the posterior quantiles of a chunk of stars.
+
+    Args:
+        grid (dict): Grid of models returned by :func:`get_grid`.
+        logTeff (:class:`numpy.ndarray`): log\ *T*:sub:`eff` of stars.
+        logL (:class:`numpy.ndarray`): log\ *L* of stars.
+        feh (:class:`numpy.ndarray`): [Fe/H] of stars.
+        e_logTeff (:class:`numpy.ndarray`): Errors of log\ *T*:sub:`eff`.
+        e_logL (:class:`numpy.ndarray`): Errors of log\ *L*.
+        e_feh (:class:`numpy.ndarray`): Errors of [Fe/H].
+        levels (tuple): Quantile levels of the lower bound, median, and upper
+            bound.
+        nsigma (float): Only the models within `nsigma` times the errors
+            from any star in the chunk are used.
+    Returns:
+        dict: A dict of the quantiles of `mass`, `age` and `logg`, each with
+            shape (*N*, 3), and the minimum χ\ :sup:`2` `chi2`.
+    '''
+    nstar = logTeff.size
+    result = {key: np.full((nstar, 3), np.nan) for key in ['mass', 'age', 'logg']}
+    result['chi2'] = np.full(nstar, np.nan)
+
+    # select the models in the box around all stars of the chunk. models in
+    # the grid are sorted by [Fe/H]
+    i1, i2 = np.searchsorted(grid['feh'], [(feh - nsigma*e_feh).min(),
+                                           (feh + nsigma*e_feh).max()])
+    m = np.ones(i2-i1, dtype=bool)
+    for key, x, e in [('logTeff', logTeff, e_logTeff), ('logL', logL, e_logL)]:
+        m &= (grid[key][i1:i2] > (x - nsigma*e).min()) & \
+             (grid[key][i1:i2] < (x + nsigma*e).max())
+    index = i1 + np.nonzero(m)[0]
+    if index.size == 0:
+        return result
+
+    chi2 = ((grid['logTeff'][index] - logTeff[:, np.newaxis])/
+            e_logTeff[:, np.newaxis])**2 \
+         + ((grid['logL'][index] - logL[:, np.newaxis])/
+            e_logL[:, np.newaxis])**2 \
+         + ((grid['feh'][index] - feh[:, np.newaxis])/
+            e_feh[:, np.newaxis])**2
+    chi2min = chi2.min(axis=1)
+
+    # keep only the models within nsigma of each star, as pairs of (star,
+    # model) sorted by star
+    rows, cols = np.nonzero(chi2 <= nsigma**2)
+    logw = grid['logw'][index]
+    prob = np.exp(-0.5*(chi2[rows, cols] - chi2min[rows])
+                  + logw[cols] - logw.max())
+    total = np.bincount(rows, weights=prob, minlength=nstar)
+    good = total > 0
+    result['chi2'][good] = chi2min[good]
+    if rows.size == 0:
+        return result
+
+    irow = np.nonzero(good)[0]
+    for key in ['mass', 'age', 'logg']:
+        values = grid[key][index][cols]
+        order = np.lexsort((values, rows))
+        cum = np.cumsum(prob[order])
+        # cumulative distribution within each star. the key 2*row + cdf
+        # increases monotonically over all pairs
+        start = np.searchsorted(rows[order], rows[order], side='left')
+        offset = np.where(start > 0, cum[start-1], 0.0)
+        cdf = (cum - offset)/total[rows[order]]
+        sortkey = 2*rows[order] + cdf
+        for k, level in enumerate(levels):
+            i = np.searchsorted(sortkey, 2*irow + level, side='left')
+            i = np.minimum(i, np.searchsorted(rows[order], irow, side='right')-1)
+            result[key][irow, k] = values[order[i]]
+    return result
+
+def _init_worker(grid):
+    '''Set the grid in a worker process.
+
+    Args:
+        grid (dict): Grid of models.
+    '''
+    global _worker_grid
+    _worker_grid = grid
+
+def _fit_worker(args):
+    '''Fit a chunk of stars in a worker process.
+
+    Args:
+        args (tuple): Arguments of :func:`_fit_chunk` except `grid`.
+    Returns:
+        dict: Result of :func:`_fit_chunk`.
+    '''
+    return _fit_chunk(_worker_grid, *args)
+
+def fit_stars(teff, logL, feh, errors, model='Y2', interval=0.68,
+        mass_nodes=None, feh_nodes=None, y=0.28, nsigma=5.0, chunk=64,
+        processes=1):
+    '''Estimate the masses, ages and surface gravities of stars by comparing
+    their *T*:sub:`eff`, *L* and [Fe/H] with a grid of stellar models.
+
+    The likelihoods of all models in the grid (see :func:`get_grid`) are
+    evaluated for each star, weighted by the volumes of models in (*M*,
+    [Fe/H], age) space, i.e. flat priors in these parameters. Stars are grouped
+    into cells of [Fe/H] and log\ *L*, sorted by *T*:sub:`eff` in each cell,
+    and processed in chunks, so that each chunk only uses the models close to
+    its stars. Chunks can be spread over a pool of processes.
+
+    Args:
+        teff (:class:`numpy.ndarray`): Effective temperatures in K.
+        logL (:class:`numpy.ndarray`): log\ :sub:`10`\ (*L*/*L*:sub:`⊙`).
+        feh (:class:`numpy.ndarray`): Metallicities.
+        errors (tuple): A tuple of the errors of (*T*:sub:`eff`, log\ *L*,
+            [Fe/H]). Each error can be a scalar or an array, and must be
+            positive.
+        model (str): Name of model (*"Y2"*, *"Geneva"*, or *"YaPSI"*).
+        interval (float): Probability contained in the returned intervals.
+        mass_nodes (list): Initial masses of the grid tracks. Default nodes
+            of the model are used if *None*.
+        feh_nodes (list): Metallicities of the grid tracks. Default nodes of
+            the model are used if *None*.
+        y (float): Helium content of YaPSI tracks.
+        nsigma (float): Models farther than `nsigma` times the errors from a
+            star are ignored.
+        chunk (int): Number of stars processed at a time.
+        processes (int): Number of worker processes. Chunks are processed in
+            the current process if `processes` is 1.
+    Returns:
+        dict: A dict of arrays containing the posterior medians `mass`
+            (initial mass), `age` and `logg`, the lower and upper bounds of
+            their intervals (e.g. `mass_low` and `mass_high`), and the
+            minimum χ\ :sup:`2` `chi2`. Stars without any model within
+            `nsigma` are given NaN. Ages are in the unit of the model tracks.
+    Examples:
+
+        .. code-block:: python
+
+            >>> from stella.evolution import fit_stars
+            >>> res = fit_stars([5777, 6200], [0.0, 0.45], [0.0, -0.3],
+            ...                 (80, 0.05, 0.1), model='Y2')
+            >>> res['mass']
+
+    '''
+    teff, logL, feh = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(teff, dtype=np.float64)),
+            np.atleast_1d(np.asarray(logL, dtype=np.float64)),
+            np.atleast_1d(np.asarray(feh,  dtype=np.float64)))
+    e_teff, e_logL, e_feh = [np.broadcast_to(
+            np.asarray(e, dtype=np.float64), teff.shape) for e in errors]
+    for name, e in zip(['Teff', 'logL', '[Fe/H]'], [e_teff, e_logL, e_feh]):
+        if not np.all(e > 0):
+            print('Error: Errors of %s must be positive'%name)
+            raise ValueError
+    logTeff   = np.log10(teff)
+    e_logTeff = e_teff/(teff*math.log(10))
+    nstar = teff.size
+
+    grid = get_grid(model, mass_nodes=mass_nodes, feh_nodes=feh_nodes, y=y)
+    levels = (0.5-interval/2, 0.5, 0.5+interval/2)
+
+    # group stars into cells in ([Fe/H], log L) space with sizes of nsigma
+    # times the typical errors, and sort them by Teff in each cell. chunks do
+    # not cross the cell boundaries, so that each chunk only covers a small
+    # part of the grid
+    order = np.zeros(0, dtype=np.int64)
+    edges = [0]
+    if nstar > 0:
+        cell_feh  = np.floor(feh/(nsigma*np.median(e_feh)))
+        cell_logL = np.floor(logL/(nsigma*np.median(e_logL)))
+        order = np.lexsort((logTeff, cell_logL, cell_feh))
+        change = (np.diff(cell_feh[order]) != 0) | \
+                 (np.diff(cell_logL[order]) != 0)
+        edges = np.concatenate(([0], np.nonzero(change)[0]+1, [nstar]))
+    tasks = []
+    for j1, j2 in zip(edges[:-1], edges[1:]):
+        for i0 in range(j1, j2, chunk):
+            i = order[i0:min(i0+chunk, j2)]
+            tasks.append((logTeff[i], logL[i], feh[i], e_logTeff[i],
+                          e_logL[i], e_feh[i], levels, nsigma))
+
+    if processes > 1 and len(tasks) > 1:
+        pool = multiprocessing.Pool(processes, initializer=_init_worker,
+                                    initargs=(grid,))
+        try:
+            results = pool.map(_fit_worker, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_fit_chunk(grid, *task) for task in tasks]
+
+    # map the chunks back to the input order
+    output = {}
+    for key in ['mass', 'age', 'logg']:
+        values = np.full((nstar, 3), np.nan)
+        if nstar > 0:
+            values[order] = np.concatenate([r[key] for r in results])
+        output[key+'_low']  = values[:, 0]
+        output[key]         = values[:, 1]
+        output[key+'_high'] = values[:, 2]
+    output['chi2'] = np.full(nstar, np.nan)
+    if nstar > 0:
+        output['chi2'][order] = np.concatenate([r['chi2'] for r in results])
+    return output
@@ -3,7 +3,9 @@ import math
 import numpy as np
 import astropy.io.fits as fits
 
-from .base import interpolate_data, interpolate_param
+from .base import interpolate_data, interpolate_cube
+from ..utils.npycache import load_cache, save_cache
+from ..utils.interpolation import lagrange_weights
 from ..parameter.metal import feh_to_z
 
 class _Geneva(object):
@@ -35,49 +37,124 @@ class _Geneva(object):
 
     '''
 
+    z_nodes = [0.001, 0.004, 0.008, 0.02, 0.04, 0.1]
+    m_nodes = [0.8, 0.9, 1.0, 1.25, 1.5, 1.7, 2.0, 2.5, 3.0, 4.0, 5.0, 7.0,
+               9.0, 10.0, 12.0, 15.0, 20.0, 25.0, 40.0, 60.0, 85.0, 120.0]
+    a_nodes = [3.00, 5.00, 5.30, 5.59, 5.80, 5.90, 6.00, 6.05, 6.09, 6.15,
+               6.19, 6.25, 6.30, 6.34, 6.40, 6.44, 6.50, 6.55, 6.59, 6.65,
+               6.69, 6.75, 6.80, 6.84, 6.90, 6.94, 7.00, 7.05, 7.09, 7.15,
+               7.19, 7.25, 7.30, 7.34, 7.40, 7.44, 7.50, 7.55, 7.59, 7.65,
+               7.69, 7.75, 7.80, 7.84, 7.90, 7.94, 8.00, 8.05, 8.10, 8.14,
+               8.19, 8.25, 8.30, 8.35, 8.39, 8.44, 8.50, 8.55, 8.60, 8.64,
+               8.69, 8.75, 8.80, 8.85, 8.89, 8.94, 9.00, 9.05, 9.10, 9.14,
+               9.19, 9.25, 9.30, 9.35, 9.39, 9.44, 9.50, 9.55, 9.60, 9.64,
+               9.69, 9.75, 9.80, 9.85, 9.89, 9.94, 10.00, 10.05, 10.10,
+               10.14, 10.19]
+    missing_nodes = [(0.001, 10.0), (0.004, 10.0), (0.008, 9.0),
+                     (0.02, 10.0), (0.04, 10.0), (0.1, 10.0), (0.1, 85.0),
+                     (0.1, 120.0)]
+
+    # number of points of tracks and isochrones in the cubes
+    track_ngrid     = 51
+    isochrone_ngrid = 600
+
     def __init__(self):
-        self._track_data = None
-        self._isocrhone_data = None
+        self._track_cube     = None
+        self._isochrone_cube = None
 
     def _get_param_grid(self):
         '''Return a paramer grid that is available in the database.
         '''
 
-    def _load_tracks(self):
-        '''Read the whole Geneva track data file.
+    def _build_cube(self, data_path, key, nodes, columns, getid, ngrid):
+        '''Resample all the node tracks (or isochrones) in a Geneva file to a
+        common number of points, and put them into a dense cube.
+
+        Args:
+            data_path (str): Name of the FITS file.
+            key (str): Column of the second grid parameter (*"m0"* or
+                *"logage"*).
+            nodes (list): Nodes of the second grid parameter.
+            columns (list): Columns of the tracks.
+            getid (function): Function returning the ID of a node.
+            ngrid (int): Number of points in the cube.
+        Returns:
+            tuple: A tuple containing:
+
+                * **cube** (:class:`numpy.ndarray`): Node tracks with shape
+                  (*n*:sub:`z`, *n*:sub:`node`, `ngrid`, *n*:sub:`param`).
+                * **mask** (:class:`numpy.ndarray`): *True* for the nodes
+                  missing in the file, with shape (*n*:sub:`z`,
+                  *n*:sub:`node`).
         '''
-        data_path  = '%s/evolution/Geneva_tracks.fits'%os.getenv('STELLA_DATA')
-        data = {}
+        index = {}
+        for iz, _z in enumerate(self.z_nodes):
+            for inode, _node in enumerate(nodes):
+                index[getid(_z, _node)] = (iz, inode)
+
+        cube = np.zeros((len(self.z_nodes), len(nodes), ngrid, len(columns)))
+        mask = np.ones((len(self.z_nodes), len(nodes)), dtype=bool)
         table = fits.getdata(data_path)
         for row in table:
-            z  = row['z']
-            m0 = row['m0']
-            n  = row['n']
-            logTeff_lst = row['logTeff'][0:n]
-            logL_lst    = row['logL'][0:n]
-            age_lst     = row['age'][0:n]
-            mass_lst    = row['mass'][0:n]
-            trackid = self._get_trackid(z, m0)
-            data[trackid] = (logTeff_lst, logL_lst, age_lst, mass_lst)
-        self._track_data = data
+            nodeid = getid(row['z'], row[key])
+            if nodeid not in index:
+                continue
+            n = row['n']
+            track = tuple(row[column][0:n] for column in columns)
+            if n != ngrid:
+                track = interpolate_data(track, n=ngrid)
+            iz, inode = index[nodeid]
+            cube[iz, inode] = np.array(track, dtype=np.float64).T
+            mask[iz, inode] = False
+        return cube, mask
+
+    def _load_cube(self, data_path, key, nodes, columns, getid, ngrid):
+        '''Load the cube of a Geneva file from the cache, or build and save it
+        if the cache does not exist or is out of date.
+
+        Args:
+            data_path (str): Name of the FITS file.
+            key (str): Column of the second grid parameter.
+            nodes (list): Nodes of the second grid parameter.
+            columns (list): Columns of the tracks.
+            getid (function): Function returning the ID of a node.
+            ngrid (int): Number of points in the cube.
+        Returns:
+            tuple: A tuple of (`cube`, `mask`), see :meth:`_build_cube`.
+        '''
+        name = 'cube%d'%ngrid
+        cache = load_cache('evolution', data_path, name, mmap_mode=None)
+        if cache is not None:
+            return cache['cube'], cache['mask']
+        cube, mask = self._build_cube(data_path, key, nodes, columns, getid,
+                                      ngrid)
+        save_cache('evolution', data_path, name, {'cube': cube, 'mask': mask})
+        return cube, mask
+
+    def _load_tracks(self):
+        '''Load the cube of all Geneva tracks resampled to
+        :attr:`track_ngrid` points. The nodes in :attr:`missing_nodes` are
+        masked.
+        '''
+        data_path  = '%s/evolution/Geneva_tracks.fits'%os.getenv('STELLA_DATA')
+        cube, mask = self._load_cube(data_path, 'm0', self.m_nodes,
+                                     ['logTeff', 'logL', 'age', 'mass'],
+                                     self._get_trackid, self.track_ngrid)
+        mask = mask.copy()
+        for _z, _m in self.missing_nodes:
+            mask[self.z_nodes.index(_z), self.m_nodes.index(_m)] = True
+        self._track_cube = (cube, mask)
 
     def _load_isochrones(self):
-        '''Read the whole Geneva isochrone file.
+        '''Load the cube of all Geneva isochrones resampled to
+        :attr:`isochrone_ngrid` points.
         '''
         data_path = '%s/evolution/Geneva_isochrones.fits'%os.getenv('STELLA_DATA')
-        data = {}
-        table = fits.getdata(data_path)
-        for row in table:
-            z      = row['z']
-            logage = row['logage']
-            n      = row['n']
-            m0_lst      = row['m0'][0:n]
-            mass_lst    = row['mass'][0:n]
-            logTeff_lst = row['logTeff'][0:n]
-            logL_lst    = row['logL'][0:n]
-            isochroneid = self._get_isochroneid(z, m0)
-            data[isochroneid] = (m0_lst, mass_lst, logTeff_lst, logL_lst)
-        self._isochrone_data = data
+        self._isochrone_cube = self._load_cube(data_path, 'logage',
+                                    self.a_nodes,
+                                    ['m0', 'mass', 'logTeff', 'logL'],
+                                    self._get_isochroneid,
+                                    self.isochrone_ngrid)
 
     def _get_trackid(self, z, mass0):
         '''Get Track ID.
@@ -101,9 +178,38 @@ class _Geneva(object):
         '''
         return (int(round(z*1000)), int(round(logage*100)))
 
+    def _interpolate_cube(self, cube, mask, nodes, value, z):
+        '''Interpolate a cube over the second grid parameter and log\ :sub:`10`\
+        (*Z*) space with 4-point Lagrange interpolation. The unmasked nodes
+        used and their weights are collected first, and the cube is then
+        contracted in one step.
+
+        Args:
+            cube (:class:`numpy.ndarray`): Cube of node tracks.
+            mask (:class:`numpy.ndarray`): Mask of missing nodes.
+            nodes (list): Nodes of the second grid parameter.
+            value (float): Value of the second grid parameter.
+            z (float): Metal content.
+        Returns:
+            tuple: A tuple of the interpolated arrays of all parameters.
+        '''
+        iz_lst, wz_lst = _get_weights(self.z_nodes, z, log=True)
+        iz_all, inode_all, w_all = [], [], []
+        for iz, wz in zip(iz_lst, wz_lst):
+            available = np.nonzero(~mask[iz])[0]
+            inode_lst, w_lst = _get_weights(np.array(nodes)[available], value)
+            iz_all.extend([iz]*len(inode_lst))
+            inode_all.extend(available[inode_lst])
+            w_all.extend(wz*w_lst)
+        track = np.tensordot(w_all, cube[iz_all, inode_all], axes=(0, 0))
+        return tuple(track[:, k] for k in range(cube.shape[-1]))
+
     def get_track(self, mass0, z, n=None):
         '''Get an evolution track for given (*M*:sub:`0`, *Z*) by interpolating
         the Geneva evolution track database.
+
+        All the node tracks are resampled to :attr:`track_ngrid` points only
+        once, and cached in `$STELLA_DATA/cache/evolution/Geneva_tracks`.
     
         Args:
             mass0 (float): Initial mass.
@@ -112,83 +218,58 @@ class _Geneva(object):
         Returns:
             tuple: A tuple containing (log\ *T*:sub:`eff`, log\ *L*, age, *M*).
         '''
-        if self._track_data is None:
+        if self._track_cube is None:
             self._load_tracks()
 
-        z_nodes = [0.001, 0.004, 0.008, 0.02, 0.04, 0.1]
-        m_nodes = [0.8, 0.9, 1.0, 1.25, 1.5, 1.7, 2.0, 2.5, 3.0, 4.0, 5.0,
-                   7.0, 9.0, 10.0, 12.0, 15.0, 20.0, 25.0, 40.0, 60.0, 85.0,
-                   120.0]
-        missing_nodes = [(0.001, 10.0), (0.004, 10.0), (0.008, 9.0),
-                         (0.02, 10.0), (0.04, 10.0), (0.1, 10.0), (0.1, 85.0),
-                         (0.1, 120.0)]
-
-        # get param grid
-        param_grid = {}
-        for _z in z_nodes:
-            param_grid[_z] = [_m for _m in m_nodes
-                              if (_z, _m) not in missing_nodes]
-
-        ngrid = 51
-    
-        if z in param_grid:
-            # input z in parameter grid
-            if mass0 in param_grid[z]:
-                # input mass0 in parameter grid
-                trackid = self._get_trackid(z, mass0)
-                track = self._track_data[trackid]
-                if track[0].size != ngrid:
-                    track = interpolate_data(track, n=ngrid)
-            else:
-                # input mass0 NOT in parameter grid. Interpolate over mass0 space
-                im = _get_inodes(param_grid[z], mass0)
-                mass0_lst = param_grid[z][im:im+4]
-                track_lst = []
-                for _mass0 in mass0_lst:
-                    trackid = self._get_trackid(z, _mass0)
-                    track = self._track_data[trackid]
-                    if track[0].size != ngrid:
-                        track = interpolate_data(track, n=ngrid)
-                    track_lst.append(track)
-                track = interpolate_param(track_lst, mass0_lst, mass0)
-        else:
-            # input z Not in parameter grid. Interpolate over log10(z) space
-            iz = _get_inodes(z_nodes, z)
-            z_lst = z_nodes[iz:iz+4]
-            trackz_lst = []
-            for _z in z_lst:
-                if mass0 in param_grid[_z]:
-                    # input mass0 in parameter grid
-                    trackid = self._get_trackid(_z, mass0)
-                    track = self._track_data[trackid]
-                    if track[0].size != ngrid:
-                        track = interpolate_data(track, n=ngrid)
-                else:
-                    # input mass0 NOT in parameter grid. Interpolate over mass0
-                    # space
-                    im = _get_inodes(param_grid[_z], mass0)
-                    mass0_lst = param_grid[_z][im:im+4]
-                    trackm_lst = []
-                    for _mass0 in mass0_lst:
-                        trackid = self._get_trackid(_z, _mass0)
-                        track = self._track_data[trackid]
-                        if track[0].size != ngrid:
-                            track = interpolate_data(track, n=ngrid)
-                        trackm_lst.append(track)
-                    track = interpolate_param(trackm_lst, mass0_lst, mass0)
-                trackz_lst.append(track)
-            track = interpolate_param(trackz_lst, np.log10(z_lst), math.log10(z))
-    
-        if n is not None and n != ngrid:
+        cube, mask = self._track_cube
+        track = self._interpolate_cube(cube, mask, self.m_nodes, mass0, z)
+
+        if n is not None and n != self.track_ngrid:
             # interpolate for given number of points
             return interpolate_data(track, n=n)
         else:
             return track
 
+    def get_tracks(self, mass0, z):
+        '''Get evolution tracks for many pairs of (*M*:sub:`0`, *Z*) at once.
+
+        The interpolation is the same as :meth:`get_track`, but the weights
+        of all pairs are computed at once and applied to the cube of node
+        tracks in one step (see :func:`stella.evolution.base.interpolate_cube`).
+
+        Args:
+            mass0 (float or :class:`numpy.ndarray`): Initial masses.
+            z (float or :class:`numpy.ndarray`): Metal contents.
+        Returns:
+            tuple: A tuple containing (log\ *T*:sub:`eff`, log\ *L*, age, *M*).
+                Each element has a shape of (*N*, :attr:`track_ngrid`).
+        Examples:
+
+            .. code-block:: python
+
+                >>> from stella.evolution.geneva import Geneva
+                >>> logTeff, logL, age, mass = Geneva.get_tracks(
+                ...         [1.0, 1.05, 1.2], [0.02, 0.015, 0.01])
+                >>> logTeff.shape
+                (3, 51)
+
+        '''
+        if self._track_cube is None:
+            self._load_tracks()
+
+        cube, mask = self._track_cube
+        tracks = interpolate_cube(cube, mask, self.z_nodes, self.m_nodes, z,
+                                  mass0, log=True)
+        return tuple(tracks[..., k] for k in range(cube.shape[-1]))
+
     def get_isochrone(self, z, logage, n=None):
         '''Get an isochrone for given (*Z*, age) by interpolating the Geneva
         evolution isochrone database.
 
+        All the node isochrones are resampled to :attr:`isochrone_ngrid`
+        points only once, and cached in
+        `$STELLA_DATA/cache/evolution/Geneva_isochrones`.
+
         Args:
             z (float): Metal content
             logage (float): log\ :sub:`10`\ (age)
@@ -196,66 +277,16 @@ class _Geneva(object):
         Returns:
             tuple: A tuple containing (*M*:sub:`0`, *M*, log\ *T*:sub:`eff`, log\ *L*)
         '''
+        if self._isochrone_cube is None:
+            self._load_isochrones()
+
+        cube, mask = self._isochrone_cube
+        isochrone = self._interpolate_cube(cube, mask, self.a_nodes, logage, z)
 
-        ngrid = 600
-
-        if self._isochrone_data is None:
-            self.load_isochrones()
-
-        z_nodes = [0.001, 0.004, 0.008, 0.02, 0.04, 0.1]
-        a_nodes = [3.00, 5.00, 5.30, 5.59, 5.80, 5.90, 6.00, 6.05, 6.09, 6.15,
-                   6.19, 6.25, 6.30, 6.34, 6.40, 6.44, 6.50, 6.55, 6.59, 6.65,
-                   6.69, 6.75, 6.80, 6.84, 6.90, 6.94, 7.00, 7.05, 7.09, 7.15,
-                   7.19, 7.25, 7.30, 7.34, 7.40, 7.44, 7.50, 7.55, 7.59, 7.65,
-                   7.69, 7.75, 7.80, 7.84, 7.90, 7.94, 8.00, 8.05, 8.10, 8.14,
-                   8.19, 8.25, 8.30, 8.35, 8.39, 8.44, 8.50, 8.55, 8.60, 8.64,
-                   8.69, 8.75, 8.80, 8.85, 8.89, 8.94, 9.00, 9.05, 9.10, 9.14,
-                   9.19, 9.25, 9.30, 9.35, 9.39, 9.44, 9.50, 9.55, 9.60, 9.64,
-                   9.69, 9.75, 9.80, 9.85, 9.89, 9.94, 10.00, 10.05, 10.10,
-                   10.14, 10.19]
-
-        if z in z_nodes:
-            if logage in a_nodes:
-                isochroneid = self._get_isochroneid(z, logage)
-                isochrone = self._isochrone_data[isochroneid]
-                if isochrone[0].size != ngrid:
-                    isochrone = interpolate_data(isochrone, n=ngrid)
-            else:
-                ia = _get_inodes(a_nodes, logage)
-                logage_lst = a_nodes[ia:ia+4]
-                isochrone_lst = []
-                for _logage in logage_lst:
-                    isochroneid = self._get_isochroneid(z, _logage)
-                    isochrone = self._isochrone_data[isochroneid]
-                    if isochrone[0].size != ngrid:
-                        isochrone = interpolate_data(isochrone, n=ngrid)
-                    isochrone_lst.append(isochrone)
-                isochrone = interpolate_param(isochrone_lst, logage_lst, logage)
+        if n is not None and n != self.isochrone_ngrid:
+            return interpolate_data(isochrone, n=n)
         else:
-            iz = _get_inodes(z_nodes, z)
-            z_lst = z_nodes[iz:iz+4]
-            isochronez_lst = []
-            for _z in z_lst:
-                if logage in a_nodes:
-                    isochroneid = self._get_isochroneid(_z, logage)
-                    isochrone = self._isochrone_data[isochroneid]
-                    if isochrone[0].size != ngrid:
-                        isochrone = interpolate_data(isochrone, n=ngrid)
-                else:
-                    ia = _get_inodes(a_nodes, logage)
-                    logage_lst = a_nodes[ia:ia+4]
-                    isochroneage_lst = []
-                    for _logage in logage_lst:
-                        isochroneid = self._get_isochroneid(_z, _logage)
-                        isochrone = self._isochrone_data[isochroneid]
-                        if isochrone[0].size != ngrid:
-                            isochrone = interpolate_data(isochrone, n=ngrid)
-                        isochroneage_lst.append(isochrone)
-                    isochronez = interpolate_param(isochroneage_lst, logage_lst, logage)
-                isochronez_lst.append(isochronez)
-            isochrone = interepolate_param(isochronez_lst, np.log10(z_lst), math.log10(z))
-
-        return isochrone
+            return isochrone
 
 Geneva = _Geneva()
 
@@ -275,3 +306,25 @@ def _get_inodes(nodes, value):
     i = min(i, len(nodes)-4)
     return i
 
+def _get_weights(nodes, value, log=False):
+    '''Get the nodes and weights of the 4-points interpolation.
+
+    Args:
+        nodes (list): Input node list
+        value (intger or float): Input value
+        log (bool): Interpolate in log\ :sub:`10` space if *True*
+    Returns:
+        tuple: A tuple of (`indices`, `weights`). Only one node with weight 1
+            is returned if `value` is one of the nodes.
+    '''
+    nodes = np.asarray(nodes, dtype=np.float64)
+    match = np.nonzero(nodes == value)[0]
+    if match.size > 0:
+        return match[0:1], np.ones(1)
+    i = _get_inodes(nodes, value)
+    ax = nodes[i:i+4]
+    if log:
+        weights = lagrange_weights(np.log10(ax), math.log10(value))
+    else:
+        weights = lagrange_weights(ax, value)
+    return np.arange(i, i+len(ax)), weights
@@ -2,8 +2,10 @@ import os
 import math
 import numpy as np
 import astropy.io.fits as fits
+from scipy.sparse import csr_matrix
 
-from .base import interpolate_data, interpolate_param
+from .base import interpolate_data, interpolate_param, _get_node_weights
+from ..utils.interpolation import lagrange_weights
 
 class _Y2(object):
     '''
@@ -51,6 +53,7 @@ class _Y2(object):
     def __init__(self):
         self._track_data     = {}
         self._isochrone_data = {}
+        self._track_cube     = None
 
     def get_track(self, mass, z, alpha=0.0, n=150):
         '''Get evolution track for given *M*, *Z*, and α ehancement.
@@ -132,15 +135,7 @@ class _Y2(object):
         if z not in self._z_nodes:
             raise ValueError
 
-        if (z, alpha) in self._bad_nodes:
-            mass_nodes = [m for m in self._mass_nodes
-                            if m not in self._bad_nodes[(z, alpha)]]
-        elif abs(alpha - 0.6)<1e-3:
-            # tracks of alpha=0.6, mass=4.2 are missed.
-            mass_nodes = [m for m in self._mass_nodes
-                            if abs(m-4.2)>1e-3]
-        else:
-            mass_nodes = self._mass_nodes
+        mass_nodes = self._get_mass_nodes(z, alpha)
 
         if mass in mass_nodes:
             track = self._get_track_of_mass(mass, z, alpha)
@@ -154,6 +149,127 @@ class _Y2(object):
             track = interpolate_param(track_lst, m_lst, mass)
         return track
 
+    def _get_mass_nodes(self, z, alpha):
+        '''Get the mass nodes that can be used for interpolation for given
+        *Z* and alpha in grid nodes.
+
+        Args:
+            z (float): Metal component.
+            alpha (float): α ehancement.
+        Returns:
+            list: Mass nodes, without the nodes in `_bad_nodes` and
+                `_missing_nodes`.
+        '''
+        if (z, alpha) in self._bad_nodes:
+            mass_nodes = [m for m in self._mass_nodes
+                            if m not in self._bad_nodes[(z, alpha)]]
+        elif abs(alpha - 0.6)<1e-3:
+            # tracks of alpha=0.6, mass=4.2 are missed.
+            mass_nodes = [m for m in self._mass_nodes
+                            if abs(m-4.2)>1e-3]
+        else:
+            mass_nodes = self._mass_nodes
+        return [m for m in mass_nodes
+                if (m, z, alpha) not in self._missing_nodes]
+
+    def _load_track_cube(self):
+        '''Load all Y2 tracks into a dense cube.
+
+        The cube has a shape of (*n*:sub:`M`, *n*:sub:`Z`, *n*:sub:`α`,
+        *n*:sub:`grid`, 4), and the tracks missing in the data file are
+        filled with NaN. The indices of usable mass nodes (see
+        :meth:`_get_mass_nodes`) are saved for each pair of (*Z*, α) nodes.
+        '''
+        if len(self._track_data) == 0:
+            self._load_all_tracks()
+
+        nm, nz, na = (len(self._mass_nodes), len(self._z_nodes),
+                      len(self._alpha_nodes))
+        cube = np.full((nm, nz, na, self._ngrid, 4), np.nan)
+        mass_index = {}
+        for iz, _z in enumerate(self._z_nodes):
+            for ia, _alpha in enumerate(self._alpha_nodes):
+                for im, _m in enumerate(self._mass_nodes):
+                    trackid = self._get_trackid(_m, _z, _alpha)
+                    if trackid in self._track_data:
+                        cube[im, iz, ia] = np.array(self._track_data[trackid]).T
+                mass_index[(iz, ia)] = np.array([self._mass_nodes.index(m)
+                                for m in self._get_mass_nodes(_z, _alpha)])
+        self._track_cube = (cube, mass_index)
+
+    def get_tracks(self, mass, z, alpha=0.0):
+        '''Get evolution tracks for many stars at once.
+
+        The interpolation is the same as :meth:`get_track`: 4-point
+        interpolation over *M* and log\ :sub:`10`\ (*Z*), and quadratic
+        interpolation over α. Node indices and weights of all stars are
+        computed at once, and the node tracks are gathered from a dense cube
+        loaded once per process and combined with a sparse weight matrix.
+
+        Args:
+            mass (float or :class:`numpy.ndarray`): Stellar masses.
+            z (float or :class:`numpy.ndarray`): Metal components.
+            alpha (float or :class:`numpy.ndarray`): α ehancements.
+        Returns:
+            tuple: A tuple containing (log\ *T*:sub:`eff`, log\ *L*, age, log\
+                *g*). Each element has a shape of (*N*, *n*:sub:`grid`), where
+                *N* is the number of stars. Tracks depending on nodes missing
+                in the data file are filled with NaN.
+        Examples:
+
+            .. code-block:: python
+
+                >>> from stella.evolution import Y2
+                >>> logTeff, logL, age, logg = Y2.get_tracks(
+                ...         [1.0, 1.05, 1.2], [0.02, 0.015, 0.01])
+                >>> logTeff.shape
+                (3, 150)
+
+        '''
+        if self._track_cube is None:
+            self._load_track_cube()
+        cube, mass_index = self._track_cube
+
+        mass, z, alpha = np.broadcast_arrays(
+                np.atleast_1d(np.asarray(mass,  dtype=np.float64)),
+                np.atleast_1d(np.asarray(z,     dtype=np.float64)),
+                np.atleast_1d(np.asarray(alpha, dtype=np.float64)))
+        nstar = mass.size
+        nm, nz, na = cube.shape[0:3]
+
+        # indices and weights of alpha nodes with shape (N, na), and of Z
+        # nodes with shape (N, 4)
+        ia, wa = _get_node_weights(self._alpha_nodes, alpha)
+        iz, wz = _get_node_weights(self._z_nodes, z, log=True)
+
+        # indices and weights of mass nodes for each pair of (Z, alpha) nodes
+        # with shape (N, na, 4, 4)
+        shape = (nstar, ia.shape[1], iz.shape[1])
+        pz = np.broadcast_to(iz[:, np.newaxis, :], shape)
+        pa = np.broadcast_to(ia[:, :, np.newaxis], shape)
+        pm = np.broadcast_to(mass[:, np.newaxis, np.newaxis], shape)
+        im = np.zeros(shape+(4,), dtype=np.int64)
+        wm = np.zeros(shape+(4,))
+        for (_iz, _ia), index in mass_index.items():
+            m = (pz == _iz) & (pa == _ia)
+            if not m.any():
+                continue
+            k, w = _get_node_weights(np.array(self._mass_nodes)[index], pm[m])
+            im[m] = index[k]
+            wm[m] = w
+
+        weights = wa[:, :, np.newaxis, np.newaxis] * \
+                  wz[:, np.newaxis, :, np.newaxis] * wm
+        columns = (im*nz + pz[..., np.newaxis])*na + pa[..., np.newaxis]
+        rows = np.broadcast_to(np.arange(nstar)[:, np.newaxis, np.newaxis,
+                                                np.newaxis], weights.shape)
+        keep = weights != 0
+        matrix = csr_matrix((weights[keep], (rows[keep], columns[keep])),
+                            shape=(nstar, nm*nz*na))
+        tracks = matrix.dot(cube.reshape(nm*nz*na, -1))
+        tracks = tracks.reshape(nstar, self._ngrid, 4)
+        return tuple(tracks[..., k] for k in range(4))
+
     def _get_track_of_mass(self, mass, z, alpha):
         '''Get evolution track for given *M*, *Z*, and alpha, of which *M* must
         be a value in grid nodes.
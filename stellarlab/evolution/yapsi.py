@@ -1,9 +1,27 @@
 import os
+import threading
 import numpy as np
 import astropy.io.fits as fits
+from concurrent.futures import ThreadPoolExecutor
 
-from .base import interpolate_data, interpolate_param
+from .base import interpolate_data, interpolate_param, interpolate_cube
 from ..utils.download import get_file
+from ..utils.memoize import memoized
+from ..utils.interpolation import lagrange_weights
+
+@memoized(maxsize=512, filearg='filename')
+def _read_track(filename):
+    '''Read a track from its binary `.npy` file.
+
+    Args:
+        filename (str): Name of the `.npy` file.
+    Returns:
+        tuple: A tuple containing five arrays (log\ *T*:sub:`eff`,
+            log\ *L*, age, log\ *g*, log\ *R*).
+    '''
+    data = np.load(filename)
+    logTeff_lst, logL_lst, age_lst, logg_lst, logR_lst = data.T
+    return (logTeff_lst, logL_lst, age_lst, logg_lst, logR_lst)
 
 class _YaPSI(object):
     '''YaPSI stellar evolution tracks.
@@ -36,7 +54,8 @@ class _YaPSI(object):
     _amlt1, _amlt2 = 1.82126, 1.91804
 
     def __init__(self):
-        self._track_data = {}
+        # cube of node tracks of the last (Y, n) used by get_tracks
+        self._track_cube = None
 
     def _load_tracks(self):
         '''Read evoution tracks.
@@ -96,6 +115,70 @@ class _YaPSI(object):
 
         return track
         
+    def _load_track_cube(self, y, n):
+        '''Load the node tracks of given *Y* into a dense cube. All tracks are
+        read from their binary form (see :meth:`_load_track`) and resampled
+        to `n` points. If *Y* is not a node, the cubes of the 4 nearest *Y*
+        nodes are interpolated.
+
+        Args:
+            y (float): Helium content (*Y*).
+            n (int): Number of points of each track.
+        Returns:
+            :class:`numpy.ndarray`: Cube with shape (*n*:sub:`[Fe/H]`,
+                *n*:sub:`M`, `n`, 5).
+        '''
+        if y in self._y_nodes:
+            y_lst, wy_lst = [y], [1.0]
+        else:
+            iy = self._get_inodes(self._y_nodes, y)
+            y_lst = self._y_nodes[iy:iy+4]
+            wy_lst = lagrange_weights(y_lst, y)
+
+        cube = np.zeros((len(self._feh_nodes), self._mass_nodes.size, n, 5))
+        for _y, wy in zip(y_lst, wy_lst):
+            for ifeh, _feh in enumerate(self._feh_nodes):
+                for imass, _mass in enumerate(self._mass_nodes):
+                    amlt = self._get_amlt(_mass)
+                    track = interpolate_data(
+                            self._load_track(_y, _feh, _mass, amlt), n)
+                    cube[ifeh, imass] += wy*np.array(track).T
+        return cube
+
+    def get_tracks(self, y, feh, mass, n=150):
+        '''Get evolution tracks for many pairs of ([Fe/H], *M*) at once.
+
+        The interpolation is the same as :meth:`get_track`. The node tracks
+        of given *Y* are loaded into a cube once, and the weights of all pairs
+        are applied to the cube in one step (see
+        :func:`stella.evolution.base.interpolate_cube`).
+
+        Args:
+            y (float): Helium content (*Y*).
+            feh (float or :class:`numpy.ndarray`): Metallicities.
+            mass (float or :class:`numpy.ndarray`): Stellar masses.
+            n (int): Number of points in each track.
+        Returns:
+            tuple: A tuple containing (log\ *T*:sub:`eff`, log\ *L*, age,
+                log\ *g*, log\ *R*). Each element has a shape of (*N*, `n`).
+        Examples:
+
+            .. code-block:: python
+
+                >>> from stella.evolution import YaPSI
+                >>> logTeff, logL, age, logg, logR = YaPSI.get_tracks(
+                ...         0.28, [0.0, -0.2], [1.0, 1.1])
+                >>> logTeff.shape
+                (2, 150)
+
+        '''
+        if self._track_cube is None or self._track_cube[0] != (y, n):
+            self._track_cube = ((y, n), self._load_track_cube(y, n))
+        cube = self._track_cube[1]
+        tracks = interpolate_cube(cube, None, self._feh_nodes,
+                                  self._mass_nodes, feh, mass)
+        return tuple(tracks[..., k] for k in range(cube.shape[-1]))
+
     def _get_inodes(self, nodes, value):
         '''Get the begining index of the 4-points interpolation.
 
@@ -111,20 +194,26 @@ class _YaPSI(object):
         i = min(i, len(nodes)-4)
         return i
 
-    def _load_track(self, y, feh, mass, amlt):
+    def _get_amlt(self, mass):
+        '''Get the mixing length of the track of given mass.
+
+        Args:
+            mass (float): Stellar mass.
+        Returns:
+            float: Mixing length.
         '''
-        Load the track of given *y* and *feh* values and pack it into the cache.
+        return self._amlt2 if mass<=1.1 else self._amlt1
+
+    def _get_track_path(self, y, feh, mass, amlt):
+        '''Get the path of a track file relative to the data cache.
 
         Args:
             y (float): Helium content (*Y*).
             feh (float): Metallicity ([Fe/H]).
             mass (float): Stellar mass (*M*).
             amlt (float): Mixing-length (*alpha*).
-
-        Notes:
-            The track data is a tuple containing four arrays
-            (log\ *T*:sub:`eff`, log\ *L*, age, log\ *g*).
-
+        Returns:
+            str: Path of the `.trk` file.
         '''
         iy   = self._y_nodes.index(y)
         ifeh = self._feh_nodes.index(feh)
@@ -134,34 +223,122 @@ class _YaPSI(object):
         folder = 'X{:8.6f}_Z{:8.6f}'.format(x, z).replace('.','p')
         fname = 'M{:4.2f}_X{:8.6f}_Z{:8.6f}_A{:7.5f}'.format(
                 mass, x, z, amlt).replace('.', 'p')+'.trk'
-        filepath = os.path.join(data_path, folder, fname)
-        filename = get_file(filepath)
-
-        # load data
-        data = []
-        file1 = open(filename)
-        for row in file1:
-            if row[0]=='#':
-                continue
-            col = row.split()
-            age     = float(col[2])
-            logL    = float(col[6])
-            logR    = float(col[7])
-            logg    = float(col[8])
-            logTeff = float(col[9])
-            item = (logTeff, logL, age, logR, logg)
-            data.append(item)
-        file1.close()
-
-        # repack parameters
-        logTeff_lst = np.array([row[0] for row in data])
-        logL_lst    = np.array([row[1] for row in data])
-        age_lst     = np.array([row[2] for row in data])
-        logR_lst    = np.array([row[3] for row in data])
-        logg_lst    = np.array([row[4] for row in data])
-
-        track = (logTeff_lst, logL_lst, age_lst, logg_lst, logR_lst)
-        return track
+        return os.path.join(data_path, folder, fname)
+
+    def _read_trk(self, filename):
+        '''Parse a YaPSI `.trk` text file.
+
+        Args:
+            filename (str): Name of the `.trk` file.
+        Returns:
+            :class:`numpy.ndarray`: Array with shape (*n*, 5) containing the
+                columns (log\ *T*:sub:`eff`, log\ *L*, age, log\ *g*,
+                log\ *R*).
+        '''
+        return np.loadtxt(filename, comments='#', usecols=(9, 6, 2, 8, 7),
+                          ndmin=2, dtype=np.float64)
+
+    def _convert_track(self, y, feh, mass, amlt, show_progress=True):
+        '''Convert a track file to the binary form if it has not been
+        converted. The `.trk` file is downloaded if needed, and the binary
+        `.npy` file is saved next to it in the `~/.stellarlab` cache.
+
+        Args:
+            y (float): Helium content (*Y*).
+            feh (float): Metallicity ([Fe/H]).
+            mass (float): Stellar mass (*M*).
+            amlt (float): Mixing-length (*alpha*).
+            show_progress (bool): Display a progress bar when downloading.
+        Returns:
+            str: Name of the `.npy` file.
+        '''
+        filepath = self._get_track_path(y, feh, mass, amlt)
+        npyfile = os.path.join(os.path.expanduser('~'), '.stellarlab',
+                               filepath[:-4]+'.npy')
+        if os.path.exists(npyfile):
+            return npyfile
+
+        filename = get_file(filepath, show_progress=show_progress)
+        data = self._read_trk(filename)
+
+        # write a temporary file first, so that readers in other threads or
+        # processes never see a partially written file
+        tmpfile = '{}.{}.{}.tmp'.format(npyfile, os.getpid(),
+                                        threading.get_ident())
+        with open(tmpfile, 'wb') as f:
+            np.save(f, data)
+        os.replace(tmpfile, npyfile)
+        return npyfile
+
+    def _load_track(self, y, feh, mass, amlt):
+        '''
+        Load the track of given *y* and *feh* values. Tracks are read from
+        their binary form (see :meth:`_convert_track`), and loaded tracks are
+        kept in an LRU cache keyed on the file name.
+
+        Args:
+            y (float): Helium content (*Y*).
+            feh (float): Metallicity ([Fe/H]).
+            mass (float): Stellar mass (*M*).
+            amlt (float): Mixing-length (*alpha*).
+
+        Notes:
+            The track data is a tuple containing five arrays
+            (log\ *T*:sub:`eff`, log\ *L*, age, log\ *g*, log\ *R*).
+
+        '''
+        return _read_track(self._convert_track(y, feh, mass, amlt))
+
+    def prefetch(self, y_nodes=None, feh_nodes=None, mass_range=None,
+            max_workers=8):
+        '''Download and convert the track files of given nodes in parallel.
+
+        Args:
+            y_nodes (list): Helium contents in :attr:`_y_nodes`. All nodes are
+                used if *None*.
+            feh_nodes (list): Metallicities in :attr:`_feh_nodes`. All nodes
+                are used if *None*.
+            mass_range (tuple): A tuple of (`mass1`, `mass2`). Only the mass
+                nodes within this range are used. All nodes are used if
+                *None*.
+            max_workers (int): Number of threads.
+        Returns:
+            list: Names of the converted `.npy` files.
+        Examples:
+
+            .. code-block:: python
+
+                >>> from stella.evolution import YaPSI
+                >>> files = YaPSI.prefetch(feh_nodes=[-0.5, 0.0],
+                ...                        mass_range=(0.8, 1.2))
+
+        '''
+        if y_nodes is None:
+            y_nodes = self._y_nodes
+        if feh_nodes is None:
+            feh_nodes = self._feh_nodes
+        for y in y_nodes:
+            if y not in self._y_nodes:
+                print('Error: Y = {} not in y_nodes'.format(y))
+                raise ValueError
+        for feh in feh_nodes:
+            if feh not in self._feh_nodes:
+                print('Error: [Fe/H] = {} not in feh_nodes'.format(feh))
+                raise ValueError
+
+        mass_lst = self._mass_nodes
+        if mass_range is not None:
+            mass1, mass2 = mass_range
+            mass_lst = mass_lst[(mass_lst > mass1-1e-3)&(mass_lst < mass2+1e-3)]
+
+        tasks = [(y, feh, mass, self._get_amlt(mass))
+                 for y in y_nodes for feh in feh_nodes for mass in mass_lst]
+
+        def convert(task):
+            return self._convert_track(*task, show_progress=False)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(convert, tasks))
 
     def _get_track_of_mass(self, y, feh, mass, n=0, minage=0):
         if y not in self._y_nodes:
@@ -174,13 +351,8 @@ class _YaPSI(object):
         # check if input mass is in mass nodes
         m = np.abs(self._mass_nodes - mass)<1e-3
         if m.sum()>0:
-            amlt = (self._amlt1, self._amlt2)[mass<=1.1]
-            trackid = self._get_trackid(y, feh, mass, amlt)
-            if trackid in self._track_data:
-                track = self._track_data[trackid]
-            else:
-                track = self._load_track(y, feh, mass, amlt)
-                self._track_data[trackid] = track
+            amlt = self._get_amlt(mass)
+            track = self._load_track(y, feh, mass, amlt)
 
             if minage!=0:
                 m = track[2] > minage
@@ -193,14 +365,8 @@ class _YaPSI(object):
             imass = self._get_inodes(self._mass_nodes, mass)
             mass_lst = self._mass_nodes[imass:imass+4]
             for _mass in mass_lst:
-                amlt = (self._amlt1, self._amlt2)[_mass<=1.1]
-
-                trackid = self._get_trackid(y, feh, _mass, amlt)
-                if trackid in self._track_data:
-                    track = self._track_data[trackid]
-                else:
-                    track = self._load_track(y, feh, _mass, amlt)
-                    self._track_data[trackid] = track
+                amlt = self._get_amlt(_mass)
+                track = self._load_track(y, feh, _mass, amlt)
 
                 if minage!=0:
                     m = track[2] > minage
@@ -4,6 +4,14 @@ import math
 import numpy as np
 import astropy.io.fits as fits
 from scipy.interpolate import RectBivariateSpline
+from ..utils.memoize import memoized
+
+@memoized(maxsize=2)
+def _read_dust_map(filename):
+    """Read the data and header of a dust map file. The results are cached,
+    so that the map is read only once per process.
+    """
+    return fits.getdata(filename, header=True)
 
 class SFDMapClass(object):
     """Galactic dust map of `Schlegel+ 1998
@@ -31,7 +39,7 @@ class SFDMapClass(object):
         """
         filename = os.path.join(os.getenv('STELLA_DATA'),
                     'extinction/SFD_dust_4096_%sgp.fits'%key)
-        self.data[key], self.head[key] = fits.getdata(filename, header=True)
+        self.data[key], self.head[key] = _read_dust_map(filename)
 
     def get_EBV(self, l, b):
         """get *E(B-V)* from the SFD dust map.
@@ -2,7 +2,7 @@ import math
 import numpy as np
 import numpy.polynomial as poly
 
-from .errors import ColorIndexError, ParamRangeError, MissingParamError
+from .error import ColorIndexError, ParamRangeError, MissingParamError
 
 def get_BC(**kwargs):
     """Get bolometric correction (BC) using a variety of calibration relations.
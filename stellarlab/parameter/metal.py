@@ -36,7 +36,7 @@ def feh_to_z(feh, alpha=0.0):
              0.047000, 0.106471, 0.177489]
             ])
     val = z0.reshape(-1)
-    return griddata(coor,val,(FeH,alpha),method='cubic')
+    return griddata(coor,val,(feh,alpha),method='cubic')
 
 
 
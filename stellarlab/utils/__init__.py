@@ -4,4 +4,5 @@ from . import fitsio
 from . import onedarray
 from . import interpolation
 from . import memoize
+from . import npycache
 from . import vision
@@ -1,5 +1,12 @@
 from __future__ import print_function
+import os
 import time
+import mmap
+import bisect
+import pickle
+import numpy as np
+
+from .memoize import memoized
 
 def find_sortedfile(target, filename, findfunc=None, outfunc=None, header=0,
         verbose=False):
@@ -33,6 +40,67 @@ def find_sortedfile(target, filename, findfunc=None, outfunc=None, header=0,
     else:
         return None
 
+def find_sortedfile_many(targets, filename, findfunc, outfunc, header=0,
+        verbose=False, bufsize=1048576):
+    """Find a list of values in a sorted ascii file in one pass.
+
+    The targets are sorted and merged with the lines of file, which is read
+    only once from the beginning with buffered reads. This is much faster than
+    calling :func:`find_sortedfile` for each target when the list is long.
+
+    Args:
+        targets (list): Values to be found.
+        filename (str): Name of the sorted ascii file.
+        findfunc (callable): Function returning the key of a line.
+        outfunc (callable): Function applied to the matched lines.
+        header (int): Number of bytes before the first line of data.
+        verbose (bool): Print the number of lines read and the time used.
+        bufsize (int): Size of the read buffer in bytes.
+    Returns:
+        list: Results of `outfunc` in the order of `targets`, or *None* for
+            values not found. The first matched line is used if a value
+            appears in more than one line.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> from stella.utils.asciifile import find_sortedfile_many
+            >>> find_sortedfile_many([10700, 1, 48915], 'HD-HIP.csv',
+            ...         findfunc=lambda row: int(row.split(',')[0]),
+            ...         outfunc=lambda row: int(row.split(',')[1]))
+            [8102, None, 32349]
+
+    """
+    if verbose:
+        t1 = time.time()
+    targets = list(targets)
+    results = [None]*len(targets)
+    order = sorted(range(len(targets)), key=targets.__getitem__)
+
+    count = 0
+    k = 0
+    infile = open(filename, buffering=bufsize)
+    infile.seek(header,0)
+    for row in infile:
+        if k >= len(order):
+            break
+        count += 1
+        info = findfunc(row)
+        # skip the targets smaller than this row
+        while k < len(order) and targets[order[k]] < info:
+            k += 1
+        # a target may appear more than once in the list
+        while k < len(order) and targets[order[k]] == info:
+            results[order[k]] = outfunc(row)
+            k += 1
+    infile.close()
+
+    if verbose:
+        t2 = time.time()
+        print('%10d readings, %10.3f msec'%(count, (t2-t1)*1000))
+    return results
+
 def quickfind_sortedfile(target, filename, findfunc=None, outfunc=None,
         header=0, verbose=False):
     """
@@ -88,3 +156,237 @@ def quickfind_sortedfile(target, filename, findfunc=None, outfunc=None,
                 print('%10d readings, %10.3f msec'%(count, (t2-t1)*1000))
             return outfunc(row)
     return None
+
+class _SortedFileIndex(object):
+    """Sparse block index of a sorted text file.
+
+    The byte offset and the key of every `step`-th line are kept in memory
+    and saved in a sidecar file `<filename>.idx`. A lookup searches the keys
+    by bisection, and then reads the lines of one block from the
+    memory-mapped file. Lines can have any lengths.
+
+    The keys are pickled in their native types. The sidecar is rebuilt if the
+    size or modification time of the file, `header`, `step` or `keyname`
+    changes.
+
+    Args:
+        filename (str): Name of the sorted text file.
+        keyname (str): Name of the key function, e.g. *"HD"*. Indices built
+            with different key functions must have different names.
+        header (int): Number of bytes before the first line of data.
+        step (int): Number of lines in each block.
+    """
+
+    # version of the sidecar format
+    version = 1
+
+    def __init__(self, filename, keyname, header=0, step=256):
+        self.filename  = filename
+        self.keyname   = keyname
+        self.header    = header
+        self.step      = step
+        self.indexfile = filename + '.idx'
+        self.offsets   = None
+        self.keys      = None
+        self._stamp    = None
+
+    def _get_meta(self, stamp):
+        """Get the properties that a valid sidecar must have."""
+        return {'version': self.version, 'stamp': stamp,
+                'header': self.header, 'step': self.step,
+                'keyname': self.keyname}
+
+    def _load(self, findfunc):
+        """Load the sidecar index, or build it if it does not exist or is out
+        of date.
+
+        Args:
+            findfunc (callable): Function returning the key of a line.
+        """
+        st = os.stat(self.filename)
+        stamp = (st.st_size, st.st_mtime_ns)
+        if self._stamp == stamp:
+            return
+
+        meta = self._get_meta(stamp)
+        if os.path.exists(self.indexfile):
+            try:
+                with open(self.indexfile, 'rb') as f:
+                    data = pickle.load(f)
+            except Exception:
+                data = None
+            if isinstance(data, dict) and data.get('meta') == meta:
+                self.offsets = data['offsets']
+                self.keys    = data['keys']
+                self._stamp  = stamp
+                return
+
+        self.build(findfunc)
+        try:
+            tmpfile = '%s.%d.tmp'%(self.indexfile, os.getpid())
+            with open(tmpfile, 'wb') as f:
+                pickle.dump({'meta': meta, 'offsets': self.offsets,
+                             'keys': self.keys}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpfile, self.indexfile)
+        except (IOError, OSError):
+            # the index is still usable in memory
+            pass
+        self._stamp = stamp
+
+    def build(self, findfunc):
+        """Scan the file and record the offset and key of every `step`-th
+        line.
+
+        Args:
+            findfunc (callable): Function returning the key of a line.
+        """
+        offsets, keys = [], []
+        infile = open(self.filename, 'rb')
+        infile.seek(self.header, 0)
+        pos = self.header
+        for i, row in enumerate(infile):
+            if i % self.step == 0:
+                offsets.append(pos)
+                keys.append(findfunc(row.decode()))
+            pos += len(row)
+        infile.close()
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.keys    = keys
+
+    def _iter_rows(self, mm, pos):
+        """Iterate the lines of a memory-mapped file from an offset.
+
+        Yields:
+            tuple: (`pos`, `row`), where `pos` is the offset of the line.
+        """
+        size = len(mm)
+        while pos < size:
+            end = mm.find(b'\n', pos)
+            end = size if end < 0 else end + 1
+            yield pos, mm[pos:end].decode()
+            pos = end
+
+    def find_many(self, targets, findfunc, outfunc):
+        """Find a list of values in the file in one pass.
+
+        Args:
+            targets (list): Values to be found, in any order.
+            findfunc (callable): Function returning the key of a line.
+            outfunc (callable): Function applied to the matched lines.
+        Returns:
+            list: Results of `outfunc` in the order of `targets`, or *None*
+                for values not found. The first matched line is used if a
+                value appears in more than one line.
+        """
+        self._load(findfunc)
+        results = [None]*len(targets)
+        if len(self.offsets) == 0 or len(targets) == 0:
+            return results
+
+        order = sorted(range(len(targets)), key=targets.__getitem__)
+        infile = open(self.filename, 'rb')
+        mm = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            # offset, key and content of the first line not yet known to be
+            # smaller than the current target
+            pos, key, row = int(self.offsets[0]), None, None
+            for i in order:
+                target = targets[i]
+                # jump forward to the block which may contain the target.
+                # bisect_left makes sure that the first of duplicated lines
+                # is found
+                iblock = max(bisect.bisect_left(self.keys, target) - 1, 0)
+                if self.offsets[iblock] > pos:
+                    pos, key = int(self.offsets[iblock]), None
+                if key is None or key < target:
+                    for pos, row in self._iter_rows(mm, pos):
+                        key = findfunc(row)
+                        if not key < target:
+                            break
+                    else:
+                        # reached the end of file. the remaining targets are
+                        # all larger than the last line
+                        break
+                if key == target:
+                    results[i] = outfunc(row)
+        finally:
+            mm.close()
+            infile.close()
+        return results
+
+@memoized(maxsize=16)
+def _get_sorted_file_index(filename, keyname, header, step):
+    """Get the index of a sorted file. The most recently used indices are
+    kept in memory.
+
+    Args:
+        filename (str): Absolute path of the sorted text file.
+        keyname (str): Name of the key function.
+        header (int): Number of bytes before the first line of data.
+        step (int): Number of lines in each block.
+    Returns:
+        :class:`_SortedFileIndex`: Index of the file.
+    """
+    return _SortedFileIndex(filename, keyname, header=header, step=step)
+
+def indexfind_sortedfile(target, filename, findfunc, outfunc, keyname,
+        header=0, step=256):
+    """Find a value in a sorted ascii file using a sparse block index.
+
+    Unlike :func:`quickfind_sortedfile`, the lines can have any lengths. The
+    byte offset and key of every `step`-th line are saved in a sidecar file
+    `<filename>.idx` when the file is searched for the first time, and the
+    sidecar is rebuilt if the file is changed.
+
+    Args:
+        target: Value to be found.
+        filename (str): Name of the sorted ascii file.
+        findfunc (callable): Function returning the key of a line.
+        outfunc (callable): Function applied to the matched line.
+        keyname (str): Name of `findfunc`, stored in the sidecar. Indices of
+            the same file built with different key functions must have
+            different names.
+        header (int): Number of bytes before the first line of data.
+        step (int): Number of lines in each block of the index.
+    Returns:
+        Result of `outfunc`, or *None* if `target` is not found.
+
+    Examples:
+
+        .. code-block:: python
+
+            >>> from stella.utils.asciifile import indexfind_sortedfile
+            >>> indexfind_sortedfile(10700, 'HD-HIP.csv',
+            ...         findfunc=lambda row: int(row.split(',')[0]),
+            ...         outfunc=lambda row: int(row.split(',')[1]),
+            ...         keyname='HD')
+            8102
+
+    """
+    return indexfind_sortedfile_many([target], filename, findfunc, outfunc,
+                                     keyname, header=header, step=step)[0]
+
+def indexfind_sortedfile_many(targets, filename, findfunc, outfunc, keyname,
+        header=0, step=256):
+    """Find a list of values in a sorted ascii file using a sparse block
+    index.
+
+    The targets are sorted and searched in one pass over the blocks of the
+    file. See :func:`indexfind_sortedfile`.
+
+    Args:
+        targets (list): Values to be found.
+        filename (str): Name of the sorted ascii file.
+        findfunc (callable): Function returning the key of a line.
+        outfunc (callable): Function applied to the matched lines.
+        keyname (str): Name of `findfunc`, stored in the sidecar.
+        header (int): Number of bytes before the first line of data.
+        step (int): Number of lines in each block of the index.
+    Returns:
+        list: Results of `outfunc` in the order of `targets`, or *None* for
+            values not found.
+    """
+    index = _get_sorted_file_index(os.path.abspath(filename), keyname,
+                                   header, step)
+    return index.find_many(list(targets), findfunc, outfunc)
@@ -1,7 +1,8 @@
 import os
 import sys
 import time
-import urllib
+import threading
+import urllib.request
 
 def get_human_readable_size(byte):
     unit = 'B'
@@ -47,7 +48,12 @@ def download_file(url, filename, show_progress=True):
     """
     dirname = os.path.dirname(filename)
     if not os.path.exists(dirname):
-        os.makedirs(dirname)
+        os.makedirs(dirname, exist_ok=True)
+
+    # download to a temporary file, so that an interrupted download, or a
+    # download running in another thread, never leaves a partial file
+    tmpfile = '{}.{}.{}.part'.format(filename, os.getpid(),
+                                     threading.get_ident())
 
     url = url.replace('+','%2B')
 
@@ -87,11 +93,12 @@ def download_file(url, filename, show_progress=True):
 
     param = [time.time(), 0]
     if show_progress:
-        urllib.request.urlretrieve(url, filename, callback)
+        urllib.request.urlretrieve(url, tmpfile, callback)
         # use light green color
         print('\033[92m Completed\033[0m')
     else:
-        urllib.request.urlretrieve(url, filename)
+        urllib.request.urlretrieve(url, tmpfile)
+    os.replace(tmpfile, filename)
 
 def get_cloud_url():
     tz = time.timezone//3600
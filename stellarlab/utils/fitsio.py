@@ -47,7 +47,7 @@ def tform_to_dtype(tform):
     if tform == 'Q': return '?' # 16 bytes, 64 bits array descriptor
     if tform[-1] == 'A': return 'S'+tform[0:-1] # 1 bytes, character
 
-@memoized
+@memoized(maxsize=256, filearg='filename')
 def get_bintable_info(filename, extension=1):
     """Return the information of the binary table in a given FITS file.
 
@@ -118,3 +118,29 @@ def get_bintable_info(filename, extension=1):
     fmt = '>'+(''.join([tform_to_format(v) for v in tform_lst]))
     fmtfunc = lambda string: np.array(struct.unpack(fmt, string),dtype=record)
     return naxis1, naxis2, tfields, position, record, fmtfunc
+
+def memmap_bintable(filename, extension=1):
+    """Map the data area of the binary table in a given FITS file into memory.
+
+    The table is mapped read-only with a big-endian structured dtype, so that a
+    row or a column can be accessed by indexing the returned array without any
+    `open`/`seek`/`read` calls.
+
+    Args:
+        filename (str): Name of the input FITS file.
+        extension (int): Extension of the binary table to be mapped.
+    Returns:
+        :class:`numpy.memmap`: A structured array of the table rows.
+    Examples:
+
+        .. code-block:: python
+
+            from stella.utils.fitsio import memmap_bintable
+            data = memmap_bintable(filename)
+            row = data[100]
+
+    """
+    nbyte, nrow, ncol, pos, dtype, fmtfunc = get_bintable_info(filename,
+                                                               extension)
+    return np.memmap(filename, dtype=dtype.newbyteorder('>'), mode='r',
+                     offset=pos, shape=(nrow,))
@@ -1,3 +1,5 @@
+import numpy as np
+
 def parabolic(ax,ay,x):
     '''
     Parabolic interpolation.
@@ -43,3 +45,45 @@ def newton(ax,ay,x):
     for m in range(1,n):
         ybar = ybar*(x-ax[m])+y[m]
     return ybar
+
+def lagrange_weights(ax, x):
+    '''
+    Weights of Lagrange interpolation.
+
+    The interpolated value of a polynomial passing all the points (*ax*,
+    *ay*) is the dot product of the weights and *ay*, which is the same as
+    :func:`newton`. The weights only depend on *ax* and *x*, so that they can
+    be applied to many sets of *ay* values at once.
+
+    Args:
+        ax (list or :class:`numpy.array`): Input *x* values. A 2-D array of
+            shape (*m*, *n*) gives different input points for each of the *m*
+            values of *x*.
+        x (float or :class:`numpy.array`): *x* value(s) to be interpolated.
+    Returns:
+        :class:`numpy.array`: Weights with shape (*n*,) if *x* is a scalar,
+            or (*m*, *n*) if *x* is an array of *m* values, where *n* is the
+            number of input points.
+    Examples:
+
+        .. code-block:: python
+
+            >>> import numpy as np
+            >>> from stella.utils.interpolation import lagrange_weights
+            >>> ax = [1.0, 2.0, 3.0, 4.0]
+            >>> ay = np.array([[1.0, 4.0, 9.0, 16.0], [1.0, 8.0, 27.0, 64.0]])
+            >>> np.dot(ay, lagrange_weights(ax, 2.5))
+            array([ 6.25 , 15.625])
+
+    '''
+    ax = np.asarray(ax, dtype=np.float64)
+    x  = np.asarray(x, dtype=np.float64)
+    n  = ax.shape[-1]
+    # dx[..., j] = x - ax[..., j]
+    dx = x[..., np.newaxis] - ax
+    weights = np.ones(dx.shape)
+    for j in range(n):
+        for m in range(n):
+            if m != j:
+                weights[..., j] *= dx[..., m]/(ax[..., j] - ax[..., m])
+    return weights
@@ -1,16 +1,33 @@
-import collections
+import os
+import time
+import inspect
+import threading
 import functools
+import collections
 
 class memoized(object):
     """
     Memoized class for Decorator.
-    
+
     Notes
     ------
     This class caches a function's return value each time it is called.
     If called later with the same arguments, the cached value is returned
     (not reevaluated).
-    From https://wiki.python.org/moin/PythonDecoratorLibrary#Memoize
+
+    The cache is a thread-safe LRU cache holding at most `maxsize` results.
+    Results can expire after `ttl` seconds, and can be tied to a file given
+    by the argument `filearg`, so that they are recomputed when the size or
+    modification time of the file changes. Calls with unhashable arguments
+    (a list, for instance) are not cached.
+
+    Args:
+        func (function): Function to be cached.
+        maxsize (int): Maximum number of cached results. Unbounded if *None*.
+        ttl (float): Time to live of cached results in seconds. Results never
+            expire if *None*.
+        filearg (int or str): Position or name of the argument that is a file
+            name.
 
     Examples
     --------
@@ -26,26 +43,118 @@ class memoized(object):
                 return n
             return fibonacci(n-1) + fibonacci(n-2)
 
-        print fibonacci(12)
+        print(fibonacci(12))
+
+        @memoized(maxsize=16, filearg='filename')
+        def read_header(filename):
+            ...
+
+        print(read_header.cache_info())
 
     """
-    def __init__(self, func):
-        self.func = func
-        self.cache = {}
-    def __call__(self, *args):
-        if not isinstance(args, collections.Hashable):
+    def __new__(cls, func=None, maxsize=128, ttl=None, filearg=None):
+        if func is None:
+            # used as @memoized(...) with arguments
+            return lambda func: cls(func, maxsize=maxsize, ttl=ttl,
+                                    filearg=filearg)
+        return super(memoized, cls).__new__(cls)
+
+    def __init__(self, func, maxsize=128, ttl=None, filearg=None):
+        self.func    = func
+        self.maxsize = maxsize
+        self.ttl     = ttl
+        self.cache   = collections.OrderedDict()
+        self.hits      = 0
+        self.misses    = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+        functools.update_wrapper(self, func)
+
+        # position and name of the file name argument
+        self._filearg = None
+        if filearg is not None:
+            names = list(inspect.signature(func).parameters)
+            if isinstance(filearg, int):
+                self._filearg = (filearg, names[filearg])
+            else:
+                self._filearg = (names.index(filearg), filearg)
+
+    def _get_file_stamp(self, args, kwargs):
+        """Get the size and modification time of the file in arguments."""
+        if self._filearg is None:
+            return None
+        pos, name = self._filearg
+        if pos < len(args):
+            filename = args[pos]
+        elif name in kwargs:
+            filename = kwargs[name]
+        else:
+            return None
+        try:
+            st = os.stat(filename)
+        except (OSError, TypeError):
+            return None
+        return (st.st_size, st.st_mtime_ns)
+
+    def __call__(self, *args, **kwargs):
+        key = args
+        if kwargs:
+            key = args + (None,) + tuple(sorted(kwargs.items()))
+        try:
+            hash(key)
+        except TypeError:
             # uncacheable. a list, for instance.
             # better to not cache than blow up.
-            return self.func(*args)
-        if args in self.cache:
-            return self.cache[args]
-        else:
-            value = self.func(*args)
-            self.cache[args] = value
-            return value
+            return self.func(*args, **kwargs)
+
+        stamp = self._get_file_stamp(args, kwargs)
+        with self._lock:
+            if key in self.cache:
+                value, t, _stamp = self.cache[key]
+                if (self.ttl is None or time.time() - t < self.ttl) and \
+                    _stamp == stamp:
+                    self.cache.move_to_end(key)
+                    self.hits += 1
+                    return value
+                # expired, or the file has changed
+                del self.cache[key]
+            self.misses += 1
+
+        value = self.func(*args, **kwargs)
+
+        with self._lock:
+            self.cache[key] = (value, time.time(), stamp)
+            self.cache.move_to_end(key)
+            while self.maxsize is not None and len(self.cache) > self.maxsize:
+                self.cache.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def cache_info(self):
+        """Return the statistics of the cache.
+
+        Returns:
+            dict: A dict containing the numbers of `hits`, `misses`,
+                `evictions`, the current `size` and `maxsize`.
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions, 'size': len(self.cache),
+                    'maxsize': self.maxsize}
+
+    def cache_clear(self):
+        """Remove all cached results and reset the statistics."""
+        with self._lock:
+            self.cache.clear()
+            self.hits      = 0
+            self.misses    = 0
+            self.evictions = 0
+
     def __repr__(self):
         """Return the function's docstring."""
         return self.func.__doc__
     def __get__(self, obj, objtype):
         """Support instance methods."""
+        if obj is None:
+            return self
         return functools.partial(self.__call__, obj)
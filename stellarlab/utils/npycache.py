@@ -0,0 +1,124 @@
+import os
+import numpy as np
+
+def get_cache_path(category, source, name):
+    """Get the directory of a cache built from a source file.
+
+    Caches are stored in `$STELLA_DATA/cache/<category>/<source>/<name>`,
+    where `<source>` is the base name of the source file without extension.
+
+    Args:
+        category (str): Category of the cache (e.g. *"catalog"* or
+            *"evolution"*).
+        source (str): Name of the source file.
+        name (str): Name of the cache (e.g. *"zones"*).
+    Returns:
+        str: Path to the cache directory.
+    """
+    basename = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(os.getenv('STELLA_DATA'), 'cache', category,
+                        basename, name)
+
+def _get_file_stamp(filename):
+    """Get the size and modification time of a file.
+
+    Args:
+        filename (str): Name of the file.
+    Returns:
+        :class:`numpy.ndarray`: Array of (size, mtime in ns).
+    """
+    st = os.stat(filename)
+    return np.array([st.st_size, st.st_mtime_ns], dtype=np.int64)
+
+def _save_array(filename, array):
+    """Save an array to a `.npy` file by writing a temporary file first, so
+    that readers never see a partially written file.
+
+    Args:
+        filename (str): Name of the `.npy` file.
+        array (:class:`numpy.ndarray`): Array to be saved.
+    """
+    tmpfile = '%s.%d.tmp'%(filename, os.getpid())
+    with open(tmpfile, 'wb') as f:
+        np.save(f, array)
+    os.replace(tmpfile, filename)
+
+def load_cache(category, source, name, keys=None, mmap_mode='r'):
+    """Load arrays in a cache if it is up to date with the source file.
+
+    A cache is up to date if the size and modification time of the source
+    file have not changed since the cache was saved.
+
+    Args:
+        category (str): Category of the cache.
+        source (str): Name of the source file.
+        name (str): Name of the cache.
+        keys (list): Names of arrays to be loaded. All arrays are loaded if
+            *None*.
+        mmap_mode (str): Memory-map mode passed to :func:`numpy.load`.
+    Returns:
+        dict: A dict containing the (memory-mapped) arrays, or *None* if the
+            cache does not exist, is out of date, or misses any of `keys`.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        from stella.utils.npycache import load_cache, save_cache
+
+        arrays = load_cache('catalog', filename, 'zones')
+        if arrays is None:
+            arrays = {'ra': ra, 'dec': dec}
+            save_cache('catalog', filename, 'zones', arrays)
+
+    """
+    path = get_cache_path(category, source, name)
+    stampfile = os.path.join(path, 'source.npy')
+    if not os.path.exists(stampfile):
+        return None
+    if not np.array_equal(np.load(stampfile), _get_file_stamp(source)):
+        return None
+
+    if keys is None:
+        keys = [fname[:-4] for fname in sorted(os.listdir(path))
+                if fname.endswith('.npy') and fname != 'source.npy']
+
+    arrays = {}
+    for key in keys:
+        filename = os.path.join(path, key+'.npy')
+        if not os.path.exists(filename):
+            return None
+        arrays[key] = np.load(filename, mmap_mode=mmap_mode)
+    return arrays
+
+def save_cache(category, source, name, arrays, clear=True):
+    """Save arrays into the cache of a source file.
+
+    Args:
+        category (str): Category of the cache.
+        source (str): Name of the source file.
+        name (str): Name of the cache.
+        arrays (dict): A dict containing arrays to be saved.
+        clear (bool): Remove arrays already in the cache if *True*. Otherwise
+            the new arrays are added to the existing ones.
+    """
+    path = get_cache_path(category, source, name)
+    if not os.path.exists(path):
+        os.makedirs(path, exist_ok=True)
+
+    stampfile = os.path.join(path, 'source.npy')
+    stamp = _get_file_stamp(source)
+    if os.path.exists(stampfile) and \
+        not np.array_equal(np.load(stampfile), stamp):
+        # existing arrays were built from an old version of the source file
+        clear = True
+
+    if clear:
+        for fname in os.listdir(path):
+            if fname.endswith('.npy'):
+                os.remove(os.path.join(path, fname))
+
+    for key, array in arrays.items():
+        _save_array(os.path.join(path, key+'.npy'), array)
+    _save_array(stampfile, stamp)
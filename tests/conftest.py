@@ -0,0 +1,75 @@
+import os
+import math
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+import astropy.io.fits as fits
+
+# module-level paths in stellarlab are built from $STELLA_DATA at import time,
+# so the data directory must be set before stellarlab is imported
+_data_path = tempfile.mkdtemp(prefix='stella_data_')
+os.environ['STELLA_DATA'] = _data_path
+
+@pytest.fixture(scope='session')
+def stella_data():
+    """Path of the temporary `$STELLA_DATA` directory."""
+    yield _data_path
+    shutil.rmtree(_data_path, ignore_errors=True)
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """Temporary home directory, so that `~/.stellarlab` is not touched."""
+    monkeypatch.setenv('HOME', str(tmp_path))
+    return tmp_path
+
+_columns = ('logTeff', 'logL', 'age', 'mass')
+
+def _make_track(z, m0, n):
+    t = np.linspace(0, 1, n)
+    return (3.7 + 0.1*math.log10(m0) + 0.05*np.sin(3*t + z) - 0.2*t**2,
+            3.5*math.log10(m0) + 2*t + z,
+            10/m0**2.5*t**1.5,
+            m0*(1 - 0.1*t))
+
+@pytest.fixture(scope='session')
+def geneva_tracks(stella_data):
+    """Write a synthetic Geneva track file into `$STELLA_DATA/evolution`,
+    and return the node tracks resampled to the number of points in the cube.
+    """
+    from stellarlab.evolution.base import interpolate_data
+    from stellarlab.evolution.geneva import _Geneva
+
+    rng = np.random.default_rng(1)
+    rows = {}
+    for z in _Geneva.z_nodes:
+        for m0 in _Geneva.m_nodes:
+            if (z, m0) in _Geneva.missing_nodes:
+                continue
+            rows[(z, m0)] = _make_track(z, m0, int(rng.integers(30, 100)))
+
+    keys = list(rows)
+    nmax = 100
+    cols = [fits.Column('z',  'E', array=[k[0] for k in keys]),
+            fits.Column('m0', 'E', array=[k[1] for k in keys]),
+            fits.Column('n',  'I', array=[rows[k][0].size for k in keys])]
+    for i, column in enumerate(_columns):
+        array = np.array([np.pad(rows[k][i], (0, nmax-rows[k][i].size))
+                          for k in keys])
+        cols.append(fits.Column(column, '%dE'%nmax, array=array))
+
+    path = os.path.join(stella_data, 'evolution')
+    os.makedirs(path, exist_ok=True)
+    filename = os.path.join(path, 'Geneva_tracks.fits')
+    fits.BinTableHDU.from_columns(cols).writeto(filename, overwrite=True)
+
+    # tracks as read back from the float32 columns
+    table = fits.getdata(filename)
+    tracks = {}
+    for row in table:
+        n = row['n']
+        track = tuple(row[column][0:n] for column in _columns)
+        tracks[(float(np.float32(row['z'])), float(np.float32(row['m0'])))] = \
+            interpolate_data(track, n=_Geneva.track_ngrid)
+    return tracks
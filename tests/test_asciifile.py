@@ -0,0 +1,116 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from stellarlab.utils import asciifile
+from stellarlab.utils.asciifile import (find_sortedfile, find_sortedfile_many,
+                                        indexfind_sortedfile,
+                                        indexfind_sortedfile_many)
+
+_header = '# HD,HIP\n'
+
+def _findfunc(row):
+    return int(row.split(',')[0])
+
+def _outfunc(row):
+    return int(row.split(',')[1])
+
+@pytest.fixture
+def sortedfile(tmp_path):
+    """A sorted CSV file with variable line lengths, small keys and
+    duplicated keys."""
+    rng = np.random.default_rng(0)
+    keys = np.sort(np.concatenate((rng.integers(1, 100, 30),
+                                   rng.integers(1, 200000, 3000))))
+    filename = str(tmp_path/'HD-HIP.csv')
+    with open(filename, 'w') as f:
+        f.write(_header)
+        for i, key in enumerate(keys):
+            f.write('%d,%d\n'%(key, i))
+    return filename, keys
+
+def _get_targets(keys):
+    rng = np.random.default_rng(1)
+    targets = np.concatenate((keys[::7], rng.integers(0, 200010, 500),
+                              [0, keys[0], keys[-1], keys[-1]+1]))
+    rng.shuffle(targets)
+    return [int(target) for target in targets]
+
+@pytest.mark.parametrize('bufsize', [16, 1048576])
+def test_find_many(sortedfile, bufsize):
+    filename, keys = sortedfile
+    targets = _get_targets(keys)
+    expected = [find_sortedfile(target, filename, _findfunc, _outfunc,
+                                header=len(_header)) for target in targets]
+    results = find_sortedfile_many(targets, filename, _findfunc, _outfunc,
+                                   header=len(_header), bufsize=bufsize)
+    assert results == expected
+    assert find_sortedfile_many([], filename, _findfunc, _outfunc,
+                                header=len(_header)) == []
+
+def test_find_many_required_functions(sortedfile):
+    filename, keys = sortedfile
+    with pytest.raises(TypeError):
+        find_sortedfile_many([int(keys[0])], filename)
+
+@pytest.mark.parametrize('step', [1, 3, 256, 10000])
+def test_indexfind_many(sortedfile, step):
+    filename, keys = sortedfile
+    targets = _get_targets(keys)
+    expected = [find_sortedfile(target, filename, _findfunc, _outfunc,
+                                header=len(_header)) for target in targets]
+    assert any(value is None for value in expected)
+    results = indexfind_sortedfile_many(targets, filename, _findfunc,
+                    _outfunc, 'HD', header=len(_header), step=step)
+    assert results == expected
+
+def test_indexfind(sortedfile):
+    filename, keys = sortedfile
+    for target in [int(keys[0]), int(keys[100]), int(keys[-1]), -1]:
+        assert indexfind_sortedfile(target, filename, _findfunc, _outfunc,
+                                    'HD', header=len(_header), step=16) == \
+               find_sortedfile(target, filename, _findfunc, _outfunc,
+                               header=len(_header))
+
+def test_sidecar(sortedfile):
+    filename, keys = sortedfile
+    indexfind_sortedfile(int(keys[5]), filename, _findfunc, _outfunc, 'HD',
+                         header=len(_header), step=16)
+    with open(filename+'.idx', 'rb') as f:
+        data = pickle.load(f)
+    assert data['meta']['keyname'] == 'HD'
+    assert data['meta']['stamp'][0] == os.path.getsize(filename)
+    # keys are stored in their native types
+    assert all(type(key) is int for key in data['keys'])
+    assert data['keys'] == [int(key) for key in keys[::16]]
+
+    # an index built with another key function is not reused
+    result = indexfind_sortedfile((int(keys[5]),), filename,
+                    lambda row: (int(row.split(',')[0]),), _outfunc,
+                    'HD-tuple', header=len(_header), step=16)
+    assert result == find_sortedfile(int(keys[5]), filename, _findfunc,
+                                     _outfunc, header=len(_header))
+    with open(filename+'.idx', 'rb') as f:
+        data = pickle.load(f)
+    assert data['meta']['keyname'] == 'HD-tuple'
+    assert all(type(key) is tuple for key in data['keys'])
+
+def test_file_changed(sortedfile):
+    filename, keys = sortedfile
+    target = int(keys[-1]) + 10
+    assert indexfind_sortedfile(target, filename, _findfunc, _outfunc, 'HD',
+                                header=len(_header)) is None
+
+    with open(filename, 'a') as f:
+        f.write('%d,%d\n'%(target, 999999))
+    st = os.stat(filename)
+    os.utime(filename, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert indexfind_sortedfile(target, filename, _findfunc, _outfunc, 'HD',
+                                header=len(_header)) == 999999
+
+def test_index_cache_bounded():
+    info = asciifile._get_sorted_file_index.cache_info()
+    assert info['maxsize'] is not None
+    assert info['size'] <= info['maxsize']
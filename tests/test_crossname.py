@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+from astropy.table import Table
+
+from stellarlab import crossname
+from stellarlab.crossname import make_crosstable
+from stellarlab.crossname.query import QueryCache
+
+class FakeBackend(object):
+    """Query backend answering from a dict of stars, and counting calls."""
+
+    def __init__(self, stars):
+        self.stars = stars
+        self.calls = []
+
+    def query_objectids(self, name):
+        self.calls.append(('query_objectids', name))
+        if name not in self.stars:
+            return None
+        return Table({'ID': self.stars[name]['ID']})
+
+    def query_object(self, name):
+        self.calls.append(('query_object', name))
+        star = self.stars.get(name)
+        if star is None or 'RA' not in star:
+            return None
+        return Table({'RA': [star['RA']], 'DEC': [star['DEC']]})
+
+    def query_tic(self, tic):
+        self.calls.append(('query_tic', tic))
+        return []
+
+    def query_tic_region(self, ra, dec, radius):
+        self.calls.append(('query_tic_region', ra, dec, radius))
+        return []
+
+_stars = {
+    'HD 10700': {'ID': ['HD 10700', 'HIP 8102', 'TIC 419015728'],
+                 'RA': '01 44 04.08', 'DEC': '-15 56 14.9'},
+    'HD 2':     {'ID': ['HD 2', 'HIP 500'],
+                 'RA': '00 05 03.80', 'DEC': '+45 13 42.0'},
+    # found by identifiers, but not by coordinates
+    'HD 1':     {'ID': ['HD 1', 'HIP 422']},
+}
+
+def test_remote():
+    backend = FakeBackend(_stars)
+    table = make_crosstable(['HD 10700'], [None], columns=['HD', 'HIP', 'TIC'],
+                            backend=backend, rate=None, local=False)
+    row = table[0]
+    assert row['name'] == 'HD 10700'
+    assert row['HIP'] == 8102
+    assert row['TIC'] == 419015728
+    assert abs(row['ra'] - 26.017) < 1e-3
+
+def test_missing_object():
+    backend = FakeBackend(_stars)
+    table = make_crosstable(['HD 1'], [None], columns=['HD', 'HIP', 'TIC'],
+                            backend=backend, rate=None, local=False)
+    row = table[0]
+    assert row['name'] == 'HD 1'
+    for column in ['ra', 'dec', 'HD', 'HIP', 'TIC']:
+        assert row[column] is np.ma.masked
+
+def test_cache_opt_in(tmp_path):
+    backend = FakeBackend(_stars)
+    for _ in range(2):
+        make_crosstable(['HD 10700'], [None], columns=['HD'], backend=backend,
+                        rate=None, local=False)
+    assert backend.calls.count(('query_objectids', 'HD 10700')) == 2
+
+    backend = FakeBackend(_stars)
+    filename = str(tmp_path/'queries.sqlite')
+    for _ in range(2):
+        make_crosstable(['HD 10700'], [None], columns=['HD'], backend=backend,
+                        rate=None, local=False, cache=filename)
+    assert backend.calls.count(('query_objectids', 'HD 10700')) == 1
+
+def test_cache_version(tmp_path, monkeypatch):
+    filename = str(tmp_path/'queries.sqlite')
+    cache = QueryCache(filename)
+    cache.set('query_object:HD 1', None)
+    cache.close()
+
+    cache = QueryCache(filename)
+    assert cache.get('query_object:HD 1') == (True, None)
+    cache.close()
+
+    # results saved with another version are dropped
+    monkeypatch.setattr(QueryCache, 'version', QueryCache.version + 1)
+    cache = QueryCache(filename)
+    assert cache.get('query_object:HD 1') == (False, None)
+    cache.close()
+
+def test_local_missing_tables():
+    # the local cross-identification tables are not installed in the test
+    # data directory, so all the stars fall back to the remote service
+    backend = FakeBackend(_stars)
+    table = make_crosstable(['HD 10700'], [None], columns=['HD', 'HIP'],
+                            backend=backend, rate=None, local=True)
+    assert ('query_objectids', 'HD 10700') in backend.calls
+    assert table[0]['HIP'] == 8102
+
+@pytest.fixture
+def fake_local(monkeypatch):
+    """Replace the local resolver with one knowing HD 10700 and HD 2."""
+    calls = []
+    def resolve_local(name_lst, coord_lst=None):
+        calls.append(list(name_lst))
+        local = {'HD 10700': (26.0, -15.9, {'HD': '10700', 'HIP': 8102}),
+                 'HD 2':     (1.0, 2.0, {'HIP': 500})}
+        return [local.get(name) for name in name_lst]
+    monkeypatch.setattr(crossname, 'resolve_local', resolve_local)
+    return calls
+
+def test_local_coverage(fake_local):
+    backend = FakeBackend(_stars)
+    table = make_crosstable(['HD 10700', 'HD 2'], [None, None],
+                            columns=['HD', 'HIP'], backend=backend, rate=None,
+                            local=True)
+    # HD 10700 is fully resolved offline. HD 2 has no HD name locally
+    assert fake_local == [['HD 10700', 'HD 2']]
+    assert ('query_objectids', 'HD 10700') not in backend.calls
+    assert ('query_objectids', 'HD 2') in backend.calls
+    assert table[0]['HIP'] == 8102
+    assert table[0]['ra'] == 26.0
+    assert table[1]['HD'] == '2'
+    assert table[1]['HIP'] == 500
+
+def test_local_not_covered(fake_local):
+    # TIC is not in the local tables, so all the stars are sent remotely
+    backend = FakeBackend(_stars)
+    table = make_crosstable(['HD 10700'], [None], columns=['HD', 'HIP', 'TIC'],
+                            backend=backend, rate=None, local=True)
+    assert fake_local == []
+    assert ('query_objectids', 'HD 10700') in backend.calls
+    assert table[0]['TIC'] == 419015728
+
+def test_local_default(fake_local):
+    backend = FakeBackend(_stars)
+    make_crosstable(['HD 10700'], [None], columns=['HD', 'HIP'],
+                    backend=backend, rate=None)
+    assert fake_local == []
+    assert ('query_objectids', 'HD 10700') in backend.calls
@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+import pytest
+
+from stellarlab.evolution import fit
+from stellarlab.evolution.fit import fit_stars, get_grid
+
+_mass_nodes = np.arange(0.9, 2.0, 0.02)
+_feh_nodes  = np.arange(-0.5, 0.31, 0.1)
+
+@pytest.fixture(scope='module')
+def grid(geneva_tracks):
+    return get_grid('Geneva', mass_nodes=_mass_nodes, feh_nodes=_feh_nodes)
+
+def _get_truth(grid, mass, feh, points):
+    """Take models at given points along a grid track."""
+    m = (np.abs(grid['mass'] - mass) < 1e-6) & (np.abs(grid['feh'] - feh) < 1e-6)
+    index = np.nonzero(m)[0][points]
+    return {key: grid[key][index] for key in grid}
+
+def test_grid(grid):
+    size = _mass_nodes.size*_feh_nodes.size*51
+    assert grid['age'].size == size
+    assert np.all(np.diff(grid['feh']) >= 0)
+    for key in ['logTeff', 'logL', 'age', 'logg', 'mass', 'feh']:
+        assert grid[key].shape == (size,)
+
+def test_grid_cache(grid, stella_data):
+    path = os.path.join(stella_data, 'cache', 'evolution', 'Geneva_tracks')
+    assert any(name.startswith('grid_') for name in os.listdir(path))
+
+    # read the grid back from the disk cache
+    fit._load_grid.cache_clear()
+    grid2 = get_grid('Geneva', mass_nodes=_mass_nodes, feh_nodes=_feh_nodes)
+    assert fit._load_grid.cache_info()['misses'] == 1
+    for key in grid:
+        np.testing.assert_array_equal(grid2[key], grid[key])
+    assert fit._load_grid.cache_info()['maxsize'] is not None
+
+@pytest.mark.parametrize('mass, feh', [(1.2, 0.0), (1.5, -0.2)])
+def test_fit_stars(grid, mass, feh):
+    truth = _get_truth(grid, mass, feh, [10, 20, 30, 40])
+    errors = (30.0, 0.01, 0.05)
+    result = fit_stars(10**truth['logTeff'], truth['logL'], truth['feh'],
+                       errors, model='Geneva', mass_nodes=_mass_nodes,
+                       feh_nodes=_feh_nodes)
+
+    for key in ['mass', 'age', 'logg']:
+        assert np.all(result[key+'_low'] <= result[key])
+        assert np.all(result[key] <= result[key+'_high'])
+        assert np.all(result[key+'_low'] <= truth[key])
+        assert np.all(truth[key] <= result[key+'_high'])
+    np.testing.assert_allclose(result['mass'], truth['mass'], rtol=0.05)
+    np.testing.assert_allclose(result['age'], truth['age'], rtol=0.2)
+    assert np.all(result['chi2'] < 1e-6)
+
+def test_fit_stars_processes(grid):
+    truth = _get_truth(grid, 1.2, 0.0, [10, 20, 30, 40])
+    args = (10**truth['logTeff'], truth['logL'], truth['feh'],
+            (30.0, 0.01, 0.05))
+    kwargs = {'model': 'Geneva', 'mass_nodes': _mass_nodes,
+              'feh_nodes': _feh_nodes, 'chunk': 1}
+    result1 = fit_stars(*args, **kwargs)
+    result2 = fit_stars(*args, processes=2, **kwargs)
+    for key in result1:
+        np.testing.assert_array_equal(result1[key], result2[key])
+
+def test_fit_stars_errors(grid):
+    with pytest.raises(ValueError):
+        fit_stars(5777, 0.0, 0.0, (0.0, 0.01, 0.05), model='Geneva',
+                  mass_nodes=_mass_nodes, feh_nodes=_feh_nodes)
+    with pytest.raises(ValueError):
+        get_grid('unknown')
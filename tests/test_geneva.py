@@ -0,0 +1,59 @@
+import os
+import math
+
+import numpy as np
+import pytest
+
+from stellarlab.evolution.base import interpolate_param
+from stellarlab.evolution.geneva import _Geneva, _get_inodes
+from stellarlab.utils.npycache import get_cache_path
+
+@pytest.fixture(scope='module')
+def geneva(geneva_tracks):
+    """A fresh Geneva instance and the node tracks of the synthetic file."""
+    return _Geneva(), geneva_tracks
+
+def _node_track(tracks, z, m0):
+    return tracks[(float(np.float32(z)), float(np.float32(m0)))]
+
+def _assert_tracks_equal(track1, track2):
+    assert len(track1) == len(track2)
+    for a, b in zip(track1, track2):
+        np.testing.assert_allclose(a, b, rtol=1e-10, atol=1e-12)
+
+@pytest.mark.parametrize('z', _Geneva.z_nodes)
+@pytest.mark.parametrize('m0', [0.8, 1.0, 2.5, 60.0])
+def test_node_track(geneva, z, m0):
+    g, tracks = geneva
+    _assert_tracks_equal(g.get_track(m0, z), _node_track(tracks, z, m0))
+
+def test_interpolate_over_z(geneva):
+    g, tracks = geneva
+    z, m0 = 0.013, 1.0
+    iz = _get_inodes(g.z_nodes, z)
+    z_lst = g.z_nodes[iz:iz+4]
+    ref = interpolate_param([_node_track(tracks, _z, m0) for _z in z_lst],
+                            np.log10(z_lst), math.log10(z))
+    _assert_tracks_equal(g.get_track(m0, z), ref)
+
+def test_interpolate_over_missing_node(geneva):
+    g, tracks = geneva
+    z, m0 = 0.02, 10.0
+    available = [_m for _m in g.m_nodes if (z, _m) not in g.missing_nodes]
+    im = _get_inodes(available, m0)
+    m_lst = available[im:im+4]
+    ref = interpolate_param([_node_track(tracks, z, _m) for _m in m_lst],
+                            m_lst, m0)
+    _assert_tracks_equal(g.get_track(m0, z), ref)
+
+def test_cube_cache(geneva, stella_data):
+    g, tracks = geneva
+    g.get_track(1.0, 0.02)
+    path = get_cache_path('evolution', 'Geneva_tracks.fits',
+                          'cube%d'%g.track_ngrid)
+    assert path.startswith(os.path.join(stella_data, 'cache', 'evolution'))
+    assert os.path.exists(os.path.join(path, 'cube.npy'))
+
+    # a new instance reads the cube from the cache
+    g2 = _Geneva()
+    _assert_tracks_equal(g2.get_track(1.3, 0.013), g.get_track(1.3, 0.013))
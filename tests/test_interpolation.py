@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from stellarlab.utils.interpolation import newton, lagrange_weights
+
+@pytest.mark.parametrize('n', [2, 3, 4, 5])
+def test_lagrange_weights_scalar(n):
+    rng = np.random.default_rng(n)
+    ax = np.sort(rng.uniform(0.0, 10.0, n))
+    ay = rng.normal(size=n)
+    for x in [ax[0], ax[-1], 0.5*(ax[0]+ax[1]), -1.0, 11.0]:
+        weights = lagrange_weights(ax, x)
+        assert weights.shape == (n,)
+        assert np.dot(weights, ay) == pytest.approx(newton(ax, ay, x),
+                                                   rel=1e-10, abs=1e-10)
+
+def test_lagrange_weights_nodes():
+    ax = [1.0, 2.0, 3.0, 4.0]
+    for j, x in enumerate(ax):
+        assert np.allclose(lagrange_weights(ax, x), np.eye(4)[j])
+
+def test_lagrange_weights_array_x():
+    rng = np.random.default_rng(1)
+    ax = np.array([0.8, 1.0, 1.25, 1.5])
+    ay = rng.normal(size=(3, 4))
+    x = np.array([0.9, 1.1, 1.3, 1.45, 2.0])
+    weights = lagrange_weights(ax, x)
+    assert weights.shape == (5, 4)
+    for i in range(x.size):
+        for k in range(3):
+            assert np.dot(weights[i], ay[k]) == pytest.approx(
+                    newton(ax, ay[k], x[i]), rel=1e-10)
+
+def test_lagrange_weights_2d_ax():
+    rng = np.random.default_rng(2)
+    ax = np.sort(rng.uniform(0.0, 5.0, (6, 4)), axis=1)
+    ay = rng.normal(size=(6, 4))
+    x = rng.uniform(0.0, 5.0, 6)
+    weights = lagrange_weights(ax, x)
+    assert weights.shape == (6, 4)
+    for i in range(6):
+        assert np.dot(weights[i], ay[i]) == pytest.approx(
+                newton(ax[i], ay[i], x[i]), rel=1e-8, abs=1e-8)
+        assert np.allclose(weights[i], lagrange_weights(ax[i], x[i]))
@@ -0,0 +1,97 @@
+import os
+
+import numpy as np
+import pytest
+
+from stellarlab.catalog import kepler
+from stellarlab.catalog.kepler import (find_system, find_systems, find_planet,
+                                       find_planets, load_systems)
+
+def _make_row_r1(planet_id):
+    row = [' ']*60
+    for (i1, i2), value in [((0, 6), '%6.2f'%planet_id),
+                            ((21, 25), '0.20'), ((34, 41), '  3.500'),
+                            ((53, 58), '1.000')]:
+        row[i1:i2] = value
+    return ''.join(row)
+
+def _make_row_r2(planet_id, P):
+    row = [' ']*156
+    for (i1, i2), value in [((12, 19), '%7.2f'%planet_id),
+                            ((60, 73), '%13.6f'%P), ((152, 156), '  -')]:
+        row[i1:i2] = value
+    return ''.join(row)
+
+# planets of each release, unsorted and with multi-planet systems
+_planets = {1: [1.01, 12.01, 3.02, 3.01, 12.02],
+            2: [3.01, 1.01, 1001.03, 1001.01, 1001.02, 3.01]}
+
+@pytest.fixture(scope='module')
+def kepler_tables(stella_data):
+    path = os.path.join(stella_data, 'catalog', 'Kepler')
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, kepler.planet_files[1]), 'w') as f:
+        for planet_id in _planets[1]:
+            f.write(_make_row_r1(planet_id)+'\n')
+    with open(os.path.join(path, kepler.planet_files[2]), 'w') as f:
+        for i, planet_id in enumerate(_planets[2]):
+            f.write(_make_row_r2(planet_id, i+1.0)+'\n')
+        f.write('\n')
+    kepler._releases.clear()
+    yield path
+    kepler._releases.clear()
+
+def test_load_systems(kepler_tables):
+    systems = load_systems(2)
+    assert systems['koi'].tolist() == [1, 3, 1001]
+    assert systems['nplanet'].tolist() == [1, 2, 3]
+
+def test_find_system(kepler_tables):
+    result = find_system(1001, [2])
+    assert sorted(result) == [1001.01, 1001.02, 1001.03]
+    record = result[1001.02][0]
+    assert record['P'] == 5.0
+    assert record['Teq'] is None
+    assert record['status'] == 'candidate'
+
+    # a duplicated planet ID
+    assert len(find_system(3, [2])[3.01]) == 2
+    assert find_system(12, [1, 2]) == {12.01: [find_planet(12.01, [1])[0]],
+                                       12.02: [find_planet(12.02, [1])[0]]}
+    assert find_system(999, [1, 2]) == {}
+
+def test_find_planet(kepler_tables):
+    assert [record['P'] for record in find_planet(3.01, [2])] == [1.0]
+    assert len(find_planet(3.01, [1, 2])) == 2
+    assert find_planet(3.03, [1, 2]) == []
+
+def test_find_systems(kepler_tables):
+    kois = [1001, 999, 3, 1, 3]
+    result = find_systems(kois, [1, 2])
+    for dataset in [1, 2]:
+        qid, planets = result[dataset]
+        assert np.all(np.diff(qid) >= 0)
+        expected = [(i, planet_id) for i, koi in enumerate(kois)
+                    for planet_id in find_system(koi, [dataset])
+                    for _ in find_system(koi, [dataset])[planet_id]]
+        assert sorted(zip(qid.tolist(), planets['planet_id'].tolist())) == \
+               sorted(expected)
+    # the planets of a system keep the order of the table file
+    assert result[2][1]['P'][result[2][0] == 0].tolist() == [3.0, 4.0, 5.0]
+
+    qid, planets = find_systems([], [2])[2]
+    assert qid.size == 0 and planets.size == 0
+
+def test_find_planets(kepler_tables):
+    planet_ids = [3.01, 3.03, 1001.02, 12.02, 1.01]
+    result = find_planets(planet_ids, [1, 2])
+    qid, planets = result[2]
+    assert qid.tolist() == [0, 2, 4]
+    assert planets['P'].tolist() == [1.0, 5.0, 2.0]
+    qid, planets = result[1]
+    assert qid.tolist() == [0, 3, 4]
+    assert np.allclose(planets['planet_id'], [3.01, 12.02, 1.01])
+
+def test_unknown_release(kepler_tables):
+    with pytest.raises(ValueError):
+        find_system(1, [3])
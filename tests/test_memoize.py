@@ -0,0 +1,156 @@
+import os
+import threading
+
+from stellarlab.utils import memoize
+from stellarlab.utils.memoize import memoized
+
+
+def test_cache_hit():
+    calls = []
+
+    @memoized
+    def square(x):
+        calls.append(x)
+        return x*x
+
+    assert square(3) == 9
+    assert square(3) == 9
+    assert calls == [3]
+    info = square.cache_info()
+    assert info['hits'] == 1
+    assert info['misses'] == 1
+    assert info['maxsize'] == 128
+
+
+def test_lru_eviction():
+    calls = []
+
+    @memoized(maxsize=2)
+    def square(x):
+        calls.append(x)
+        return x*x
+
+    square(1)
+    square(2)
+    square(1)       # 1 becomes the most recently used
+    square(3)       # evicts 2
+    assert square.cache_info()['evictions'] == 1
+    assert square.cache_info()['size'] == 2
+
+    square(1)
+    assert calls == [1, 2, 3]
+    square(2)
+    assert calls == [1, 2, 3, 2]
+
+
+def test_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(memoize.time, 'time', lambda: now[0])
+    calls = []
+
+    @memoized(ttl=10)
+    def square(x):
+        calls.append(x)
+        return x*x
+
+    square(2)
+    now[0] += 5
+    square(2)
+    assert calls == [2]
+    now[0] += 10
+    square(2)
+    assert calls == [2, 2]
+
+
+def test_filearg(tmp_path):
+    filename = str(tmp_path/'data.txt')
+    with open(filename, 'w') as f:
+        f.write('1')
+
+    @memoized(filearg='filename')
+    def read(filename):
+        with open(filename) as f:
+            return f.read()
+
+    assert read(filename) == '1'
+    assert read(filename=filename) == '1'
+
+    with open(filename, 'w') as f:
+        f.write('22')
+    st = os.stat(filename)
+    os.utime(filename, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    assert read(filename) == '22'
+    assert read.cache_info()['misses'] == 3
+
+
+def test_kwargs():
+    calls = []
+
+    @memoized
+    def add(a, b=0, c=0):
+        calls.append((a, b, c))
+        return a + b + c
+
+    assert add(1, b=2, c=3) == 6
+    assert add(1, c=3, b=2) == 6
+    assert len(calls) == 1
+    assert add(1, 2) == 3
+    assert len(calls) == 2
+
+
+def test_unhashable():
+    calls = []
+
+    @memoized
+    def total(values):
+        calls.append(values)
+        return sum(values)
+
+    assert total([1, 2]) == 3
+    assert total([1, 2]) == 3
+    assert len(calls) == 2
+    assert total.cache_info()['size'] == 0
+
+
+def test_method():
+    class Square(object):
+        @memoized
+        def compute(self, x):
+            return x*x
+
+    obj = Square()
+    assert obj.compute(4) == 16
+    assert obj.compute(4) == 16
+    assert Square.compute.cache_info()['hits'] == 1
+
+
+def test_thread_safety():
+    @memoized(maxsize=8)
+    def square(x):
+        return x*x
+
+    nthread, ncall = 8, 500
+    errors = []
+
+    def run(k):
+        for i in range(ncall):
+            x = (i*7 + k) % 16
+            if square(x) != x*x:
+                errors.append(x)
+
+    threads = [threading.Thread(target=run, args=(k,))
+               for k in range(nthread)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    info = square.cache_info()
+    assert info['hits'] + info['misses'] == nthread*ncall
+    assert info['size'] <= 8
+
+    square.cache_clear()
+    info = square.cache_info()
+    assert info['size'] == info['hits'] == info['misses'] == 0
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+import astropy.io.fits as fits
+
+from stellarlab.catalog.tyc import (_TychoCatalog, _pack_TYC_key,
+                                    _unpack_TYC_key)
+
+def _make_catalog(path, signed_order):
+    """Write a synthetic Tycho catalogue with an empty first row."""
+    rng = np.random.default_rng(0)
+    n = 3000
+    tyc1 = rng.integers(1, 9538, n)
+    tyc2 = rng.integers(1, 12122, n)
+    tyc3 = rng.integers(1, 4, n)
+    key = (tyc1<<18) + (tyc2<<4) + (tyc3<<1)
+    key, first = np.unique(key, return_index=True)
+    tyc = np.array([tyc1[first], tyc2[first], tyc3[first]]).T
+    stored = key.astype(np.uint32).view(np.int32)
+    if signed_order:
+        order = np.argsort(stored, kind='stable')
+        stored, tyc = stored[order], tyc[order]
+    # the caches of catalogues are named after the files
+    filename = str(path/('TYC2_%s.fits'%('signed' if signed_order else
+                                         'unsigned')))
+    cols = [fits.Column(name='TYC', format='J',
+                        array=np.concatenate(([0], stored))),
+            fits.Column(name='RAdeg', format='D',
+                        array=rng.uniform(0, 360, key.size+1))]
+    fits.BinTableHDU.from_columns(cols).writeto(filename)
+    return filename, tyc
+
+@pytest.fixture(params=[False, True])
+def catalog(request, tmp_path):
+    filename, tyc = _make_catalog(tmp_path, request.param)
+    return _TychoCatalog(filename), tyc
+
+def test_pack_key():
+    key, valid = _pack_TYC_key([9537, 1, 1, 9537], [12121, 1, 16384, 1],
+                               [3, 0, 1, 8])
+    assert valid.tolist() == [True, False, False, False]
+    assert key[0] == (9537<<18) + (12121<<4) + (3<<1)
+    assert key[0] > np.iinfo(np.int32).max
+    assert [int(v) for v in _unpack_TYC_key(key[0])] == [9537, 12121, 3]
+    # keys stored as 32-bit integers in the files are unpacked the same way
+    stored = np.array(key[0]).astype(np.uint32).view(np.int32)
+    assert [int(v) for v in _unpack_TYC_key(stored)] == [9537, 12121, 3]
+
+def test_find_indices(catalog):
+    cat, tyc = catalog
+    index, mask = cat.find_indices(tyc[:, 0], tyc[:, 1], tyc[:, 2])
+    assert not mask.any()
+    np.testing.assert_array_equal(index, np.arange(1, tyc.shape[0]+1))
+
+    # a star not in the catalogue
+    index, mask = cat.find_indices([tyc[0, 0]], [12200], [1])
+    assert mask.tolist() == [True]
+    assert index.tolist() == [0]
+
+def test_find_indices_out_of_range(catalog):
+    cat, tyc = catalog
+    t1, t2, t3 = tyc[tyc[:, 0] > 1][0]
+    # these numbers would alias onto the key of (t1, t2, t3) if they were
+    # packed without range checks
+    aliases = [(t1-1, t2+(1<<14), t3),
+               (t1+(1<<14), t2, t3),
+               (t1, t2, t3+8),
+               (0, 0, 0)]
+    index, mask = cat.find_indices(*np.array(aliases).T)
+    assert mask.all()
+    assert (index == 0).all()
+
+def test_keys_cache(catalog):
+    cat, tyc = catalog
+    cat.find_indices(tyc[0, 0], tyc[0, 1], tyc[0, 2])
+    keys = cat._get_keys()
+    assert isinstance(keys['key'], np.memmap)
+    assert np.all(np.diff(keys['key']) > 0)
+
+    # a new instance reads the keys from the cache
+    cat2 = _TychoCatalog(cat.catfile)
+    keys2 = cat2._get_keys()
+    np.testing.assert_array_equal(keys2['row'], keys['row'])
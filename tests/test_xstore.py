@@ -0,0 +1,61 @@
+import pytest
+
+from stellarlab.catalog import xindex, xstore
+from stellarlab.catalog.xstore import (xindex_find, xindex_find_many,
+                                       compile_xindex)
+
+@pytest.fixture
+def xindex_dir(tmp_path, monkeypatch):
+    """A temporary xindex directory with a few cross-identification tables.
+    """
+    monkeypatch.setattr(xindex, 'xindex_path', str(tmp_path))
+    monkeypatch.setattr(xstore, '_xstores', {})
+    (tmp_path/'HIP-HD.csv').write_text(
+            '     1, 12909\n'
+            '     4,  9857\n'
+            '     7,  1152\n'
+            '     7,  1153\n'
+            '    xx,  2000\n'       # malformed key
+            '    12\n'              # missing value
+            '    15,  abc\n'        # malformed value
+            '\n')
+    # all the CD identifiers here happen to be digits, but they must still be
+    # stored as strings
+    (tmp_path/'HIP-CD.csv').write_text(
+            '     1,857\n'
+            '     7,7751\n')
+    (tmp_path/'HIP-BD.csv').write_text(
+            '     1,+80 3714\n'
+            '     4,+42 1878\n')
+    return tmp_path
+
+def test_find(xindex_dir, capsys):
+    assert xindex_find('HIP', 'HD', 1).tolist() == [12909]
+    out = capsys.readouterr().out
+    assert 'Warning: 3 malformed rows' in out
+
+    assert xindex_find('HIP', 'HD', 7).tolist() == [1152, 1153]
+    assert xindex_find('HIP', 'HD', '7').tolist() == [1152, 1153]
+    assert xindex_find('HIP', 'HD', 12).size == 0
+    assert xindex_find('HIP', 'HD', 'xx').size == 0
+    assert xindex_find('HD', 'HIP', 1153).tolist() == [7]
+    assert xindex_find('HIP', 'BD', 4).tolist() == [b'+42 1878']
+    assert xindex_find('BD', 'HIP', '+80 3714').tolist() == [1]
+
+def test_schema(xindex_dir):
+    values = xindex_find('HIP', 'CD', 7)
+    assert values.dtype.kind == 'S'
+    assert values.tolist() == [b'7751']
+    assert xindex_find('CD', 'HIP', '857').tolist() == [1]
+
+def test_find_many(xindex_dir):
+    qid, values = xindex_find_many('HIP', 'HD', [7, 3, 1, 7])
+    assert qid.tolist() == [0, 0, 2, 3, 3]
+    assert values.tolist() == [1152, 1153, 12909, 1152, 1153]
+
+def test_unknown(xindex_dir):
+    with pytest.raises(ValueError):
+        xindex_find('HIP', 'KIC', 1)
+    (xindex_dir/'HIP-XX.csv').write_text('1,2\n')
+    with pytest.raises(ValueError):
+        compile_xindex(['HIP-XX'])